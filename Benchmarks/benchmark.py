@@ -0,0 +1,380 @@
+# Names: Khoa Vu (030063200) & Mya Barragan (029948137)
+# Course: CECS 427 (Sec. 02)
+# Professor: Oscar Morales-Ponce
+# Date: 10/17/2026
+
+'''
+Benchmark harness for the assignment tools.
+
+Generates graphs at several sizes (Erdős–Rényi graphs from graph.py, bipartite
+markets, two-route traffic networks and scale-free web graphs), times the main
+entry point of every tool on them, measures peak memory with tracemalloc, and
+writes the results as JSON (and optionally CSV) so two runs can be compared.
+
+Citation(s):
+1) Python Software Foundation. (n.d.). tracemalloc — Trace memory allocations. Retrieved October, 2026, from https://docs.python.org/3/library/tracemalloc.html
+2) Python Software Foundation. (n.d.). importlib — The implementation of import. Retrieved October, 2026, from https://docs.python.org/3/library/importlib.html
+3) NetworkX Developers. (n.d.). scale_free_graph — NetworkX documentation. Retrieved October, 2026, from https://networkx.org/documentation/stable/reference/generated/networkx.generators.directed.scale_free_graph.html
+'''
+
+import argparse
+import contextlib
+import csv
+import gc
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import networkx as nx
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+TOOLS = { # tool name -> script, relative to the repository root
+    "graph": os.path.join("Graphs", "graph.py"),
+    "graph_analysis": os.path.join("Social and Large-Scale Networks", "graph_analysis.py"),
+    "traffic_analysis": os.path.join("Game Theory", "traffic_analysis.py"),
+    "market_strategy": os.path.join("Market and Strategic Interaction in Network", "market_strategy.py"),
+    "page_rank": os.path.join("Information Network and the WWW", "page_rank.py"),
+}
+
+def load_tool(name):
+    '''Import one of the assignment scripts by path (their folders are not packages).'''
+    spec = importlib.util.spec_from_file_location(f"bench_{name}", os.path.join(ROOT, TOOLS[name]))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# Graph generators, one per kind of input; all are seeded
+
+def er_graph(tools, n, seed):
+    '''Erdős–Rényi graph from graph.py (c = 1.5) with random edge signs for verify_balance.'''
+    G = tools["graph"].create_random_graph(n, 1.5, seed=seed)
+    rng = np.random.default_rng(seed)
+    signs = rng.choice([-1, 1], size=G.number_of_edges(), p=[0.3, 0.7])
+    for (u, v), sign in zip(G.edges(), signs.tolist()):
+        G[u][v]["sign"] = sign
+        G[u][v]["weight"] = 1.0
+    return G
+
+def market_graph(tools, n, seed, degree=5):
+    '''Bipartite market: sellers 0..n/2-1, buyers n/2..n-1, each buyer values 'degree' random sellers.'''
+    half = max(1, n // 2)
+    rng = np.random.default_rng(seed)
+    G = nx.Graph()
+    G.add_nodes_from((s, {"price": 0.0}) for s in range(half))
+    G.add_nodes_from(range(half, 2 * half))
+    for b in range(half, 2 * half):
+        sellers = rng.choice(half, size=min(degree, half), replace=False)
+        for s, value in zip(sellers.tolist(), rng.integers(1, 100, size=len(sellers)).tolist()):
+            G.add_edge(b, s, valuation=value)
+    return G
+
+def traffic_graph(tools, n, seed):
+    '''Two disjoint routes from node 0 to node 1, n nodes in total, with random a*x + b edge costs.'''
+    rng = np.random.default_rng(seed)
+    G = nx.DiGraph()
+    hops = max(1, (n - 2) // 2)
+    for r in range(2):
+        route = [0] + [2 + r * hops + i for i in range(hops)] + [1]
+        for u, v in zip(route[:-1], route[1:]):
+            G.add_edge(u, v, a=float(rng.integers(0, 3)), b=float(rng.integers(0, 5)))
+    return G
+
+def road_graph(tools, n, seed):
+    '''Square grid of two-way streets with random a*x + b link costs, about n nodes.'''
+    side = max(2, int(round(n ** 0.5)))
+    rng = np.random.default_rng(seed)
+    G = nx.convert_node_labels_to_integers(nx.grid_2d_graph(side, side).to_directed())
+    for u, v in G.edges():
+        G[u][v]["a"] = float(rng.uniform(0.01, 1.0))
+        G[u][v]["b"] = float(rng.uniform(1.0, 10.0))
+    return G
+
+def web_graph(tools, n, seed):
+    '''Scale-free directed graph with URL-like node names.'''
+    G = nx.DiGraph(nx.scale_free_graph(n, seed=seed))
+    G.remove_edges_from(list(nx.selfloop_edges(G)))
+    return nx.relabel_nodes(G, {i: f"https://example.org/page{i}" for i in G})
+
+GRAPHS = {"er": er_graph, "market": market_graph, "traffic": traffic_graph, "road": road_graph, "web": web_graph}
+
+# Benchmark cases: name -> (graph kind, largest n it is run at, prepare(tools, G, opts) -> call)
+# prepare does the untimed setup (copies, argument lists) and returns the function to time.
+
+def case_multi_source_bfs(tools, G, opts):
+    sources = list(G)[:8]
+    return lambda: tools["graph"].multi_source_bfs(G, sources)
+
+def case_batched_bfs(tools, G, opts):
+    sources = list(G)[:64]
+    return lambda: tools["graph"].multi_source_bfs(G, sources, batched=True)
+
+def case_analyze_graph(tools, G, opts):
+    return lambda: tools["graph"].analyze_graph(G, workers=opts.workers)
+
+def case_analyze_graph_sampled(tools, G, opts):
+    return lambda: tools["graph"].analyze_graph(G, samples=64, seed=opts.seed)
+
+def case_compute_metrics(tools, G, opts):
+    H = G.copy()
+    return lambda: tools["graph_analysis"].compute_metrics(H)
+
+def case_partition_graph(tools, G, opts):
+    H = G.copy()
+    return lambda: tools["graph_analysis"].partition_graph(H, 4, seed=opts.seed)
+
+def case_partition_graph_gn(tools, G, opts):
+    H = G.copy()
+    return lambda: tools["graph_analysis"].partition_graph(H, 4, method="girvan_newman")
+
+def case_robustness_check(tools, G, opts):
+    random.seed(opts.seed)
+    k = max(1, G.number_of_edges() // 20)
+    return lambda: tools["graph_analysis"].robustness_check(G, k, trials=3, workers=opts.workers)
+
+def case_robustness_curve(tools, G, opts):
+    return lambda: tools["graph_analysis"].robustness_curve(G, trials=5, seed=opts.seed, workers=opts.workers)
+
+def case_targeted_attack(tools, G, opts):
+    k = max(1, G.number_of_edges() // 100)
+    return lambda: tools["graph_analysis"].targeted_attack(G, k, batch=max(1, k // 4), samples=32, seed=opts.seed, workers=opts.workers)
+
+def case_verify_homophily(tools, G, opts):
+    H = G.copy()
+    for i, u in enumerate(H):
+        H.nodes[u]["group"] = i % 4
+    return lambda: tools["graph_analysis"].verify_homophily(H, permutations=1000, seed=opts.seed, workers=opts.workers)
+
+def case_verify_balance(tools, G, opts):
+    H = G.copy()
+    return lambda: tools["graph_analysis"].verify_balance(H)
+
+def case_save_graph(tools, G, opts):
+    path = os.path.join(opts.tmpdir, "save_graph.gml")
+    return lambda: tools["graph"].save_graph(G, path)
+
+def case_load_graph(tools, G, opts):
+    path = os.path.join(opts.tmpdir, "load_graph.gml")
+    tools["graph"].save_graph(G, path)
+    with contextlib.suppress(FileNotFoundError): # time the first load: GML parse and snapshot write
+        os.remove(path + ".snap")
+    return lambda: tools["graph"].load_graph(path)
+
+def case_equilibrium(tools, G, opts):
+    net = tools["traffic_analysis"].build_network(G)
+    return lambda: tools["traffic_analysis"].equilibrium(net, [0], [1], [float(len(G))])
+
+def case_social_optimum(tools, G, opts):
+    net = tools["traffic_analysis"].build_network(G)
+    return lambda: tools["traffic_analysis"].social_optimum(net, [0], [1], [float(len(G))])
+
+def case_equilibrium_road(tools, G, opts):
+    net = tools["traffic_analysis"].build_network(G)
+    return lambda: tools["traffic_analysis"].equilibrium(net, [0], [len(G) - 1], [float(len(G))])
+
+def case_equilibrium_od(tools, G, opts):
+    net = tools["traffic_analysis"].build_network(G)
+    zones = list(G)[::max(1, len(G) // 50)] # about 50 zones, every ordered pair one vehicle
+    origins, destinations = [u for u in zones for _ in zones], zones * len(zones)
+    return lambda: tools["traffic_analysis"].equilibrium(net, origins, destinations, [1.0] * len(origins), max_iterations=50, workers=opts.workers)
+
+def case_demand_sweep(tools, G, opts):
+    net = tools["traffic_analysis"].build_network(G)
+    zones = list(G)[::max(1, len(G) // 20)]
+    origins, destinations = [u for u in zones for _ in zones], zones * len(zones)
+    scales = np.linspace(0.5, 3.0, 20)
+    return lambda: tools["traffic_analysis"].price_of_anarchy_sweep(net, origins, destinations, [1.0] * len(origins), scales, gap=1e-3, workers=opts.workers)
+
+def case_braess_scan(tools, G, opts):
+    net = tools["traffic_analysis"].build_network(G)
+    zones = list(G)[::max(1, len(G) // 10)]
+    origins, destinations = [u for u in zones for _ in zones], zones * len(zones)
+    return lambda: tools["traffic_analysis"].braess_paradox(net, origins, destinations, [1.0] * len(origins), top=32, gap=1e-3, workers=opts.workers)
+
+def case_what_if_queries(tools, G, opts):
+    net = tools["traffic_analysis"].build_network(G)
+    zones = list(range(0, len(G), max(1, len(G) // 20))) # node ids, as the solver takes them
+    origins, destinations = [u for u in zones for _ in zones], zones * len(zones)
+    solver = tools["traffic_analysis"].EquilibriumSolver(net, origins, destinations, [1.0] * len(origins), workers=1)
+    busiest = np.argsort(-solver.solve()["flows"])[:10].tolist()
+    return lambda: [solver.what_if([j], b=net.b[j] + 1.0) for j in busiest]
+
+def case_market_clearing(tools, G, opts):
+    H = G.copy()
+    return lambda: tools["market_strategy"].market_clearing(H, max_rounds=opts.market_rounds)
+
+def case_compute_pagerank(tools, G, opts):
+    out = os.path.join(opts.tmpdir, "pagerank.txt")
+    return lambda: tools["page_rank"].compute_pagerank(G, out)
+
+CASES = {
+    "multi_source_bfs": ("er", None, case_multi_source_bfs),
+    "batched_bfs": ("er", None, case_batched_bfs),
+    "analyze_graph": ("er", 20000, case_analyze_graph),
+    "analyze_graph_sampled": ("er", None, case_analyze_graph_sampled),
+    "compute_metrics": ("er", None, case_compute_metrics),
+    "partition_graph": ("er", None, case_partition_graph),
+    "partition_graph_gn": ("er", 500, case_partition_graph_gn), # Girvan–Newman is far too slow beyond this
+    "robustness_check": ("er", 20000, case_robustness_check),
+    "robustness_curve": ("er", None, case_robustness_curve),
+    "targeted_attack": ("er", None, case_targeted_attack),
+    "verify_homophily": ("er", None, case_verify_homophily),
+    "verify_balance": ("er", None, case_verify_balance),
+    "save_graph": ("er", None, case_save_graph),
+    "load_graph": ("er", None, case_load_graph),
+    "equilibrium": ("traffic", None, case_equilibrium),
+    "social_optimum": ("traffic", None, case_social_optimum),
+    "equilibrium_road": ("road", None, case_equilibrium_road),
+    "equilibrium_od": ("road", None, case_equilibrium_od),
+    "demand_sweep": ("road", None, case_demand_sweep),
+    "braess_scan": ("road", None, case_braess_scan),
+    "what_if_queries": ("road", None, case_what_if_queries),
+    "market_clearing": ("market", 1000, case_market_clearing), # one price step per round, so rounds grow with valuations
+    "compute_pagerank": ("web", None, case_compute_pagerank),
+}
+
+def measure(prepare, tools, G, opts):
+    '''
+    Time one case 'opts.repeat' times (fresh setup each time, output suppressed),
+    then run it once more under tracemalloc for the peak memory.
+    Returns:
+        dict with times, min, median and peak_bytes
+    '''
+    times = []
+    for _ in range(opts.repeat):
+        call = prepare(tools, G, opts)
+        gc.collect()
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            call()
+            times.append(time.perf_counter() - t0)
+
+    peak = None
+    if not opts.no_memory:
+        call = prepare(tools, G, opts)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                call()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {"times": times, "min": min(times), "median": statistics.median(times), "peak_bytes": peak}
+
+def environment():
+    '''Versions and machine details stored with every result file.'''
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, timeout=30).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "networkx": nx.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def run_benchmarks(opts):
+    '''Run every selected case at every size that does not exceed its cap.'''
+    tools = {name: load_tool(name) for name in TOOLS}
+    names = opts.only or list(CASES)
+    results = []
+    graphs = {} # (kind, n) -> graph, shared by the cases that use it
+    for n in opts.sizes:
+        for name in names:
+            kind, cap, prepare = CASES[name]
+            row = {"case": name, "graph": kind, "n": n}
+            if cap is not None and n > cap and not opts.no_caps:
+                results.append({**row, "status": "skipped", "reason": f"n > {cap}"})
+                print(f"{name:24s} {kind:8s} n={n:<8d} skipped (n > {cap})")
+                continue
+            if (kind, n) not in graphs:
+                graphs[(kind, n)] = GRAPHS[kind](tools, n, opts.seed)
+            G = graphs[(kind, n)]
+            row["m"] = G.number_of_edges()
+            try:
+                row.update(measure(prepare, tools, G, opts), status="ok")
+                peak = f"{row['peak_bytes'] / 2**20:9.1f} MiB" if row["peak_bytes"] is not None else ""
+                print(f"{name:24s} {kind:8s} n={n:<8d} m={row['m']:<9d} median {row['median']:9.4f}s {peak}")
+            except (Exception, SystemExit) as e: # a failing tool is recorded, not fatal
+                row.update(status="error", error=f"{type(e).__name__}: {e}")
+                print(f"{name:24s} {kind:8s} n={n:<8d} error: {row['error']}")
+            results.append(row)
+    return results
+
+def write_csv(results, path):
+    '''Flat CSV version of the results (one row per case and size).'''
+    fields = ["case", "graph", "n", "m", "status", "min", "median", "peak_bytes", "error"]
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+
+def compare(results, baseline_file, threshold):
+    '''
+    Print the median-time ratio against an earlier result file and flag every case
+    that got slower by more than 'threshold'.
+    Returns:
+        number of regressions
+    '''
+    with open(baseline_file) as f:
+        baseline = {(r["case"], r["n"]): r for r in json.load(f)["results"] if r.get("status") == "ok"}
+    regressions = 0
+    print(f"\n--- Compared with {baseline_file} ---")
+    for r in results:
+        old = baseline.get((r["case"], r["n"]))
+        if r.get("status") != "ok" or old is None:
+            continue
+        ratio = r["median"] / old["median"] if old["median"] > 0 else float("inf")
+        flag = "REGRESSION" if ratio > threshold else ""
+        regressions += bool(flag)
+        print(f"{r['case']:24s} n={r['n']:<8d} {old['median']:9.4f}s -> {r['median']:9.4f}s  x{ratio:5.2f} {flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the graph tools at several graph sizes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 1000, 5000], help="Graph sizes (number of nodes)") # --sizes 1000 10000 100000
+    parser.add_argument("--only", nargs="+", choices=list(CASES), help="Run only these cases") # --only analyze_graph compute_pagerank
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case and size") # the median is reported
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the generated graphs")
+    parser.add_argument("--workers", type=int, help="Worker processes for the parallel shortest-path statistics")
+    parser.add_argument("--market_rounds", type=int, default=1000, help="Round limit passed to market_clearing") # keeps non-converging markets bounded
+    parser.add_argument("--no_memory", action="store_true", help="Skip the tracemalloc run") # tracemalloc slows the extra run down
+    parser.add_argument("--no_caps", action="store_true", help="Also run slow cases above their size cap")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON result file")
+    parser.add_argument("--csv", help="Also write the results as CSV")
+    parser.add_argument("--compare", help="Earlier JSON result file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio reported as a regression")
+    opts = parser.parse_args()
+
+    os.environ.setdefault("MPLBACKEND", "Agg") # no windows from the tools
+    with tempfile.TemporaryDirectory() as tmpdir:
+        opts.tmpdir = tmpdir
+        results = run_benchmarks(opts)
+
+    with open(opts.output, "w") as f:
+        json.dump({"environment": environment(), "settings": {"sizes": opts.sizes, "repeat": opts.repeat, "seed": opts.seed},
+                   "results": results}, f, indent=2)
+    print(f"\nResults written to {opts.output}")
+    if opts.csv:
+        write_csv(results, opts.csv)
+        print(f"CSV written to {opts.csv}")
+    if opts.compare:
+        sys.exit(1 if compare(results, opts.compare, opts.threshold) else 0)
+
+if __name__ == "__main__":
+    main()
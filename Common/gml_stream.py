@@ -0,0 +1,605 @@
+# Names: Khoa Vu (030063200) & Mya Barragan (029948137)
+# Course: CECS 427 (Sec. 02)
+# Professor: Oscar Morales-Ponce
+# Date: 10/17/2026
+
+'''
+Streaming GML reader and writer, drop-in replacements for nx.read_gml and
+nx.write_gml (same files, same graphs, same errors for malformed input).
+
+The reader decodes the file in blocks of whole lines and tokenizes each block
+with regular expressions: a flat node or edge record is one match of a pattern
+learned from the first record with the same keys and value types, anything
+else goes through a token-by-token parser. Records go into the graph block by
+block, so neither the text nor a token tree of the whole file is ever held in
+memory. The writer formats one record at a time
+and writes the text in large blocks; ints, floats and plain strings take a
+short path, everything else is formatted exactly like nx.generate_gml.
+Files ending in .gz or .bz2 are compressed, as with NetworkX.
+
+Citation(s):
+1) NetworkX Developers. (n.d.). read_gml — NetworkX documentation. Retrieved October, 2026, from https://networkx.org/documentation/stable/reference/readwrite/generated/networkx.readwrite.gml.read_gml.html
+2) Himsolt, M. (1997). GML: A portable Graph File Format. Universität Passau.
+3) Python Software Foundation. (n.d.). re — Regular expression operations. Retrieved October, 2026, from https://docs.python.org/3/library/re.html
+'''
+
+import bz2
+import gc
+import gzip
+import re
+import networkx as nx
+from networkx.readwrite.gml import LIST_START_VALUE, escape, unescape
+
+BLOCK_BYTES = 1 << 22 # bytes decoded and tokenized at a time
+FLUSH_RECORDS = 1 << 14 # node/edge records formatted before a write
+
+KEY, REAL, INT, STRING, DICT_START, DICT_END = 1, 2, 3, 4, 5, 6
+# Same token patterns as nx.parse_gml, with whitespace and comments skipped in front of every token
+TOKEN = re.compile(r'''(?:\s+|\#[^\n]*)*(?:
+    ([A-Za-z][0-9A-Za-z_]*)\b
+  | ([+-]?(?:[0-9]*\.[0-9]+|[0-9]+\.[0-9]*|INF)(?:[Ee][+-]?[0-9]+)?)
+  | ([+-]?[0-9]+)
+  | "([^"]*)"
+  | (\[)
+  | (\])
+)''', re.X)
+# A flat node/edge record: plain values only, each followed by white space or the closing bracket
+REAL_TEXT = r'[+-]?(?:[0-9]*\.[0-9]+|[0-9]+\.[0-9]*|INF)(?:[Ee][+-]?[0-9]+)?'
+VALUE = r'(?:"[^"\n]*"|[A-Za-z][0-9A-Za-z_]*|' + REAL_TEXT + r'|[+-]?[0-9]+)(?=[\s\]])'
+PAIR = re.compile(r'([A-Za-z][0-9A-Za-z_]*)\s+(' + VALUE + ')')
+RECORD = re.compile(r'(?:\s+|\#[^\n]*)*(node|edge)\s*\[((?:\s*[A-Za-z][0-9A-Za-z_]*\s+' + VALUE + r')*\s*)\]')
+MAX_SHAPES = 64 # record shapes (kind, key order and value types) given their own pattern
+BLANK = re.compile(r'(?:\s+|\#[^\n]*)*\Z')
+NEEDS_ESCAPE = re.compile('[^ -~]|[&"]')
+VALID_KEY = re.compile("[A-Za-z][0-9A-Za-z_]*")
+LABEL_KEYS = ("id", "label", "source", "target")
+checked_keys = set() # keys already validated by the writer
+
+class Fallback(Exception):
+    '''The file needs nx.read_gml: a duplicated edge (for its error message) or a graph type set after the edges.'''
+
+def open_gml(path, mode):
+    '''A file object for 'path' (already open files are used as they are; .gz and .bz2 are compressed).'''
+    if hasattr(path, "read" if mode == "rb" else "write"):
+        return path, False
+    path = str(path)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode), True
+    if path.endswith(".bz2"):
+        return bz2.BZ2File(path, mode), True
+    return open(path, mode), True
+
+def text_blocks(f):
+    '''Decoded text of a binary file in blocks that end on a line break.'''
+    tail = b""
+    while True:
+        block = f.read(BLOCK_BYTES)
+        if not block:
+            break
+        block = tail + block
+        end = block.rfind(b"\n") + 1
+        tail = block[end:]
+        if end:
+            yield decode(block[:end])
+    if tail:
+        yield decode(tail)
+
+def decode(data):
+    try:
+        return data.decode("ascii")
+    except UnicodeDecodeError as err:
+        raise nx.NetworkXError("input is not ASCII-encoded") from err
+
+def clean_value(values):
+    '''nx.parse_gml's rule for repeated keys: one value stays a value, several become a list.'''
+    if len(values) == 1:
+        return values[0]
+    if values[0] == LIST_START_VALUE:
+        return values[1:]
+    return values
+
+def clean_dict(dct):
+    return {key: clean_value(values) for key, values in dct.items()}
+
+class GraphBuilder:
+    '''
+    Adds node and edge records to a graph in file order, with nx.read_gml's checks.
+    nx.read_gml builds the graph on the GML ids and then relabels it, which copies
+    the graph and orders every adjacency like G.edges(). Here nodes get their final
+    keys right away; the copy is only made if the edges did not come in that order
+    (files written by write_gml always do).
+    '''
+
+    def __init__(self, label):
+        self.G = None
+        self.relabel = label is not None and label != "id"
+        self.label = label
+        self.directed = self.multigraph = False
+        self.nodes = self.edges = 0
+        self.key, self.position = {}, {} # GML id -> node key, node index
+        self.labels = set()
+        self.deferred = [] # edges read before one of their nodes; nx adds all nodes first
+        self.last, self.in_order = 0, True
+        self.batch, self.batched = [], 0 # simple-graph edges waiting for add_edges_from, edges batched so far
+
+    def set_type(self, directed, multigraph):
+        directed, multigraph = bool(directed), bool(multigraph)
+        if self.G is not None and (directed, multigraph) != (self.directed, self.multigraph):
+            if self.G.number_of_edges() or self.deferred or self.batch:
+                raise Fallback()
+            self.G = self.new_graph(directed, multigraph, self.G)
+        self.directed, self.multigraph = directed, multigraph
+
+    def new_graph(self, directed, multigraph, nodes_from=None):
+        if not multigraph:
+            G = nx.DiGraph() if directed else nx.Graph()
+        else:
+            G = nx.MultiDiGraph() if directed else nx.MultiGraph()
+        if nodes_from is not None:
+            G.add_nodes_from(nodes_from.nodes(data=True))
+        return G
+
+    def graph(self):
+        if self.G is None:
+            self.G = self.new_graph(self.directed, self.multigraph)
+        return self.G
+
+    def add_node(self, node):
+        if not isinstance(node, dict):
+            raise nx.NetworkXError(f"node #{self.nodes} is not a record")
+        id = pop_attr(node, "node", "id", self.nodes)
+        if id in self.key:
+            raise nx.NetworkXError(f"node id {id!r} is duplicated")
+        key = pop_attr(node, "node", self.label, self.nodes) if self.relabel else id
+        self.add_node_row(id, key, node)
+
+    def add_node_row(self, id, key, attrs):
+        '''A node record split into its GML id, its node key (label or id) and its attributes.'''
+        i = self.nodes
+        self.nodes += 1
+        if id in self.key:
+            raise nx.NetworkXError(f"node id {id!r} is duplicated")
+        if self.relabel:
+            if key in self.labels:
+                raise nx.NetworkXError(f"node label {key!r} is duplicated")
+            self.labels.add(key)
+        self.key[id], self.position[id] = key, i
+        self.graph().add_node(key, **attrs)
+
+    def add_edge(self, edge):
+        if not isinstance(edge, dict):
+            raise nx.NetworkXError(f"edge #{self.edges} is not a record")
+        source = pop_attr(edge, "edge", "source", self.edges)
+        target = pop_attr(edge, "edge", "target", self.edges)
+        self.add_edge_row(source, target, edge)
+
+    def add_edge_row(self, source, target, attrs):
+        '''An edge record split into its source and target ids and its attributes.'''
+        i = self.edges
+        self.edges += 1
+        key, position = self.key, self.position
+        if self.deferred or source not in key or target not in key:
+            self.deferred.append((i, source, target, attrs)) # keeps file order behind the first deferred edge
+        elif self.multigraph:
+            self.insert_edge(i, source, target, attrs)
+        else:
+            first = position[source]
+            if not self.directed and position[target] < first:
+                first = position[target]
+            if first < self.last:
+                self.in_order = False
+            self.last = first
+            self.batch.append((key[source], key[target], attrs))
+
+    def flush(self):
+        '''Add the batched edges (duplicates are merged here and caught by finish()).'''
+        if self.batch:
+            self.graph().add_edges_from(self.batch)
+            self.batched += len(self.batch)
+            self.batch = []
+
+    def insert_edge(self, i, source, target, edge):
+        G = self.graph()
+        if source not in self.key:
+            raise nx.NetworkXError(f"edge #{i} has undefined source {source!r}")
+        if target not in self.key:
+            raise nx.NetworkXError(f"edge #{i} has undefined target {target!r}")
+        u, v = self.key[source], self.key[target]
+        # G.edges() lists an edge under its first endpoint in node order (undirected) or its tail
+        first = self.position[source] if self.directed else min(self.position[source], self.position[target])
+        if first < self.last:
+            self.in_order = False
+        self.last = first
+        arrow = "->" if self.directed else "--"
+        if not self.multigraph:
+            if G.has_edge(u, v):
+                raise nx.NetworkXError(f"edge #{i} ({source!r}{arrow}{target!r}) is duplicated")
+            G.add_edge(u, v, **edge)
+        else:
+            key = edge.pop("key", None)
+            if key is not None and G.has_edge(u, v, key):
+                msg = f"edge #{i} ({source!r}{arrow}{target!r}, {key!r})"
+                msg2 = 'Hint: If multigraph add "multigraph 1" to file header.'
+                raise nx.NetworkXError(msg + " is duplicated\n" + msg2)
+            G.add_edge(u, v, key, **edge)
+
+    def finish(self, attrs):
+        self.flush()
+        G = self.graph()
+        if self.batched and G.number_of_edges() != self.batched:
+            raise Fallback() # a duplicated edge was merged; nx.read_gml reports which one
+        for args in self.deferred:
+            self.insert_edge(*args)
+        self.deferred = []
+        G.graph.update(attrs)
+        if self.relabel and not self.in_order: # the copy nx.relabel_nodes would have made
+            H = self.new_graph(self.directed, self.multigraph, G)
+            H.add_edges_from(G.edges(keys=True, data=True) if self.multigraph else G.edges(data=True))
+            H.graph.update(G.graph)
+            G = H
+        return G
+
+def pop_attr(dct, category, attr, i):
+    try:
+        return dct.pop(attr)
+    except KeyError as err:
+        raise nx.NetworkXError(f"{category} #{i} has no {attr!r} attribute") from err
+
+def string_value(value, destringizer):
+    '''A quoted GML string (quotes removed) as nx.parse_gml returns it.'''
+    if "\n" in value: # a string spread over lines is joined with single spaces
+        value = re.sub(r"\s*\n\s*", " ", value)
+    if "&" in value:
+        value = unescape(value)
+    if destringizer:
+        try:
+            value = destringizer(value)
+        except ValueError:
+            pass
+    if value == "()":
+        value = ()
+    if value == "[]":
+        value = []
+    return value
+
+def word_value(value, destringizer):
+    '''An unquoted word given for id, label, source or target.'''
+    value = unescape(value)
+    if destringizer:
+        try:
+            value = destringizer(value)
+        except ValueError:
+            pass
+    return value
+
+def plain_value(key, text, destringizer):
+    '''The value of one VALUE match, or None if it is a bare word nx.parse_gml does not accept there.'''
+    first = text[0]
+    if first == '"':
+        return string_value(text[1:-1], destringizer)
+    if first.isalpha():
+        if key in LABEL_KEYS:
+            return word_value(text, destringizer)
+        return float(text) if text in ("NAN", "INF") else None
+    if "." in text or "I" in text:
+        return float(text)
+    return int(text)
+
+def flat_record(pairs, destringizer):
+    '''
+    Attributes of a flat record from its (key, value text) pairs, or None when the
+    token path has to parse it (a key given twice, or a bare word that is not a valid value).
+    '''
+    record = {}
+    for key, text in pairs:
+        value = plain_value(key, text, destringizer)
+        if value is None or key in record:
+            return None
+        record[key] = value
+    return record
+
+def record_shape(kind, pairs, label, destringizer):
+    '''
+    A pattern for records of one kind with the same keys, in the same order and with
+    the same token type (int, real or string) for every value as 'pairs'.
+    Returns:
+        (pattern, kind, converters, id columns, attribute columns) or None if a value is a
+        bare word or an id column is missing; the id columns are source and target for
+        edges, id and label (or id twice) for nodes
+    '''
+    keys = [key for key, _ in pairs]
+    ids = ("source", "target") if kind == "edge" else ("id", label if label is not None and label != "id" else "id")
+    if not all(key in keys for key in ids):
+        return None
+    parts, converters = [], []
+    for key, text in pairs:
+        if text[0] == '"':
+            parts.append(r'"([^"\n]*)"')
+            converters.append(lambda value: string_value(value, destringizer))
+        elif text[0].isalpha():
+            return None
+        elif "." in text or "I" in text:
+            parts.append("(" + REAL_TEXT + ")")
+            converters.append(float)
+        else:
+            parts.append(r"([+-]?[0-9]+)")
+            converters.append(int)
+    body = "".join(r"\s*" + key + r"\s+" + part + r"(?=[\s\]])" for key, part in zip(keys, parts))
+    pattern = re.compile(r"(?:\s+|\#[^\n]*)*" + kind + r"\s*\[" + body + r"\s*\]")
+    columns = [(key, j) for j, key in enumerate(keys) if key not in ids]
+    return pattern, kind, converters, (keys.index(ids[0]), keys.index(ids[1])), columns
+
+def parse_blocks(blocks, label="label", destringizer=None):
+    '''
+    Parse GML text given as an iterable of blocks that end on line breaks.
+    Returns:
+        the graph nx.parse_gml would build from the joined text
+    '''
+    builder = GraphBuilder(label)
+    top = {}
+    stack = [] # open dicts below the top level: [dict of key -> list of values, key in the parent]
+    graph_dict = None # the dict of the "graph [ ... ]" record while it is open
+    graphs = 0
+    pending = None # key waiting for its value
+    carry, line, partial = "", 0, False
+    shapes, shape = {}, None # record signature -> record_shape; the shape of the last flat record
+
+    def where(text, pos):
+        return f"({line + text.count(chr(10), 0, pos) + 1}, {pos - text.rfind(chr(10), 0, pos)})"
+
+    def fail(text, pos, expected, found):
+        raise nx.NetworkXError(f"expected {expected}, found {found} at {where(text, pos)}")
+
+    for block in blocks:
+        text, carry = carry + block, ""
+        pos = 0
+        while True:
+            if pending is None and stack and stack[-1][0] is graph_dict:
+                # Short paths: a whole node or edge record of plain values in one match, first
+                # with the pattern of the last record's shape, which captures every value directly
+                if shape is not None:
+                    m = shape[0].match(text, pos)
+                    if m is not None:
+                        values = [convert(value) for convert, value in zip(shape[2], m.groups())]
+                        (a, b), attrs = shape[3], {key: values[j] for key, j in shape[4]}
+                        if shape[1] == "node":
+                            builder.add_node_row(values[a], values[b], attrs)
+                        else:
+                            builder.add_edge_row(values[a], values[b], attrs)
+                        pos = m.end()
+                        continue
+                m = RECORD.match(text, pos)
+                if m is not None:
+                    pairs = PAIR.findall(text, m.start(2), m.end()) # up to the ']' the lookahead needs
+                    record = flat_record(pairs, destringizer)
+                    if record is not None:
+                        kind = m.group(1)
+                        signature = (kind,) + tuple((key, text[0]) for key, text in pairs)
+                        if signature not in shapes and len(shapes) < MAX_SHAPES:
+                            shapes[signature] = record_shape(kind, pairs, label, destringizer)
+                        shape = shapes.get(signature)
+                        builder.add_node(record) if kind == "node" else builder.add_edge(record)
+                        pos = m.end()
+                        continue
+            m = TOKEN.match(text, pos)
+            if m is None:
+                break
+            pos = m.end()
+            kind = m.lastindex
+            value = m.group(kind)
+            current = stack[-1][0] if stack else top
+            if pending is None:
+                if kind == KEY:
+                    pending = value
+                elif kind == DICT_END and stack:
+                    dct, key = stack.pop()
+                    if dct is graph_dict and not stack:
+                        continue # attributes of the graph are applied at the end
+                    record = clean_dict(dct)
+                    if len(stack) == 1 and stack[0][0] is graph_dict and key in ("node", "edge"):
+                        builder.add_node(record) if key == "node" else builder.add_edge(record)
+                    else:
+                        (stack[-1][0] if stack else top).setdefault(key, []).append(record)
+                else:
+                    fail(text, m.start(kind), "']'" if stack else "EOF", repr(value))
+                continue
+            if kind == INT:
+                value = int(value)
+            elif kind == REAL:
+                value = float(value)
+            elif kind == STRING:
+                value = string_value(value, destringizer)
+            elif kind == DICT_START:
+                dct = {}
+                if pending == "graph" and not stack:
+                    graphs += 1
+                    if graphs > 1:
+                        raise nx.NetworkXError("input contains more than one graph")
+                    graph_dict = dct
+                stack.append((dct, pending))
+                pending = None
+                continue
+            elif kind == KEY and pending in LABEL_KEYS:
+                value = word_value(value, destringizer)
+            elif kind == KEY and value in ("NAN", "INF"):
+                value = float(value)
+            else:
+                fail(text, m.start(kind), "an int, float, string or '['", repr(value))
+            if current is graph_dict and pending in ("node", "edge"):
+                builder.add_node(value) if pending == "node" else builder.add_edge(value) # not a record: fails like nx
+                pending = None
+                continue
+            current.setdefault(pending, []).append(value)
+            if current is graph_dict and pending in ("directed", "multigraph"):
+                builder.set_type(clean_value(graph_dict.get("directed", [False])), clean_value(graph_dict.get("multigraph", [False])))
+            pending = None
+        builder.flush()
+        rest = text[pos:]
+        if not BLANK.match(rest):
+            if rest.lstrip().startswith('"'): # a string that goes on in the next block
+                carry = rest
+            else:
+                start = pos + len(rest) - len(rest.lstrip())
+                end = text.find("\n", start)
+                raise nx.NetworkXError(f"cannot tokenize {text[start:end if end >= 0 else len(text)]} at {where(text, start)}")
+        line += text.count("\n", 0, len(text) - len(carry))
+        partial = not text.endswith("\n") # the last line has no line break
+
+    if carry or pending is not None or stack:
+        expected = "an int, float, string or '['" if pending is not None else "']'"
+        raise nx.NetworkXError(f"expected {expected}, found EOF at ({line + partial + 1}, 1)")
+    if graph_dict is None:
+        raise nx.NetworkXError("input contains no graph")
+    attrs = clean_dict(graph_dict)
+    directed, multigraph = attrs.pop("directed", False), attrs.pop("multigraph", False)
+    builder.set_type(directed, multigraph)
+    return builder.finish(attrs)
+
+def read_gml(path, label="label", destringizer=None):
+    '''
+    Read a graph from a GML file like nx.read_gml, in blocks of BLOCK_BYTES.
+    Arguments:
+        path (str or binary file): GML file; names ending in .gz or .bz2 are decompressed
+        label (str): node attribute used as the node key (None or "id": the GML ids)
+        destringizer (callable): converts string values, as in nx.read_gml
+    Returns:
+        networkx graph
+    '''
+    f, own = open_gml(path, "rb")
+    collect = gc.isenabled()
+    gc.disable() # millions of new attribute dicts would trigger many full collections, none of which frees anything
+    try:
+        return parse_blocks(text_blocks(f), label, destringizer)
+    except Fallback:
+        if not own:
+            raise nx.NetworkXError("duplicated edge, or graph type given after the edges")
+        return nx.read_gml(path, label=label, destringizer=destringizer)
+    finally:
+        if collect:
+            gc.enable()
+        if own:
+            f.close()
+
+def check_key(key):
+    if key not in checked_keys:
+        if not isinstance(key, str):
+            raise nx.NetworkXError(f"{key!r} is not a string")
+        if not VALID_KEY.fullmatch(key):
+            raise nx.NetworkXError(f"{key!r} is not a valid key")
+        checked_keys.add(key)
+
+def float_text(value):
+    '''A float as nx.generate_gml writes it: upper case, +INF, always a decimal point.'''
+    text = repr(value).upper()
+    if text == "INF":
+        return "+INF"
+    epos = text.rfind("E")
+    if epos != -1 and text.find(".", 0, epos) == -1:
+        text = text[:epos] + "." + text[epos:]
+    return text
+
+def format_entry(key, value, indent, stringizer=None, in_list=False):
+    '''GML text (lines ending in newlines) of one key/value pair, exactly as nx.generate_gml writes it.'''
+    check_key(key)
+    if isinstance(value, int | bool):
+        if key == "label":
+            text = '"' + str(value) + '"'
+        elif value is True:
+            text = "1"
+        elif value is False:
+            text = "0"
+        elif value < -(2**31) or value >= 2**31: # GML integers are 32-bit
+            text = '"' + str(value) + '"'
+        else:
+            text = str(value)
+        return indent + key + " " + text + "\n"
+    if isinstance(value, float):
+        text = float_text(value)
+        return indent + key + (' "' + text + '"' if key == "label" else " " + text) + "\n"
+    if isinstance(value, dict):
+        inner = "".join(format_entry(k, v, indent + "  ", stringizer) for k, v in value.items())
+        return indent + key + " [\n" + inner + indent + "]\n"
+    if isinstance(value, tuple) and key == "label":
+        return indent + key + f' "({",".join(repr(v) for v in value)})"' + "\n"
+    if isinstance(value, list | tuple) and key != "label" and not in_list:
+        head = ""
+        if len(value) == 0:
+            head = indent + key + " " + f'"{value!r}"' + "\n"
+        if len(value) == 1:
+            head = indent + key + " " + f'"{LIST_START_VALUE}"' + "\n"
+        return head + "".join(format_entry(key, v, indent, stringizer, True) for v in value)
+    if stringizer:
+        try:
+            value = stringizer(value)
+        except ValueError as err:
+            raise nx.NetworkXError(f"{value!r} cannot be converted into a string") from err
+    if not isinstance(value, str):
+        raise nx.NetworkXError(f"{value!r} is not a string")
+    return indent + key + ' "' + escape(value) + '"\n'
+
+def format_attrs(out, attrs, ignored, indent, stringizer):
+    '''Append the entries of one attribute dict to 'out'; ints, floats and plain strings skip format_entry.'''
+    for key, value in attrs.items():
+        if key not in checked_keys:
+            check_key(key)
+        if key in ignored:
+            continue
+        kind = type(value)
+        if kind is int and -2147483648 <= value < 2147483648 and key != "label":
+            out.append(f"{indent}{key} {value}\n")
+        elif kind is float and key != "label":
+            out.append(f"{indent}{key} {float_text(value)}\n")
+        elif kind is str and stringizer is None and not NEEDS_ESCAPE.search(value):
+            out.append(f'{indent}{key} "{value}"\n')
+        else:
+            out.append(format_entry(key, value, indent, stringizer))
+
+def write_gml(G, path, stringizer=None):
+    '''
+    Write G to a GML file byte for byte like nx.write_gml, FLUSH_RECORDS records at a time.
+    Arguments:
+        G (networkx graph): graph to write
+        path (str or binary file): output; names ending in .gz or .bz2 are compressed
+        stringizer (callable): converts values that are not int/float/str/dict/list, as in nx.write_gml
+    '''
+    f, own = open_gml(path, "wb")
+    try:
+        out = ["graph [\n"]
+        def flush():
+            f.write("".join(out).encode("ascii"))
+            out.clear()
+
+        multigraph = G.is_multigraph()
+        if G.is_directed():
+            out.append("  directed 1\n")
+        if multigraph:
+            out.append("  multigraph 1\n")
+        format_attrs(out, G.graph, {"directed", "multigraph", "node", "edge"}, "  ", stringizer)
+
+        node_id = dict(zip(G, range(len(G))))
+        for i, (node, attrs) in enumerate(G.nodes.items()):
+            out.append(f"  node [\n    id {i}\n")
+            if type(node) is str and not NEEDS_ESCAPE.search(node):
+                out.append(f'    label "{node}"\n')
+            else:
+                out.append(format_entry("label", node, "    ", stringizer))
+            format_attrs(out, attrs, ("id", "label"), "    ", stringizer)
+            out.append("  ]\n")
+            if i % FLUSH_RECORDS == FLUSH_RECORDS - 1:
+                flush()
+
+        ignored = ("source", "target", "key") if multigraph else ("source", "target")
+        edges = G.edges(keys=True, data=True) if multigraph else G.edges(data=True)
+        for i, e in enumerate(edges):
+            out.append(f"  edge [\n    source {node_id[e[0]]}\n    target {node_id[e[1]]}\n")
+            if multigraph:
+                out.append(format_entry("key", e[2], "    ", stringizer))
+            format_attrs(out, e[-1], ignored, "    ", stringizer)
+            out.append("  ]\n")
+            if i % FLUSH_RECORDS == FLUSH_RECORDS - 1:
+                flush()
+        out.append("]\n")
+        flush()
+    finally:
+        if own:
+            f.close()
@@ -0,0 +1,125 @@
+# Names: Khoa Vu (030063200) & Mya Barragan (029948137)
+# Course: CECS 427 (Sec. 02)
+# Professor: Oscar Morales-Ponce
+# Date: 10/17/2026
+
+'''
+Columnar node and edge attributes for a NetworkX graph. Node i is nodes[i] of
+graph_to_csr, edge j is the j-th distinct edge met while walking the CSR, and
+every CSR entry knows its edge id, so per-entry arrays are a single gather.
+Columns are read from the attribute dicts once per (name, default, dtype), on
+first use, and written back only by sync(), so analyses exchange whole arrays instead of touching one dict
+per node or edge.
+
+Citation(s):
+1) NetworkX Developers. (n.d.). NetworkX documentation (stable). NetworkX. Retrieved October, 2026, from https://networkx.org/documentation/stable/
+2) pandas Development Team. (n.d.). pandas.factorize — pandas documentation. Retrieved October, 2026, from https://pandas.pydata.org/docs/reference/api/pandas.factorize.html
+'''
+
+import numpy as np
+import pandas as pd
+
+from graph_csr import graph_to_csr
+
+class GraphColumns:
+    '''
+    Column store over a simple (non-multi) graph. The structure is fixed when the
+    store is built; call sync() and build a new store after adding or removing
+    nodes or edges.
+    Attributes:
+        nodes (list), index (dict node -> int), indptr, indices (numpy arrays): see graph_to_csr
+        entry_edge (numpy array): edge id of every CSR entry
+        tails, heads (numpy arrays): node ids of every edge
+    '''
+
+    def __init__(self, G):
+        if G.is_multigraph():
+            raise ValueError("GraphColumns needs a simple graph")
+        self.G = G
+        self.nodes, self.index, self.indptr, self.indices = graph_to_csr(G)
+        n = len(self.nodes)
+        tails = np.repeat(np.arange(n), np.diff(self.indptr))
+        if G.is_directed():
+            self.first = np.ones(len(tails), dtype=bool)
+            self.entry_edge = np.arange(len(tails))
+        else:   # an undirected edge is numbered at its entry (u, v) with u <= v
+            self.first = tails <= self.indices
+            keys = np.minimum(tails, self.indices) * n + np.maximum(tails, self.indices)
+            edge_keys = keys[self.first]
+            order = np.argsort(edge_keys, kind='stable')
+            self.entry_edge = order[np.searchsorted(edge_keys[order], keys)]
+        self.tails, self.heads = tails[self.first], self.indices[self.first].astype(np.int64)
+        self.columns = {"node": {}, "edge": {}}  # columns replaced with set(), by name
+        self.cache = {"node": {}, "edge": {}}    # columns read from the graph, by (name, default, dtype)
+        self.dirty = set()
+        self.dicts = {} # the graph's own attribute dicts, listed on first use
+
+    def size(self, kind):
+        return len(self.nodes) if kind == "node" else len(self.tails)
+
+    def data(self, kind):
+        '''The attribute dicts of the nodes or edges, in column order.'''
+        if kind not in self.dicts:
+            if kind == "node":
+                self.dicts[kind] = [self.G.nodes[u] for u in self.nodes]
+            else:   # CSR order is adjacency order, so the edge dicts are the first entries of a walk over it
+                entry = [d for _, nbrs in self.G.adjacency() for d in nbrs.values()]
+                self.dicts[kind] = [entry[k] for k in np.flatnonzero(self.first).tolist()]
+        return self.dicts[kind]
+
+    def column(self, kind, name, default=np.nan, dtype=float):
+        '''Column 'name' of the nodes or edges, read from the graph on first use (missing -> default).'''
+        if name in self.columns[kind]:
+            return self.columns[kind][name].astype(dtype, copy=False)
+        key = (name, default, dtype)
+        if key not in self.cache[kind]:
+            data = self.data(kind)
+            self.cache[kind][key] = np.fromiter((d.get(name, default) for d in data), dtype=dtype, count=len(data))
+        return self.cache[kind][key]
+
+    def node(self, name, default=np.nan, dtype=float):
+        return self.column("node", name, default, dtype)
+
+    def edge(self, name, default=np.nan, dtype=float):
+        return self.column("edge", name, default, dtype)
+
+    def entries(self, name, default=np.nan, dtype=float):
+        '''Edge column 'name' spread over the CSR entries (both directions of an undirected edge).'''
+        return self.edge(name, default, dtype)[self.entry_edge]
+
+    def present(self, kind, name):
+        '''Mask of the nodes or edges that have attribute 'name' (all of them once the column was replaced with set()).'''
+        if (kind, name) in self.dirty:
+            return np.ones(self.size(kind), dtype=bool)
+        return np.fromiter((name in d for d in self.data(kind)), dtype=bool, count=len(self.data(kind)))
+
+    def codes(self, name):
+        '''
+        Node column 'name' as integer categories.
+        Returns:
+            (codes, categories): codes[i] indexes categories, -1 where the attribute is missing
+        '''
+        codes, categories = pd.factorize(pd.Series(self.node(name, None, object), dtype=object), use_na_sentinel=True)
+        return codes.astype(np.int64), list(categories)
+
+    def set(self, kind, name, values):
+        '''Replace a whole column; it reaches the graph at the next sync().'''
+        values = np.asarray(values)
+        if len(values) != self.size(kind):
+            raise ValueError(f"{kind} column '{name}' needs {self.size(kind)} values, got {len(values)}")
+        self.columns[kind][name] = values
+        self.cache[kind] = {key: col for key, col in self.cache[kind].items() if key[0] != name}
+        self.dirty.add((kind, name))
+
+    def set_node(self, name, values):
+        self.set("node", name, values)
+
+    def set_edge(self, name, values):
+        self.set("edge", name, values)
+
+    def sync(self):
+        '''Write every column changed since the last sync back into the graph's attribute dicts.'''
+        for kind, name in sorted(self.dirty):
+            for d, value in zip(self.data(kind), self.columns[kind][name].tolist()):
+                d[name] = value
+        self.dirty.clear()
@@ -0,0 +1,53 @@
+# Names: Khoa Vu (030063200) & Mya Barragan (029948137)
+# Course: CECS 427 (Sec. 02)
+# Professor: Oscar Morales-Ponce
+# Date: 10/17/2026
+
+'''
+Compressed sparse row (CSR) adjacency shared by the graph tools.
+
+Citation(s):
+1) NetworkX Developers. (n.d.). NetworkX documentation (stable). NetworkX. Retrieved October, 2026, from https://networkx.org/documentation/stable/
+2) NumPy Developers. (n.d.). NumPy documentation. NumPy. Retrieved October, 2026, from https://numpy.org/doc/stable/
+'''
+
+import numpy as np
+
+def graph_to_csr(G):
+    '''
+    Convert a NetworkX graph into compressed sparse row (CSR) adjacency arrays.
+    Node i of the arrays is nodes[i]; its neighbors are indices[indptr[i]:indptr[i + 1]].
+    Returns:
+        nodes (list), index (dict node -> int), indptr (numpy array), indices (numpy array)
+    '''
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    n = len(nodes)
+    id_type = np.int32 if n < 2**31 else np.int64 # half the memory for anything but huge graphs
+
+    degrees = np.fromiter((len(G[u]) for u in nodes), dtype=np.int64, count=n)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(degrees, out=indptr[1:])
+    indices = np.fromiter((index[v] for u in nodes for v in G.neighbors(u)),
+                          dtype=id_type, count=int(indptr[-1]))
+    return nodes, index, indptr, indices
+
+def csr_neighbors(indptr, indices, frontier, positions=False):
+    '''
+    Gather the neighbors of every node in 'frontier' in one vectorized step.
+    Returns:
+        (parents, neighbors) arrays of equal length, one entry per adjacency, plus the
+        adjacency positions (offsets into 'indices') when positions=True
+    '''
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        empty = np.empty(0, dtype=indices.dtype)
+        return (empty, empty, np.empty(0, dtype=np.int64)) if positions else (empty, empty)
+    # Position k of the output reads indices[starts[j] + (k - offset of j)] for its owner j
+    offsets = np.cumsum(counts) - counts
+    where = np.repeat(starts - offsets, counts) + np.arange(total)
+    if positions:
+        return np.repeat(frontier, counts), indices[where], where
+    return np.repeat(frontier, counts), indices[where]
@@ -0,0 +1,352 @@
+# Names: Khoa Vu (030063200) & Mya Barragan (029948137)
+# Course: CECS 427 (Sec. 02)
+# Professor: Oscar Morales-Ponce
+# Date: 10/17/2026
+
+'''
+Binary snapshot cache for GML graphs.
+
+The first time a GML file is read, a snapshot is written next to it (file.gml.snap).
+It holds the edges in CSR order (indptr/indices) and every node and edge attribute as
+its own column, all as raw arrays behind a small JSON header. Later runs memory-map
+those arrays instead of parsing the GML text again. A snapshot is used only while the
+GML file keeps the size and modification time it had when the snapshot was written,
+or, if only the time changed, the same content hash (the new time is then recorded).
+The rebuilt graph matches the parsed one exactly: nodes, adjacency and attribute
+keys come back in their original order.
+
+Layout:
+    b"GSNAP1\n" | header length (8 bytes, little endian) | JSON header | padding | arrays
+
+Citation(s):
+1) NumPy Developers. (n.d.). numpy.memmap — NumPy Manual. Retrieved October, 2026, from https://numpy.org/doc/stable/reference/generated/numpy.memmap.html
+2) NetworkX Developers. (n.d.). read_gml — NetworkX documentation. Retrieved October, 2026, from https://networkx.org/documentation/stable/reference/readwrite/generated/networkx.readwrite.gml.read_gml.html
+'''
+
+import hashlib
+import heapq
+import json
+import os
+import struct
+import networkx as nx
+import numpy as np
+
+from gml_stream import read_gml
+
+MAGIC = b"GSNAP1\n"
+ALIGN = 64 # arrays start on 64-byte boundaries so they can be mapped directly
+
+class UnsupportedGraph(Exception):
+    '''Raised when a graph holds something the snapshot format cannot store.'''
+
+def file_digest(path):
+    '''BLAKE2b hash of a file, read in 1 MiB blocks.'''
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def snapshot_path(path, label="label"):
+    '''Snapshot file for 'path'; read_gml's 'label' option changes node keys, so it is part of the name.'''
+    if label == "label":
+        return path + ".snap"
+    return f"{path}.{label or 'id'}.snap"
+
+def encode_column(values):
+    '''
+    Encode a list of attribute values (None = missing) as flat arrays.
+    Returns:
+        (kind, {suffix: numpy array})
+    '''
+    present = np.array([v is not None for v in values], dtype=bool)
+    found = [v for v in values if v is not None]
+    arrays = {} if present.all() else {"present": present}
+
+    if all(isinstance(v, bool) for v in found):
+        kind = "bool"
+        arrays["values"] = np.array([bool(v) for v in values], dtype=bool)
+    elif all(isinstance(v, int) and not isinstance(v, bool) and -2**63 <= v < 2**63 for v in found):
+        kind = "int"
+        arrays["values"] = np.array([v if v is not None else 0 for v in values], dtype=np.int64)
+    elif all(isinstance(v, float) for v in found):
+        kind = "float"
+        arrays["values"] = np.array([v if v is not None else 0.0 for v in values], dtype=np.float64)
+    else:
+        # Strings are stored as one UTF-8 blob plus offsets; anything else goes through JSON
+        kind = "str" if all(isinstance(v, str) for v in found) else "json"
+        try:
+            texts = [v if kind == "str" else json.dumps(v) for v in found]
+        except TypeError as e:
+            raise UnsupportedGraph(f"attribute value not serializable: {e}")
+        encoded = [t.encode("utf-8") for t in texts]
+        lengths = np.zeros(len(values), dtype=np.int64)
+        lengths[present] = [len(e) for e in encoded]
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        arrays["offsets"] = offsets
+        arrays["blob"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return kind, arrays
+
+def decode_column(kind, arrays):
+    '''Inverse of encode_column: a list of Python values (None = missing).'''
+    if kind in ("str", "json"):
+        blob, offsets = arrays["blob"].tobytes(), arrays["offsets"].tolist()
+        texts = [blob[a:b].decode("utf-8") for a, b in zip(offsets[:-1], offsets[1:])]
+        values = texts if kind == "str" else [json.loads(t) if t else None for t in texts]
+    else:
+        values = arrays["values"].tolist()
+    if "present" in arrays:
+        values = [v if p else None for v, p in zip(values, arrays["present"].tolist())]
+    return values
+
+def key_orders(dicts):
+    '''
+    Attribute names of 'dicts' in first-seen order, and how to restore each dict's own key order.
+    Returns:
+        (names, orders, codes): dict i has the keys orders[codes[i]] in that order; codes is
+        None when every dict lists its keys in the order of 'names'
+    '''
+    names = list(dict.fromkeys(k for d in dicts for k in d))
+    rank = {k: i for i, k in enumerate(names)}
+    orders, seen, codes = [], {}, []
+    for d in dicts:
+        keys = tuple(d)
+        if keys not in seen:
+            seen[keys] = len(orders)
+            orders.append(list(keys))
+        codes.append(seen[keys])
+    if all(o == sorted(o, key=rank.__getitem__) for o in orders):
+        return names, None, None
+    return names, orders, np.array(codes, dtype=np.int64)
+
+def insertion_order(G, edges):
+    '''
+    An order of 'edges' (as listed by G.edges()) that, added to an empty graph, rebuilds every
+    adjacency dict of G in its current order: each node's neighbors (and, for a directed graph,
+    predecessors) must be met in their dict order, so edges are sorted topologically under those
+    constraints. Returns None when the listed order already does it.
+    '''
+    directed = G.is_directed()
+    ids = {}
+    for i, (u, v, _) in enumerate(edges):
+        ids[u, v] = i
+        if not directed:
+            ids[v, u] = i
+    after = [[] for _ in edges] # edges that must come later
+    blocked = [0] * len(edges)
+    lists = [[ids[u, v] for v in G._adj[u]] for u in G]
+    if directed:
+        lists += [[ids[w, u] for w in G._pred[u]] for u in G]
+    for seq in lists:
+        for a, b in zip(seq, seq[1:]):
+            if a != b:
+                after[a].append(b)
+                blocked[b] += 1
+    ready = [i for i, c in enumerate(blocked) if c == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        i = heapq.heappop(ready)
+        order.append(i)
+        for j in after[i]:
+            blocked[j] -= 1
+            if not blocked[j]:
+                heapq.heappush(ready, j)
+    if len(order) < len(edges): # adjacency dicts edited by hand: no single order rebuilds them all
+        return None
+    order = np.array(order, dtype=np.int64)
+    return None if np.array_equal(order, np.arange(len(edges))) else order
+
+def write_snapshot(G, snap, source):
+    '''
+    Write the snapshot of G, read from the GML file 'source', to 'snap'. The file is
+    written under a temporary name and moved into place, so readers never see half of it.
+    '''
+    if G.is_multigraph():
+        raise UnsupportedGraph("multigraphs are not cached")
+    nodes = list(G.nodes())
+    if not (all(isinstance(v, str) for v in nodes) or
+            all(isinstance(v, int) and not isinstance(v, bool) for v in nodes)):
+        raise UnsupportedGraph("node keys must be all strings or all integers")
+    index = {v: i for i, v in enumerate(nodes)}
+
+    # G.edges() lists edges grouped by their first endpoint in node order, which is CSR order
+    edges = list(G.edges(data=True))
+    added = insertion_order(G, edges) # position in 'edges' of the i-th edge to add when rebuilding
+    tails = np.fromiter((index[u] for u, _, _ in edges), dtype=np.int64, count=len(edges))
+    if np.any(np.diff(tails) < 0):
+        order = np.argsort(tails, kind="stable")
+        edges, tails = [edges[i] for i in order], tails[order]
+        if added is not None:
+            added = np.argsort(order)[added]
+    heads = np.fromiter((index[v] for _, v, _ in edges), dtype=np.int64, count=len(edges))
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(tails, minlength=len(nodes)), out=indptr[1:])
+
+    arrays = {"indptr": indptr, "indices": heads.astype(np.int32 if len(nodes) < 2**31 else np.int64)}
+    columns = {}
+    def add_column(key, values):
+        kind, parts = encode_column(values)
+        columns[key] = kind
+        for suffix, array in parts.items():
+            arrays[f"{key}.{suffix}"] = array
+
+    add_column("node", nodes)
+    if added is not None:
+        arrays["added"] = added
+    node_data = [d for _, d in G.nodes(data=True)]
+    edge_data = [d for _, _, d in edges]
+    node_names, node_orders, node_codes = key_orders(node_data)
+    edge_names, edge_orders, edge_codes = key_orders(edge_data)
+    for i, name in enumerate(node_names):
+        add_column(f"nattr{i}", [d.get(name) for d in node_data])
+    for i, name in enumerate(edge_names):
+        add_column(f"eattr{i}", [d.get(name) for d in edge_data])
+    if node_codes is not None:
+        arrays["node_keys"] = node_codes
+    if edge_codes is not None:
+        arrays["edge_keys"] = edge_codes
+
+    stat = os.stat(source)
+    header = {
+        "source": {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "blake2b": file_digest(source)},
+        "directed": G.is_directed(),
+        "graph": dict(G.graph),
+        "columns": columns,
+        "node_attrs": node_names,
+        "edge_attrs": edge_names,
+        "node_key_orders": node_orders,
+        "edge_key_orders": edge_orders,
+        "arrays": {},
+    }
+    offset = 0
+    for name, array in arrays.items():
+        header["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += -(-array.nbytes // ALIGN) * ALIGN
+    try:
+        text = json.dumps(header).encode("utf-8")
+    except TypeError as e:
+        raise UnsupportedGraph(f"graph attributes not serializable: {e}")
+    start = -(-(len(MAGIC) + 8 + len(text)) // ALIGN) * ALIGN
+
+    tmp = f"{snap}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + struct.pack("<Q", len(text)) + text)
+            for name, array in arrays.items():
+                f.seek(start + header["arrays"][name]["offset"])
+                f.write(np.ascontiguousarray(array).tobytes())
+            f.truncate(start + offset)
+        os.replace(tmp, snap)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+class GraphSnapshot:
+    '''
+    A snapshot opened read-only. The arrays (indptr, indices and the attribute columns)
+    are numpy memory maps over the file, so opening one costs no parsing and no copies.
+    '''
+
+    def __init__(self, snap):
+        self.path = snap
+        with open(snap, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{snap} is not a graph snapshot")
+            (length,) = struct.unpack("<Q", f.read(8))
+            self.header = json.loads(f.read(length).decode("utf-8"))
+        self.start = start = -(-(len(MAGIC) + 8 + length) // ALIGN) * ALIGN
+        self.arrays = {}
+        for name, spec in self.header["arrays"].items():
+            shape = tuple(spec["shape"])
+            if int(np.prod(shape)) == 0: # zero-length maps are not allowed
+                self.arrays[name] = np.empty(shape, dtype=spec["dtype"])
+            else:
+                self.arrays[name] = np.memmap(snap, dtype=spec["dtype"], mode="r",
+                                              offset=start + spec["offset"], shape=shape)
+        self.indptr = self.arrays["indptr"]
+        self.indices = self.arrays["indices"]
+
+    def matches(self, source):
+        '''
+        True if the snapshot was made from the current contents of 'source'. When only the
+        modification time changed, the content hash decides, and a match records the new time
+        so later runs skip the hash.
+        '''
+        info = self.header["source"]
+        stat = os.stat(source)
+        if stat.st_size != info["size"]:
+            return False
+        if stat.st_mtime_ns == info["mtime_ns"]:
+            return True
+        if file_digest(source) != info["blake2b"]:
+            return False
+        info["mtime_ns"] = stat.st_mtime_ns
+        text = json.dumps(self.header).encode("utf-8")
+        if len(MAGIC) + 8 + len(text) <= self.start: # the header still fits in front of the arrays
+            try:
+                with open(self.path, "r+b") as f:
+                    f.write(MAGIC + struct.pack("<Q", len(text)) + text)
+            except OSError:
+                pass # read-only snapshot: it stays valid, the hash is just checked again next time
+        return True
+
+    def column(self, key):
+        '''Decoded values of one column ("node", "nattr<i>" or "eattr<i>").'''
+        prefix = key + "."
+        parts = {name[len(prefix):]: a for name, a in self.arrays.items() if name.startswith(prefix)}
+        return decode_column(self.header["columns"][key], parts)
+
+    def to_networkx(self):
+        '''Rebuild the NetworkX graph that was snapshotted.'''
+        G = nx.DiGraph() if self.header["directed"] else nx.Graph()
+        G.graph.update(self.header["graph"])
+        nodes = self.column("node")
+
+        node_data = self.attribute_dicts("node", len(nodes))
+        G.add_nodes_from(zip(nodes, node_data))
+
+        tails = np.repeat(np.arange(len(nodes)), np.diff(self.indptr))
+        heads = self.indices
+        edge_data = self.attribute_dicts("edge", len(heads))
+        order = self.arrays["added"].tolist() if "added" in self.arrays else range(len(heads))
+        tails, heads = tails.tolist(), heads.tolist()
+        G.add_edges_from((nodes[tails[i]], nodes[heads[i]], edge_data[i]) for i in order)
+        return G
+
+    def attribute_dicts(self, kind, count):
+        '''The attribute dict of every node or edge ('kind'), keys in their original order.'''
+        names = self.header[f"{kind}_attrs"]
+        cols = [self.column(f"{kind[0]}attr{i}") for i in range(len(names))]
+        rows = zip(*cols) if cols else ((),) * count
+        dicts = [{k: x for k, x in zip(names, row) if x is not None} for row in rows]
+        orders = self.header.get(f"{kind}_key_orders")
+        if orders:
+            codes = self.arrays[f"{kind}_keys"].tolist()
+            dicts = [{k: d[k] for k in orders[c]} for d, c in zip(dicts, codes)]
+        return dicts
+
+def read_gml_cached(path, label="label"):
+    '''
+    Drop-in replacement for nx.read_gml(path, label=label) backed by a snapshot file
+    (the GML itself is parsed by gml_stream.read_gml).
+    Set the environment variable GRAPH_SNAPSHOT=0 to always parse the GML.
+    '''
+    if os.environ.get("GRAPH_SNAPSHOT", "1") == "0" or not os.path.isfile(path):
+        return read_gml(path, label=label)
+    snap = snapshot_path(path, label)
+    if os.path.isfile(snap):
+        try:
+            snapshot = GraphSnapshot(snap)
+            if snapshot.matches(path):
+                return snapshot.to_networkx()
+        except (OSError, ValueError, KeyError):
+            pass # damaged or old snapshot: parse the GML and replace it
+
+    G = read_gml(path, label=label)
+    try:
+        write_snapshot(G, snap, path)
+    except (OSError, UnsupportedGraph):
+        pass # read-only directory or exotic attributes: the GML is still the source of truth
+    return G
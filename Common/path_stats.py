@@ -0,0 +1,142 @@
+# Names: Khoa Vu (030063200) & Mya Barragan (029948137)
+# Course: CECS 427 (Sec. 02)
+# Professor: Oscar Morales-Ponce
+# Date: 10/17/2026
+
+'''
+Exact all-pairs shortest-path statistics on unweighted graphs, computed by one BFS
+per source spread over a process pool. The CSR adjacency is placed in shared memory
+once and every worker maps it read-only instead of receiving its own copy.
+
+Citation(s):
+1) Python Software Foundation. (n.d.). multiprocessing.shared_memory — Shared memory for direct access across processes. Retrieved October, 2026, from https://docs.python.org/3/library/multiprocessing.shared_memory.html
+2) Python Software Foundation. (n.d.). concurrent.futures — Launching parallel tasks. Retrieved October, 2026, from https://docs.python.org/3/library/concurrent.futures.html
+'''
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from graph_csr import csr_neighbors
+
+SHARED = {} # per-worker views of the shared CSR arrays
+SMALL_WORK = 1 << 22 # sources x adjacency entries below which no pool is started
+
+def bfs_level_sizes(indptr, indices, source, seen):
+    '''
+    Run one BFS and count the nodes found at each hop distance.
+    Arguments:
+        indptr, indices (numpy arrays): CSR adjacency
+        source (int): source node id
+        seen (numpy bool array): scratch space of length n, all False; left all False
+    Returns:
+        list where entry d is the number of nodes at distance d (entry 0 is the source)
+    '''
+    seen[source] = True
+    frontier = np.array([source], dtype=indices.dtype)
+    levels = [frontier]
+    while True:
+        _, nbrs = csr_neighbors(indptr, indices, frontier)
+        frontier = np.unique(nbrs[~seen[nbrs]])
+        if not frontier.size:
+            break
+        seen[frontier] = True
+        levels.append(frontier)
+    for level in levels: # only clear what this search touched
+        seen[level] = False
+    return [len(level) for level in levels]
+
+def chunk_statistics(indptr, indices, sources):
+    '''
+    Reduce the BFS level sizes of a chunk of sources.
+    Returns:
+        (distance sum, reachable pairs, largest eccentricity, hop-distance histogram)
+    '''
+    seen = np.zeros(len(indptr) - 1, dtype=bool)
+    total, pairs, diameter = 0, 0, 0
+    histogram = np.zeros(1, dtype=np.int64)
+    for s in sources:
+        sizes = np.array(bfs_level_sizes(indptr, indices, int(s), seen), dtype=np.int64)
+        if len(sizes) > len(histogram):
+            histogram = np.pad(histogram, (0, len(sizes) - len(histogram)))
+        histogram[:len(sizes)] += sizes
+        total += int(np.dot(np.arange(len(sizes)), sizes))
+        pairs += int(sizes[1:].sum())
+        diameter = max(diameter, len(sizes) - 1)
+    histogram[0] = 0 # a source at distance 0 from itself is not a pair
+    return total, pairs, diameter, histogram
+
+def attach_shared(name, shape, dtype):
+    '''Map a shared memory block as a numpy array; the parent keeps ownership and unlinks it.'''
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+def init_worker(specs):
+    '''Process pool initializer: map the CSR arrays published by the parent.'''
+    for key, (name, shape, dtype) in specs.items():
+        SHARED[key] = attach_shared(name, shape, dtype)
+
+def worker_chunk(sources):
+    '''Process pool task: statistics for one chunk of sources over the shared CSR.'''
+    return chunk_statistics(SHARED["indptr"][1], SHARED["indices"][1], sources)
+
+def publish(array):
+    '''Copy an array into a new shared memory block.'''
+    block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+def path_statistics(indptr, indices, sources=None, workers=None, chunk_size=None):
+    '''
+    Exact shortest-path statistics from every source in 'sources' (all nodes by default).
+    Arguments:
+        indptr, indices (numpy arrays): CSR adjacency (see graph_csr.graph_to_csr)
+        sources (array-like of int): BFS source node ids
+        workers (int): number of worker processes (default: all cores; 1 runs in-process)
+        chunk_size (int): sources per task (default: about 8 tasks per worker)
+    Returns:
+        dict with
+            avg_shortest_path_len: mean distance over all reachable (source, target) pairs
+            diameter: largest eccentricity among the sources
+            distance_sum, reachable_pairs: the raw sums behind the average
+            hop_histogram: numpy array, entry d = number of pairs at distance d
+    '''
+    n = len(indptr) - 1
+    sources = np.arange(n) if sources is None else np.asarray(sources, dtype=np.int64)
+    if workers is None and len(sources) * max(1, len(indices)) < SMALL_WORK:
+        workers = 1 # pool start-up would cost more than the searches
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(sources)))
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(sources) // (workers * 8)))
+    chunks = [sources[i:i + chunk_size] for i in range(0, len(sources), chunk_size)]
+
+    if workers == 1:
+        parts = [chunk_statistics(indptr, indices, c) for c in chunks]
+    else:
+        blocks, specs = [], {}
+        try:
+            for key, array in (("indptr", indptr), ("indices", indices)):
+                block, specs[key] = publish(array)
+                blocks.append(block)
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(specs,)) as pool:
+                parts = list(pool.map(worker_chunk, chunks))
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    total = sum(p[0] for p in parts)
+    pairs = sum(p[1] for p in parts)
+    diameter = max((p[2] for p in parts), default=0)
+    histogram = np.zeros(diameter + 1, dtype=np.int64)
+    for p in parts:
+        histogram[:len(p[3])] += p[3]
+    return {
+        "avg_shortest_path_len": total / pairs if pairs else 0.0,
+        "diameter": diameter,
+        "distance_sum": total,
+        "reachable_pairs": pairs,
+        "hop_histogram": histogram,
+    }
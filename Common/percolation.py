@@ -0,0 +1,111 @@
+# Names: Khoa Vu (030063200) & Mya Barragan (029948137)
+# Course: CECS 427 (Sec. 02)
+# Professor: Oscar Morales-Ponce
+# Date: 10/17/2026
+
+'''
+Newman–Ziff bond percolation on an edge list. Each trial adds the edges in a
+random order to a union-find and records the number of components and the
+size of the largest one after every edge, so one trial gives the whole curve
+for 0..m edges present in O(m α(n)). Trials run on a process pool that maps
+the edge arrays from shared memory, and every trial has its own seed.
+
+Citation(s):
+1) Newman, M. E. J., & Ziff, R. M. (2001). Fast Monte Carlo algorithm for site or bond percolation. Physical Review E, 64, 016706.
+2) NumPy Developers. (n.d.). SeedSequence — NumPy documentation. Retrieved October, 2026, from https://numpy.org/doc/stable/reference/random/bit_generators/generated/numpy.random.SeedSequence.html
+'''
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from path_stats import SHARED, init_worker, publish
+
+SMALL_WORK = 1 << 20 # trials x edges below which no pool is started
+
+def percolation_trial(n, tails, heads, seed):
+    '''
+    Add the edges (tails[i], heads[i]) in a random order to a union-find.
+    Arguments:
+        n (int): number of nodes (ids 0..n-1)
+        tails, heads (numpy arrays): edge endpoints
+        seed (int): seed of this trial's edge order
+    Returns:
+        (components, giant) int arrays of length m + 1; entry j is the number of
+        components and the largest component size once the first j edges are in
+    '''
+    m = len(tails)
+    order = np.random.default_rng(seed).permutation(m)
+    tails, heads = tails[order].tolist(), heads[order].tolist()
+    parent = list(range(n))
+    size = [1] * n
+    components = np.empty(m + 1, dtype=np.int64)
+    giant = np.empty(m + 1, dtype=np.int64)
+    count, largest = n, 1 if n else 0
+    components[0], giant[0] = count, largest
+    for j in range(m):
+        a, b = tails[j], heads[j]
+        while parent[a] != a: # path halving
+            parent[a] = a = parent[parent[a]]
+        while parent[b] != b:
+            parent[b] = b = parent[parent[b]]
+        if a != b:
+            if size[a] < size[b]: # union by size
+                a, b = b, a
+            parent[b] = a
+            size[a] += size[b]
+            count -= 1
+            if size[a] > largest:
+                largest = size[a]
+        components[j + 1], giant[j + 1] = count, largest
+    return components, giant
+
+def worker_trial(args):
+    '''Process pool task: one trial over the shared edge arrays.'''
+    n, seed = args
+    return percolation_trial(n, SHARED["tails"][1], SHARED["heads"][1], seed)
+
+def trial_seeds(trials, seed=None):
+    '''Independent per-trial seeds derived from one master seed (fresh entropy if None).'''
+    return [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(trials)]
+
+def percolation_curves(n, tails, heads, trials=5, seed=None, workers=None):
+    '''
+    Run 'trials' Newman–Ziff trials.
+    Arguments:
+        n (int): number of nodes
+        tails, heads (array-like of int): edge endpoints (undirected; self-loops never merge)
+        trials (int): number of random edge orders
+        seed (int): master seed; trial i uses trial_seeds(trials, seed)[i]
+        workers (int): number of worker processes (default: all cores; 1 runs in-process)
+    Returns:
+        dict with
+            components, giant: int arrays of shape (trials, m + 1), column j = j edges present
+            seeds: the seed of every trial
+    '''
+    tails = np.asarray(tails, dtype=np.int64)
+    heads = np.asarray(heads, dtype=np.int64)
+    seeds = trial_seeds(trials, seed)
+    if workers is None and trials * max(1, len(tails)) < SMALL_WORK:
+        workers = 1 # pool start-up would cost more than the trials
+    workers = max(1, min(workers or os.cpu_count() or 1, trials))
+
+    if workers == 1:
+        parts = [percolation_trial(n, tails, heads, s) for s in seeds]
+    else:
+        blocks, specs = [], {}
+        try:
+            for key, array in (("tails", tails), ("heads", heads)):
+                block, specs[key] = publish(array)
+                blocks.append(block)
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(specs,)) as pool:
+                parts = list(pool.map(worker_trial, [(n, s) for s in seeds]))
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    m = len(tails)
+    components = np.array([p[0] for p in parts]).reshape(len(parts), m + 1)
+    giant = np.array([p[1] for p in parts]).reshape(len(parts), m + 1)
+    return {"components": components, "giant": giant, "seeds": seeds}
@@ -0,0 +1,123 @@
+# Names: Khoa Vu (030063200) & Mya Barragan (029948137)
+# Course: CECS 427 (Sec. 02)
+# Professor: Oscar Morales-Ponce
+# Date: 10/17/2026
+
+'''
+Permutation test for categorical assortativity (homophily) on an edge list.
+The node labels are shuffled many times and the assortativity of every
+shuffle is recomputed. The group shares a_i, b_i only depend on how much
+degree each group holds, so they cost one bincount over the nodes; the
+within-group fraction needs the labels at both ends of every edge, which are
+two flat gathers into reused buffers (edges sorted by source for locality).
+Shuffles run on a process pool that maps the labels and edges from shared
+memory, and they are split into tasks of a fixed size, each with its own
+seed, so the null distribution does not depend on the number of workers.
+
+Citation(s):
+1) Newman, M. E. J. (2003). Mixing patterns in networks. Physical Review E, 67, 026126.
+2) NumPy Developers. (n.d.). numpy.random.Generator.permuted — NumPy documentation. Retrieved October, 2026, from https://numpy.org/doc/stable/reference/random/generated/numpy.random.Generator.permuted.html
+'''
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from path_stats import SHARED, init_worker, publish
+
+SMALL_WORK = 1 << 24 # shuffles x edges below which no pool is started
+
+def assortativity(labels, src, dst, k, weights=None, buffers=None):
+    '''
+    Assortativity coefficient of one labeling.
+    Arguments:
+        labels (numpy array): group code 0..k-1 of every node
+        src, dst (numpy arrays): edge endpoints (both directions for an undirected graph)
+        k (int): number of groups
+        weights (tuple): optional (out-degree, in-degree) of every node along src -> dst
+        buffers (tuple): optional (tail labels, head labels, equal mask) arrays of length m to reuse
+    Returns:
+        (r, same): r = (sum e_ii - sum a_i b_i) / (1 - sum a_i b_i) and
+        same = sum e_ii, the fraction of edges inside a group
+    '''
+    n, m = len(labels), len(src)
+    if not m:
+        return 0.0, 0.0
+    out_deg, in_deg = weights or (np.bincount(src, minlength=n), np.bincount(dst, minlength=n))
+    a, b, eq = buffers or (np.empty(m, labels.dtype), np.empty(m, labels.dtype), np.empty(m, dtype=bool))
+    np.take(labels, src, out=a)
+    np.take(labels, dst, out=b)
+    same = np.count_nonzero(np.equal(a, b, out=eq)) / m
+    share_a = np.bincount(labels, weights=out_deg, minlength=k) / m
+    share_b = np.bincount(labels, weights=in_deg, minlength=k) / m
+    expected = float(share_a @ share_b)  # sum a_i b_i: same-group fraction of a random rewiring
+    r = (same - expected) / (1 - expected) if expected < 1 else 0.0
+    return r, same
+
+def shuffled_statistics(labels, src, dst, k, count, seed):
+    '''Assortativity of 'count' random shuffles of 'labels'.'''
+    rng = np.random.default_rng(seed)
+    n, m = len(labels), len(src)
+    weights = (np.bincount(src, minlength=n), np.bincount(dst, minlength=n))
+    buffers = (np.empty(m, labels.dtype), np.empty(m, labels.dtype), np.empty(m, dtype=bool))
+    shuffled = labels.copy()
+    out = np.empty(count)
+    for i in range(count):
+        rng.shuffle(shuffled)
+        out[i] = assortativity(shuffled, src, dst, k, weights, buffers)[0]
+    return out
+
+def worker_task(args):
+    '''Process pool task: one seeded block of shuffles over the shared arrays.'''
+    k, count, seed = args
+    return shuffled_statistics(SHARED["labels"][1], SHARED["src"][1], SHARED["dst"][1], k, count, seed)
+
+def permutation_test(labels, src, dst, permutations=10000, seed=None, workers=None, task_size=1000):
+    '''
+    Compare the observed assortativity with that of shuffled labels.
+    Arguments:
+        labels (array-like of int): group code 0..k-1 of every node
+        src, dst (array-like of int): edge endpoints (both directions for an undirected graph)
+        permutations (int): number of shuffles
+        seed (int): master seed; task i of task_size shuffles uses its i-th spawned seed
+        workers (int): number of worker processes (default: all cores; 1 runs in-process)
+    Returns:
+        dict with observed (r), same_fraction, null (numpy array of shuffled r),
+        quantiles (2.5%, 50%, 97.5% of the null) and p_value (one-sided, r >= observed)
+    '''
+    k = int(np.max(labels)) + 1 if len(labels) else 1
+    labels = np.asarray(labels, dtype=np.min_scalar_type(k))  # narrow codes keep each shuffle's two length-m gathers small
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    order = np.lexsort((dst, src)) # the statistic ignores edge order; sorted gathers are cache friendly
+    src, dst = src[order], dst[order]
+    r, same = assortativity(labels, src, dst, k)
+    counts = [min(task_size, permutations - i) for i in range(0, permutations, task_size)]
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(len(counts))]
+    if workers is None and permutations * max(1, len(src)) < SMALL_WORK:
+        workers = 1 # pool start-up would cost more than the shuffles
+    workers = max(1, min(workers or os.cpu_count() or 1, len(counts) or 1))
+
+    if workers == 1:
+        parts = [shuffled_statistics(labels, src, dst, k, c, s) for c, s in zip(counts, seeds)]
+    else:
+        blocks, specs = [], {}
+        try:
+            for key, array in (("labels", labels), ("src", src), ("dst", dst)):
+                block, specs[key] = publish(array)
+                blocks.append(block)
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(specs,)) as pool:
+                parts = list(pool.map(worker_task, [(k, c, s) for c, s in zip(counts, seeds)]))
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    null = np.concatenate(parts) if parts else np.zeros(0)
+    return {
+        "observed": r,
+        "same_fraction": same,
+        "null": null,
+        "quantiles": np.quantile(null, [0.025, 0.5, 0.975]) if len(null) else np.full(3, np.nan),
+        "p_value": (1 + int((null >= r - 1e-12).sum())) / (1 + len(null)),
+    }
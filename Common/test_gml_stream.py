@@ -0,0 +1,99 @@
+import gzip
+import os
+import sys
+
+import networkx as nx
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+import gml_stream
+
+SAMPLES = [os.path.join(HERE, "..", "Social and Large-Scale Networks", "sample_graph.gml"),
+           os.path.join(HERE, "..", "Graphs", "sample_input.gml"),
+           os.path.join(HERE, "..", "Game Theory", "traffic.gml")]
+
+
+def assert_same_graph(G, H):
+    assert type(G) is type(H)
+    assert G.graph == H.graph
+    assert list(G.nodes(data=True)) == list(H.nodes(data=True))
+    for u in G:     # adjacency order and attribute key order too, not only the edge sets
+        assert [(v, list(d.items())) for v, d in G._adj[u].items()] == [(v, list(d.items())) for v, d in H._adj[u].items()]
+
+
+def odd_graph(directed=False, multigraph=False):
+    G = (nx.MultiDiGraph if directed else nx.MultiGraph)() if multigraph else (nx.DiGraph if directed else nx.Graph)()
+    G.graph.update(name="odd", scale=1.5e300, tags=["a", "b"])
+    G.add_node("b", weight=-3, ratio=float("inf"), big=2**40, note='say "hi" & café')
+    G.add_node("a", pos=[1.0, 2.0], one=[7], empty=[], nested={"x": 1, "y": [2, 3]})
+    G.add_node(3, flag=True, label_like="id")
+    G.add_edge("a", "b", weight=0.1, sign=-1)
+    G.add_edge(3, "a", sign=1, weight=2.0)
+    G.add_edge("b", "b", note="loop")
+    if multigraph:
+        G.add_edge("a", "b", weight=5.0)
+    return G
+
+
+@pytest.mark.parametrize("path", SAMPLES)
+def test_read_matches_networkx(path):
+    assert_same_graph(gml_stream.read_gml(path), nx.read_gml(path))
+    assert_same_graph(gml_stream.read_gml(path, label=None), nx.read_gml(path, label=None))
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("multigraph", [False, True])
+def test_write_is_byte_identical(tmp_path, directed, multigraph):
+    G = odd_graph(directed, multigraph)
+    gml_stream.write_gml(G, tmp_path / "ours.gml")
+    nx.write_gml(G, tmp_path / "nx.gml")
+    assert (tmp_path / "ours.gml").read_bytes() == (tmp_path / "nx.gml").read_bytes()
+    assert_same_graph(gml_stream.read_gml(tmp_path / "ours.gml"), nx.read_gml(tmp_path / "nx.gml"))
+
+
+@pytest.mark.parametrize("path", SAMPLES)
+def test_write_samples_byte_identical(tmp_path, path):
+    G = nx.read_gml(path)
+    gml_stream.write_gml(G, tmp_path / "ours.gml.gz")
+    nx.write_gml(G, tmp_path / "nx.gml")
+    assert gzip.decompress((tmp_path / "ours.gml.gz").read_bytes()) == (tmp_path / "nx.gml").read_bytes()
+
+
+def test_small_blocks(tmp_path, monkeypatch):
+    # Block boundaries inside records, numbers and quoted strings
+    text = 'graph [\n  node [ id 0 label "a" note "a long note with spaces" ]\n  node [ id 1 label "b" w 12345.678 ]\n' + \
+           "".join(f"  node [ id {i} label \"n{i}\" ]\n  edge [ source {i - 1} target {i} w {i * 1.5} ]\n" for i in range(2, 40)) + "]\n"
+    (tmp_path / "g.gml").write_text(text)
+    monkeypatch.setattr(gml_stream, "BLOCK_BYTES", 7)
+    assert_same_graph(gml_stream.read_gml(tmp_path / "g.gml"), nx.read_gml(tmp_path / "g.gml"))
+
+
+@pytest.mark.parametrize("body", [
+    'directed 0 node [ id 0 label "a" ] node [ id 1 label "b" ] edge [ source 0 target 1 ] directed 1',    # graph type after the edges
+    'node [ id 0 label "a" pos [ x 1 y 2 ] ] node [ id 1 label "b" ] edge [ source 1 target 0 w 1 w 2 ]',  # nested record, repeated key
+    'node [ id 0 label "a" ] edge [ source 0 target 1 ] node [ id 1 label "b" ]',                          # edge before its node
+    'node [ id 0 label "b" ] node [ id 1 label "a" ] node [ id 2 label "c" ] edge [ source 2 target 1 ] edge [ source 0 target 1 ]',  # edges out of node order
+    'node [ id 0 label a ] node [ id 1 label "b" val INF ] edge [ source 0 target 1 ] # comment',           # bare words
+])
+def test_token_path_and_fallback(tmp_path, body):
+    path = tmp_path / "g.gml"
+    path.write_text("graph [\n  " + body + "\n]\n")
+    assert_same_graph(gml_stream.read_gml(path), nx.read_gml(path))
+
+
+@pytest.mark.parametrize("body", [
+    'node [ id 0 label "a" ] node [ id 1 label "b" ] edge [ source 0 target 1 ] edge [ source 1 target 0 ]',  # duplicated edge
+    'node [ id 0 label "a" ] node [ id 0 label "b" ]',      # duplicated id
+    'node [ id 0 label "a" ] node [ id 1 label "a" ]',      # duplicated label
+    'node [ id 0 label "a" ] edge [ source 0 target 5 ]',   # undefined target
+    'node [ id 0 label "a" ',                               # unterminated record
+])
+def test_errors_match_networkx(tmp_path, body):
+    path = tmp_path / "g.gml"
+    path.write_text("graph [\n  " + body + "\n]\n")
+    with pytest.raises(nx.NetworkXError) as expected:
+        nx.read_gml(path)
+    with pytest.raises(nx.NetworkXError) as ours:
+        gml_stream.read_gml(path)
+    assert str(ours.value) == str(expected.value)
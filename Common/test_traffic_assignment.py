@@ -0,0 +1,92 @@
+import os
+import sys
+
+import networkx as nx
+import numpy as np
+import pytest
+from scipy.optimize import minimize
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+from gml_stream import read_gml
+from traffic_assignment import EquilibriumSolver, RoadNetwork, frank_wolfe
+
+TRAFFIC = os.path.join(HERE, "..", "Game Theory", "traffic.gml")
+
+
+def traffic_network():
+    net = RoadNetwork(read_gml(TRAFFIC))
+    return net, [net.index[0]], [net.index[3]], [4.0]
+
+
+def link_flows(net, result):
+    return {(net.nodes[u], net.nodes[v]): x for u, v, x in zip(net.tails.tolist(), net.heads.tolist(), result["flows"].tolist())}
+
+
+def grid_demand(seed):
+    # A 3x3 grid of two-way streets with random cost functions and four OD pairs
+    G = nx.convert_node_labels_to_integers(nx.grid_2d_graph(3, 3).to_directed())
+    rng = np.random.default_rng(seed)
+    for u, v in G.edges():
+        G[u][v]["a"], G[u][v]["b"] = float(rng.uniform(0.1, 2.0)), float(rng.integers(0, 5))
+    pairs = rng.choice(len(G), size=(4, 2), replace=False)
+    return G, RoadNetwork(G), pairs[:, 0], pairs[:, 1], rng.uniform(1.0, 20.0, size=4)
+
+
+def path_assignment(G, net, origins, destinations, volumes, system_optimum):
+    # The old approach: enumerate every simple route and minimize over route flows with SciPy
+    routes, pair = [], []
+    for i, (s, t) in enumerate(zip(origins, destinations)):
+        for path in nx.all_simple_paths(G, net.nodes[s], net.nodes[t]):
+            routes.append(net.link_ids([net.index[u] for u in path[:-1]], [net.index[u] for u in path[1:]]))
+            pair.append(i)
+    P = np.zeros((len(net), len(routes)))   # link-route incidence
+    for j, links in enumerate(routes):
+        P[links, j] = 1.0
+    pair = np.array(pair)
+    D = (pair == np.arange(len(volumes))[:, None]).astype(float)  # route flows of a pair add up to its volume
+    w = 1.0 if system_optimum else 0.5  # total cost sum a x^2 + b x, or the Beckmann objective
+    res = minimize(lambda h: float((w * net.a * (P @ h) ** 2 + net.b * (P @ h)).sum()), volumes[pair] / np.bincount(pair)[pair],
+                   jac=lambda h: P.T @ (2 * w * net.a * (P @ h) + net.b), bounds=[(0, None)] * len(routes),
+                   constraints=[{"type": "eq", "fun": lambda h: D @ h - volumes, "jac": lambda h: D}], method="SLSQP", options={"ftol": 1e-10, "maxiter": 500})
+    assert res.success
+    return P @ res.x
+
+
+def test_traffic_equilibrium():
+    net, origins, destinations, volumes = traffic_network()
+    result = frank_wolfe(net, origins, destinations, volumes, workers=1)
+    flows = link_flows(net, result)
+    assert flows[0, 1] == pytest.approx(2.5) and flows[1, 3] == pytest.approx(2.5)
+    assert flows[0, 2] == pytest.approx(1.5) and flows[2, 3] == pytest.approx(1.5)
+    assert result["od_costs"][0] == pytest.approx(3.5)
+    assert result["total_cost"] == pytest.approx(14.0)
+    assert result["converged"]
+
+
+def test_traffic_social_optimum():
+    net, origins, destinations, volumes = traffic_network()
+    result = frank_wolfe(net, origins, destinations, volumes, system_optimum=True, workers=1)
+    flows = link_flows(net, result)
+    assert flows[0, 1] == pytest.approx(2.25) and flows[1, 3] == pytest.approx(2.25)
+    assert flows[0, 2] == pytest.approx(1.75) and flows[2, 3] == pytest.approx(1.75)
+    assert result["total_cost"] == pytest.approx(13.875)
+
+
+@pytest.mark.parametrize("seed", [1, 3])
+@pytest.mark.parametrize("system_optimum", [False, True])
+def test_multi_od_matches_path_assignment(seed, system_optimum):
+    G, net, origins, destinations, volumes = grid_demand(seed)
+    expected = path_assignment(G, net, origins, destinations, volumes, system_optimum)
+    result = frank_wolfe(net, origins, destinations, volumes, system_optimum, gap=1e-6, max_iterations=5000, workers=1)
+    assert result["converged"]
+    assert np.allclose(result["flows"], expected, atol=1e-3)
+    assert result["total_cost"] == pytest.approx(float(expected @ net.costs(expected)), rel=1e-6)
+    plain = frank_wolfe(net, origins, destinations, volumes, system_optimum, gap=1e-3, max_iterations=5000, conjugate=False, workers=1)
+    assert plain["converged"] and np.allclose(plain["flows"], expected, atol=0.5)
+    pooled = frank_wolfe(net, origins, destinations, volumes, system_optimum, gap=1e-6, max_iterations=5000, workers=2)
+    assert np.allclose(pooled["flows"], result["flows"])
+    with EquilibriumSolver(net, origins, destinations, volumes, gap=1e-6, max_iterations=5000, workers=1) as solver:
+        assert np.allclose(solver.solve(system_optimum)["flows"], expected, atol=1e-3)
+        solver.what_if([0], b=100.0, system_optimum=system_optimum)
+        assert np.allclose(solver.solve(system_optimum)["flows"], expected, atol=1e-3)  # the change was undone
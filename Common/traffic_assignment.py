@@ -0,0 +1,578 @@
+# Names: Khoa Vu (030063200) & Mya Barragan (029948137)
+# Course: CECS 427 (Sec. 02)
+# Professor: Oscar Morales-Ponce
+# Date: 10/17/2026
+
+'''
+Static traffic assignment on links with costs c(x) = a x + b. The links are
+the entries of a CSR adjacency, so flows, costs and the a, b parameters are
+flat NumPy arrays. The demand is a list of origin–destination (OD) pairs
+grouped by origin. Every Frank–Wolfe iteration builds one shortest-path tree
+per origin with scipy's Dijkstra on the current link costs, sends the
+origin's demand along it (all-or-nothing assignment) and steps towards that
+loading. The origins are split over a process pool that maps the network and
+the demand from shared memory; only the link costs change between calls. For linear costs
+the exact line search has a closed form. The conjugate variant searches
+towards a mix of the new loading and the previous search target, which cuts
+the zig-zagging of plain Frank–Wolfe near the solution. User equilibrium
+(Wardrop) uses the link costs, system optimum the marginal costs 2 a x + b.
+Iterations stop once the relative gap falls below a tolerance.
+A Braess scan solves the equilibrium once per removed edge, on worker
+processes, each starting from the base equilibrium with the flow of the removed
+links sent around them on a detour. An EquilibriumSolver keeps the network,
+the demand, the worker pool and the last flows alive, so a change of the a, b
+parameters is re-solved from the previous equilibrium.
+
+Citation(s):
+1) LeBlanc, L. J., Morlok, E. K., & Pierskalla, W. P. (1975). An efficient approach to solving the road network equilibrium traffic assignment problem. Transportation Research, 9(5), 309–318.
+2) Mitradjieva, M., & Lindberg, P. O. (2013). The stiff is moving — conjugate direction Frank-Wolfe methods with applications to traffic assignment. Transportation Science, 47(2), 280–293.
+3) Braess, D. (1968). Über ein Paradoxon aus der Verkehrsplanung. Unternehmensforschung, 12, 258–268.
+4) SciPy Developers. (n.d.). scipy.sparse.csgraph.dijkstra — SciPy documentation. Retrieved October, 2026, from https://docs.scipy.org/doc/scipy/reference/generated/scipy.sparse.csgraph.dijkstra.html
+'''
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from scipy import sparse
+from scipy.sparse import csgraph
+
+from graph_csr import graph_to_csr
+from path_stats import SHARED, init_worker, publish
+
+CONJUGATE_CAP = 0.99999 # largest weight of the previous search target in a conjugate direction (above it: restart)
+SMALL_WORK = 1 << 20 # origins x links below which no pool is started
+TREES_PER_CALL = 64 # origins per Dijkstra call
+TREE_ENTRIES = 1 << 22 # bound on origins x nodes per Dijkstra call (its dist and pred arrays)
+
+class RoadNetwork:
+    '''
+    The links of a simple graph as arrays: link j runs from tails[j] to heads[j] and
+    costs a[j] * x + b[j] at flow x. Links are the CSR entries of graph_to_csr, so an
+    undirected edge is two links, one per direction.
+    Attributes:
+        nodes (list), index (dict node -> int), indptr, indices (numpy arrays): see graph_to_csr
+        tails, heads, a, b (numpy arrays): one entry per link
+    '''
+
+    def __init__(self, G, a="a", b="b"):
+        if G.is_multigraph():
+            raise ValueError("RoadNetwork needs a simple graph")
+        self.directed = G.is_directed()
+        self.nodes, self.index, indptr, indices = graph_to_csr(G)
+        data = [d for _, nbrs in G.adjacency() for d in nbrs.values()] # CSR order
+        self.set_links(indptr, indices, self.parameter(data, a), self.parameter(data, b))
+
+    @classmethod
+    def from_csr(cls, nodes, indptr, indices, a, b, directed=True, index=None):
+        '''Network over 'nodes' whose links are the CSR entries indptr, indices with parameters a, b.'''
+        net = cls.__new__(cls)
+        net.directed, net.nodes = directed, nodes
+        net.index = index if index is not None else {u: i for i, u in enumerate(nodes)}
+        net.set_links(indptr, indices, a, b)
+        return net
+
+    def set_links(self, indptr, indices, a, b):
+        n = len(indptr) - 1
+        self.indptr, self.indices, self.a, self.b = indptr, indices, a, b
+        self.tails = np.repeat(np.arange(n), np.diff(indptr))
+        self.heads = indices.astype(np.int64)
+        keys = self.tails * n + self.heads
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+
+    def parameter(self, data, name):
+        try:
+            values = np.array([float(d[name]) for d in data])
+        except (KeyError, TypeError, ValueError) as err:
+            raise ValueError(f"every edge needs a numeric '{name}' attribute") from err
+        if (values < 0).any():
+            raise ValueError(f"edge attribute '{name}' must not be negative")
+        return values
+
+    def __len__(self):
+        return len(self.tails)
+
+    def link_ids(self, tails, heads):
+        '''Link id of every (tails[i], heads[i]) node-id pair (the pairs must be links).'''
+        keys = np.asarray(tails, dtype=np.int64) * len(self.nodes) + np.asarray(heads, dtype=np.int64)
+        return self.order[np.searchsorted(self.keys, keys)]
+
+    def find_links(self, tails, heads):
+        '''Like link_ids, with -1 for the pairs that are not links.'''
+        keys = np.asarray(tails, dtype=np.int64) * len(self.nodes) + np.asarray(heads, dtype=np.int64)
+        if not len(self):
+            return np.full(len(keys), -1)
+        pos = np.minimum(np.searchsorted(self.keys, keys), len(self) - 1)
+        return np.where(self.keys[pos] == keys, self.order[pos], -1)
+
+    def without(self, links):
+        '''
+        Copy of the network with the links 'links' removed; node ids stay the same.
+        Returns:
+            (network, kept): kept[i] is the id in this network of link i of the copy
+        '''
+        keep = np.ones(len(self), dtype=bool)
+        keep[links] = False
+        indptr = np.zeros_like(self.indptr)
+        np.cumsum(np.bincount(self.tails[keep], minlength=len(self.nodes)), out=indptr[1:])
+        net = RoadNetwork.from_csr(self.nodes, indptr, self.indices[keep], self.a[keep], self.b[keep], self.directed, self.index)
+        return net, np.flatnonzero(keep)
+
+    def edges(self):
+        '''Link ids of every edge of the graph: one link when directed, both directions when undirected.'''
+        if self.directed:
+            return [np.array([j]) for j in range(len(self))]
+        ahead = np.flatnonzero(self.tails <= self.heads)
+        back = self.link_ids(self.heads[ahead], self.tails[ahead])
+        return [np.unique(pair) for pair in zip(ahead, back)] # a self-loop is one link
+
+    def costs(self, flows, marginal=False):
+        '''Link costs a x + b at 'flows', or the marginal costs 2 a x + b.'''
+        return (2.0 if marginal else 1.0) * self.a * flows + self.b
+
+def group_demand(origins):
+    '''
+    Sort OD pairs by their origins.
+    Returns:
+        (order, origins, offsets): the pairs in 'order' are grouped by origin, group g leaves
+        from origins[g] and holds the sorted pairs offsets[g]..offsets[g + 1] - 1
+    '''
+    order = np.argsort(origins, kind="stable")
+    starts = np.flatnonzero(np.diff(origins[order], prepend=-1)) if len(order) else np.zeros(0, dtype=np.int64)
+    return order, origins[order][starts], np.append(starts, len(order))
+
+def load_groups(indptr, indices, costs, origins, offsets, dests, volumes, lo, hi):
+    '''
+    All-or-nothing loading of origin groups lo..hi-1: group g sends volumes[offsets[g]:offsets[g + 1]]
+    from origins[g] to the same slice of dests along one shortest-path tree.
+    Arguments:
+        indptr, indices (numpy arrays): CSR adjacency, one entry per link
+        costs (numpy array): link costs
+    Returns:
+        (link flows, cost of every OD pair of the groups; inf where the destination is unreachable)
+    '''
+    n = len(indptr) - 1
+    matrix = sparse.csr_matrix((costs, indices, indptr), shape=(n, n)) # zero costs stay links
+    tails, heads = np.repeat(np.arange(n), np.diff(indptr)), indices
+    flows = np.zeros(len(indices))
+    pair_costs = []
+    trees = max(1, min(TREES_PER_CALL, TREE_ENTRIES // max(1, n)))
+    for start in range(lo, hi, trees):
+        stop = min(start + trees, hi)
+        roots = origins[start:stop]
+        dist, pred = csgraph.dijkstra(matrix, directed=True, indices=roots, return_predecessors=True)
+        k = stop - start
+        rows = np.repeat(np.arange(k), np.diff(offsets[start:stop + 1]))
+        d, v = dests[offsets[start]:offsets[stop]], volumes[offsets[start]:offsets[stop]]
+        pair_costs.append(dist[rows, d])
+        keep = np.isfinite(pair_costs[-1])
+        # The k trees as one forest over k * n slots; a link into a node carries the demand of its subtree
+        parent = np.where(pred >= 0, pred + (np.arange(k) * n)[:, None], -1).ravel()
+        load = np.bincount(rows[keep] * n + d[keep], weights=v[keep], minlength=k * n)
+        # Subtree sums by pointer doubling: after round r, load counts descendants up to 2^r - 1 levels down
+        ancestor, live = parent.copy(), np.flatnonzero(parent >= 0)
+        while len(live):
+            up = ancestor[live]
+            np.add.at(load, up, load[live])
+            up = ancestor[up]
+            ancestor[live] = up
+            live = live[up >= 0]
+        flows += (load.reshape(k, n)[:, heads] * (pred[:, heads] == tails)).sum(axis=0) # link j is on tree r if pred[r, head] == tail
+    return flows, np.concatenate(pair_costs) if pair_costs else np.zeros(0)
+
+def worker_load(args):
+    '''Process pool task: load one range of origin groups at the costs in shared memory.'''
+    lo, hi = args
+    arrays = [SHARED[key][1] for key in ("indptr", "indices", "costs", "origins", "offsets", "dests", "volumes")]
+    return load_groups(*arrays, lo, hi)
+
+class DemandLoader:
+    '''
+    All-or-nothing assignment of a fixed OD demand: one shortest-path tree per origin per call,
+    with the origins split over a process pool that maps the network and the demand from
+    shared memory. Call close() (or use a with block) to stop the pool.
+    '''
+
+    def __init__(self, net, origins, destinations, volumes, workers=None):
+        self.origins = np.asarray(origins, dtype=np.int64)
+        self.destinations = np.asarray(destinations, dtype=np.int64)
+        self.order, groups, offsets = group_demand(self.origins)
+        self.volumes = np.asarray(volumes, dtype=float)
+        self.arrays = {
+            "indptr": net.indptr, "indices": net.indices,
+            "costs": np.zeros(len(net)), "origins": groups, "offsets": offsets,
+            "dests": self.destinations[self.order], "volumes": self.volumes[self.order],
+        }
+        if workers is None and len(groups) * max(1, len(net)) < SMALL_WORK:
+            workers = 1 # pool start-up would cost more than the trees
+        self.workers = max(1, min(workers or os.cpu_count() or 1, len(groups) or 1))
+        size = -(-len(groups) // (4 * self.workers)) if len(groups) else 1
+        self.chunks = [(lo, min(lo + size, len(groups))) for lo in range(0, len(groups), size)]
+        self.pool, self.blocks = None, []
+        if self.workers > 1:
+            specs = {}
+            try:
+                for key, array in self.arrays.items():
+                    block, specs[key] = publish(array)
+                    self.blocks.append(block)
+                    if key in ("costs", "volumes"): # the workers read these from shared memory on every call
+                        self.arrays[key] = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+                self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker, initargs=(specs,))
+            except BaseException:
+                self.close()
+                raise
+
+    def load(self, costs):
+        '''
+        Send every OD pair along its cheapest path at link costs 'costs'.
+        Returns:
+            (link flows, cost of every OD pair in input order; inf if it has no path)
+        '''
+        self.arrays["costs"][:] = costs
+        if self.pool is None:
+            parts = [load_groups(*self.arrays.values(), lo, hi) for lo, hi in self.chunks]
+        else:
+            parts = list(self.pool.map(worker_load, self.chunks))
+        flows = sum(p[0] for p in parts) if parts else np.zeros(len(costs))
+        pair_costs = np.empty(len(self.order))
+        pair_costs[self.order] = np.concatenate([p[1] for p in parts]) if parts else []
+        return flows, pair_costs
+
+    def set_volumes(self, volumes):
+        '''Replace the vehicles of every OD pair (input order); the next load() uses them.'''
+        self.volumes = np.asarray(volumes, dtype=float)
+        self.arrays["volumes"][:] = self.volumes[self.order]
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def frank_wolfe(net, origins, destinations, volumes, system_optimum=False, gap=1e-4, max_iterations=500, conjugate=True, workers=None):
+    '''
+    Wardrop user equilibrium (or system optimum) of an OD demand.
+    Arguments:
+        net (RoadNetwork): links and their a, b cost parameters
+        origins, destinations (array-like of int): node ids (positions in net.nodes) of every OD pair
+        volumes (array-like of float): vehicles of every OD pair
+        system_optimum (bool): minimize the total cost instead of equalizing route costs
+        gap (float): stop once the relative gap (x·g - demand x shortest costs) / x·g is below this
+        max_iterations (int): iteration limit
+        conjugate (bool): conjugate Frank–Wolfe directions instead of plain all-or-nothing ones
+        workers (int): worker processes for the shortest-path trees (default: all cores; 1 runs in-process)
+    Returns:
+        dict with flows (per link), costs (a x + b per link), total_cost (sum of x c(x)),
+        od_costs (cheapest cost of every OD pair at the final flows), gap, iterations, converged
+    '''
+    with DemandLoader(net, origins, destinations, volumes, workers) as loader:
+        return solve(net, loader, system_optimum, gap, max_iterations, conjugate)
+
+def check_reachable(net, loader, pair_costs):
+    if np.isinf(pair_costs).any():
+        i = int(np.flatnonzero(np.isinf(pair_costs))[0])
+        raise ValueError(f"no path from {net.nodes[loader.origins[i]]} to {net.nodes[loader.destinations[i]]}")
+
+def solve(net, loader, system_optimum=False, gap=1e-4, max_iterations=500, conjugate=True, flows=None):
+    '''
+    frank_wolfe on the demand of an open DemandLoader, optionally warm-started.
+    Arguments:
+        flows (numpy array): starting link flows, which must carry the loader's demand
+        (e.g. an earlier solution, or one scaled with the demand); default: free-flow loading
+    '''
+    scale = 2.0 if system_optimum else 1.0 # the Hessian of the objective is scale * diag(a)
+    if flows is None:
+        flows, pair_costs = loader.load(net.b)
+        check_reachable(net, loader, pair_costs)
+    target_prev = None
+    rel_gap, iterations = np.inf, 0
+    while iterations < max_iterations:
+        g = net.costs(flows, marginal=system_optimum)
+        loading, pair_costs = loader.load(g)
+        check_reachable(net, loader, pair_costs)
+        total = float(g @ flows)
+        rel_gap = (total - float(pair_costs @ loader.volumes)) / total if total > 0 else 0.0
+        if rel_gap < gap:
+            break
+        iterations += 1
+        towards = loading
+        if conjugate and target_prev is not None:
+            hd = net.a * (target_prev - flows)
+            den = float(hd @ (loading - target_prev))
+            alpha = float(hd @ (loading - flows)) / den if den != 0 else 0.0
+            if not 0.0 <= alpha <= CONJUGATE_CAP: # clamping would keep aiming at the old target with ever smaller steps
+                alpha = 0.0
+            towards = alpha * target_prev + (1 - alpha) * loading
+            if g @ (towards - flows) >= 0: # not a descent direction: plain Frank–Wolfe step
+                towards = loading
+        d = towards - flows
+        slope, curvature = float(g @ d), scale * float((net.a * d) @ d)
+        step = 1.0 if curvature <= 0 else min(1.0, max(0.0, -slope / curvature))
+        flows = flows + step * d
+        target_prev = towards
+
+    costs = net.costs(flows)
+    if system_optimum: # the loop measured marginal costs; report travel costs
+        pair_costs = loader.load(costs)[1]
+    return {
+        "flows": flows,
+        "costs": costs,
+        "total_cost": float(flows @ costs),
+        "od_costs": pair_costs,
+        "gap": rel_gap,
+        "iterations": iterations,
+        "converged": rel_gap < gap,
+    }
+
+class EquilibriumSolver:
+    '''
+    Long-lived assignment of a fixed OD demand whose link cost parameters change (lane closures,
+    tolls). The DemandLoader (and its process pool) stays open, and every solve starts from the
+    last flows of the same kind, which still carry the demand after any change of a and b.
+    Call close() (or use a with block) to stop the pool.
+    Arguments:
+        net (RoadNetwork): links and their a, b cost parameters; update() changes them in place
+        origins, destinations, volumes: the OD demand, as for frank_wolfe
+    '''
+
+    def __init__(self, net, origins, destinations, volumes, gap=1e-4, max_iterations=500, conjugate=True, workers=None):
+        self.net = net
+        self.options = (gap, max_iterations, conjugate)
+        self.loader = DemandLoader(net, origins, destinations, volumes, workers)
+        self.flows = {} # system_optimum -> link flows of the last solve
+        self.results = {}
+
+    def update(self, links, a=None, b=None):
+        '''
+        Set the cost parameters of the links 'links' (scalars or one value per link); the next
+        solve() starts from the current flows.
+        Returns:
+            the previous (a, b) values of the links, for undoing the change
+        '''
+        links = np.atleast_1d(np.asarray(links, dtype=np.int64))
+        previous = self.net.a[links].copy(), self.net.b[links].copy()
+        for name, values in (("a", a), ("b", b)):
+            if values is None:
+                continue
+            values = np.broadcast_to(np.asarray(values, dtype=float), links.shape)
+            if not np.isfinite(values).all() or (values < 0).any():
+                raise ValueError(f"edge attribute '{name}' must be finite and not negative")
+            getattr(self.net, name)[links] = values
+        return previous
+
+    def solve(self, system_optimum=False):
+        '''frank_wolfe at the current parameters, warm-started from the last solve of the same kind.'''
+        result = solve(self.net, self.loader, system_optimum, *self.options, flows=self.flows.get(system_optimum))
+        self.flows[system_optimum] = result["flows"]
+        self.results[system_optimum] = result
+        return result
+
+    def what_if(self, links, a=None, b=None, system_optimum=False):
+        '''Solve with the parameters of 'links' changed, then restore the parameters and the last flows.'''
+        saved = self.flows.get(system_optimum), self.results.get(system_optimum)
+        previous = self.update(links, a, b)
+        try:
+            return self.solve(system_optimum)
+        finally:
+            self.update(links, *previous)
+            self.flows[system_optimum], self.results[system_optimum] = saved
+
+    def close(self):
+        self.loader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def demand_sweep(net, origins, destinations, volumes, scales, gap=1e-4, max_iterations=500, conjugate=True, workers=None, track=10):
+    '''
+    User equilibrium and system optimum of the demand 'volumes' multiplied by every scale.
+    One DemandLoader (and process pool) serves all solves. Scales are solved from the
+    largest down, each warm-started from the previous solution scaled to the new demand.
+    Arguments:
+        scales (array-like of float): demand multipliers
+        track (int): number of links (busiest at user equilibrium of the largest scale) whose flows are kept
+    Returns:
+        dict of arrays in ascending scale order: scales, vehicles, ue_cost, so_cost,
+        price_of_anarchy (ue_cost / so_cost, 1 at zero demand), ue_iterations, so_iterations,
+        converged (both solves), links (tracked link ids), ue_flows, so_flows (scales x links)
+    '''
+    scales = np.sort(np.asarray(scales, dtype=float))[::-1]
+    volumes = np.asarray(volumes, dtype=float)
+    rows = {key: [] for key in ("ue_cost", "so_cost", "ue_iterations", "so_iterations", "converged", "ue_flows", "so_flows")}
+    links = None
+    with DemandLoader(net, origins, destinations, volumes, workers) as loader:
+        warm, previous = {}, None
+        for s in scales.tolist():
+            loader.set_volumes(volumes * s)
+            solved = {}
+            for kind, optimum in (("ue", False), ("so", True)):
+                start = None
+                if kind in warm and previous > 0:
+                    start = warm[kind] * (s / previous) # still carries the (scaled) demand
+                solved[kind] = solve(net, loader, optimum, gap, max_iterations, conjugate, flows=start)
+                warm[kind] = solved[kind]["flows"]
+            previous = s
+            if links is None:
+                links = np.argsort(-solved["ue"]["flows"], kind="stable")[:track]
+            for kind in ("ue", "so"):
+                rows[f"{kind}_cost"].append(solved[kind]["total_cost"])
+                rows[f"{kind}_iterations"].append(solved[kind]["iterations"])
+                rows[f"{kind}_flows"].append(solved[kind]["flows"][links])
+            rows["converged"].append(solved["ue"]["converged"] and solved["so"]["converged"])
+    out = {key: np.array(values)[::-1] for key, values in rows.items()}
+    out["scales"] = scales[::-1]
+    out["vehicles"] = out["scales"] * volumes.sum()
+    so_cost = out["so_cost"]
+    out["price_of_anarchy"] = np.divide(out["ue_cost"], so_cost, out=np.ones_like(so_cost), where=so_cost > 0)
+    out["links"] = links if links is not None else np.zeros(0, dtype=np.int64)
+    return out
+
+def detour(net, sub, kept, flows, links):
+    '''
+    Warm start for 'sub' (net without 'links'): the flows of the kept links, with the flow of every
+    removed link u -> v sent along the cheapest u -> v path left in sub at the current costs.
+    Returns:
+        link flows of sub, or None if some loaded removed link has no detour
+    '''
+    start = flows[kept].copy()
+    loaded = [j for j in np.asarray(links).tolist() if flows[j] > 0]
+    if not loaded:
+        return start
+    n = len(net.nodes)
+    matrix = sparse.csr_matrix((sub.costs(start), sub.indices, sub.indptr), shape=(n, n))
+    tails = np.unique(net.tails[loaded])
+    dist, pred = csgraph.dijkstra(matrix, directed=True, indices=tails, return_predecessors=True)
+    row = {u: r for r, u in enumerate(tails.tolist())}
+    for j in loaded:
+        r, u, v = row[int(net.tails[j])], int(net.tails[j]), int(net.heads[j])
+        if not np.isfinite(dist[r, v]):
+            return None
+        path = [v]
+        while path[-1] != u:
+            path.append(int(pred[r, path[-1]]))
+        start[sub.link_ids(path[:0:-1], path[-2::-1])] += flows[j]
+    return start
+
+def removal_costs(net, origins, destinations, volumes, flows, candidates, gap, max_iterations, conjugate):
+    '''
+    Equilibrium total cost with each candidate (an array of link ids) removed in turn, warm-started
+    from the base equilibrium 'flows'. A candidate that carries no flow keeps the base equilibrium.
+    Returns:
+        (total costs, iterations, converged) arrays; the cost is inf when the removal cuts off an OD pair
+    '''
+    base = float(flows @ net.costs(flows))
+    costs, iterations, converged = np.full(len(candidates), base), np.zeros(len(candidates), dtype=np.int64), np.ones(len(candidates), dtype=bool)
+    for i, links in enumerate(candidates):
+        if not flows[links].any():
+            continue
+        sub, kept = net.without(links)
+        start = detour(net, sub, kept, flows, links)
+        try:
+            with DemandLoader(sub, origins, destinations, volumes, workers=1) as loader:
+                result = solve(sub, loader, False, gap, max_iterations, conjugate, flows=start)
+        except ValueError: # no path left for some OD pair
+            costs[i] = np.inf
+            continue
+        costs[i], iterations[i], converged[i] = result["total_cost"], result["iterations"], result["converged"]
+    return costs, iterations, converged
+
+def worker_removals(args):
+    '''Process pool task: removal_costs of a block of candidates over the network, demand and base flows in shared memory.'''
+    candidates, directed, gap, max_iterations, conjugate = args
+    arrays = {key: SHARED[key][1] for key in ("indptr", "indices", "a", "b", "origins", "destinations", "volumes", "flows")}
+    n = len(arrays["indptr"]) - 1
+    net = RoadNetwork.from_csr(range(n), arrays["indptr"], arrays["indices"], arrays["a"], arrays["b"], directed)
+    return removal_costs(net, arrays["origins"], arrays["destinations"], arrays["volumes"], arrays["flows"], candidates, gap, max_iterations, conjugate)
+
+def braess_scan(net, origins, destinations, volumes, candidates=None, busiest=None, gap=1e-4, max_iterations=500, conjugate=True, workers=None):
+    '''
+    User equilibrium total cost after removing each candidate edge (Braess's paradox: removing a
+    road can lower it). The base equilibrium is solved once; every removal is solved from it.
+    Arguments:
+        candidates (list of arrays of link ids): edges to try one at a time (default: net.edges())
+        busiest (int): only try this many candidates, those with the most flow at the base equilibrium
+        workers (int): worker processes for the removals (default: all cores; 1 runs in-process)
+    Returns:
+        dict with base (frank_wolfe result), candidates, total_cost, change (total_cost - base total cost),
+        iterations and converged (one entry per candidate)
+    '''
+    origins = np.asarray(origins, dtype=np.int64)
+    destinations = np.asarray(destinations, dtype=np.int64)
+    volumes = np.asarray(volumes, dtype=float)
+    candidates = net.edges() if candidates is None else [np.atleast_1d(np.asarray(c, dtype=np.int64)) for c in candidates]
+    base = frank_wolfe(net, origins, destinations, volumes, False, gap, max_iterations, conjugate, workers)
+    if busiest is not None:
+        load = np.array([base["flows"][links].sum() for links in candidates])
+        candidates = [candidates[i] for i in np.argsort(-load, kind="stable")[:busiest].tolist()]
+    options = (gap, max_iterations, conjugate)
+    if workers is None and len(candidates) * len(np.unique(origins)) * max(1, len(net)) < SMALL_WORK:
+        workers = 1 # pool start-up would cost more than the solves
+    workers = max(1, min(workers or os.cpu_count() or 1, len(candidates) or 1))
+
+    if workers == 1:
+        parts = [removal_costs(net, origins, destinations, volumes, base["flows"], candidates, *options)]
+    else:
+        size = -(-len(candidates) // (4 * workers))
+        blocks, specs = [], {}
+        try:
+            arrays = {"indptr": net.indptr, "indices": net.indices, "a": net.a, "b": net.b, "origins": origins,
+                      "destinations": destinations, "volumes": volumes, "flows": base["flows"]}
+            for key, array in arrays.items():
+                block, specs[key] = publish(array)
+                blocks.append(block)
+            tasks = [(candidates[lo:lo + size], net.directed, *options) for lo in range(0, len(candidates), size)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(specs,)) as pool:
+                parts = list(pool.map(worker_removals, tasks))
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    costs, iterations, converged = (np.concatenate([p[k] for p in parts]) if parts else np.zeros(0) for k in range(3))
+    return {
+        "base": base,
+        "candidates": candidates,
+        "total_cost": costs,
+        "change": costs - base["total_cost"],
+        "iterations": iterations,
+        "converged": converged,
+    }
+
+def path_flows(net, flows, source, target, tol=1e-6, max_paths=10):
+    '''
+    Split link flows from source to target into routes, heaviest link first at every node.
+    Returns:
+        list of (node ids, flow) for at most max_paths routes carrying more than tol
+    '''
+    left = flows.copy()
+    routes = []
+    while len(routes) < max_paths:
+        node, links, seen = source, [], {source}
+        while node != target:
+            row = np.arange(net.indptr[node], net.indptr[node + 1])
+            if not len(row) or left[row].max() <= tol:
+                break
+            j = int(row[np.argmax(left[row])])
+            node = int(net.heads[j])
+            if node in seen: # a cycle of zero-cost links: give up on this route
+                break
+            seen.add(node)
+            links.append(j)
+        if node != target or not links:
+            break
+        amount = float(left[links].min())
+        left[links] -= amount
+        routes.append(([source] + net.heads[links].tolist(), amount))
+    return routes
@@ -9,25 +9,59 @@ Citation(s):
 2) NetworkX’s network_simplex algorithm documentation “network_simplex — NetworkX 3.5 documentation” 
 3) A Medium article showing how to build a simple traffic model with NetworkX in Python “How to Build a Simple Traffic Model with NetworkX in Python”
 4) The Matplotlib Pyplot tutorial “Pyplot tutorial — Matplotlib 3.10.6 documentation”
+5) LeBlanc, L. J., Morlok, E. K., & Pierskalla, W. P. (1975). An efficient approach to solving the road network equilibrium traffic assignment problem. Transportation Research, 9(5), 309–318.
+6) Python Software Foundation. (n.d.). http.server — HTTP servers. Retrieved October, 2026, from https://docs.python.org/3/library/http.server.html
 '''
 
 import argparse # Handles command-line arguments
+import csv # Reads origin-destination demand tables.
+import json # Request and response bodies of the --serve HTTP front end.
+import os
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer # Local what-if service (--serve).
+from urllib.parse import parse_qs, urlparse
 import networkx as nx # Used to load, store, and manipulate graphs (nodes, edges, attributes).
 import matplotlib.pyplot as plt # Used for plotting and visualizing the graph.
-from scipy.optimize import minimize # Performs numerical optimization — finds the flow that minimizes cost or equalizes path costs.
+import numpy as np # Link flows and costs are NumPy arrays.
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Common")) # Shared graph modules.
+from graph_snapshot import read_gml_cached # Binary snapshot cache, so the GML text is only parsed once.
+from traffic_assignment import EquilibriumSolver, RoadNetwork, braess_scan, demand_sweep, frank_wolfe, path_flows # Link-based Frank–Wolfe traffic assignment.
 
 def parse_args(): # Defines how the program reads arguments from the terminal.
     parser = argparse.ArgumentParser(description="Traffic equilibrium and social optimum analyzer")
     parser.add_argument("gml_file", help="Input GML file")
-    parser.add_argument("n", type=float, help="Number of vehicles")
-    parser.add_argument("source", type=int, help="Source node ID")
-    parser.add_argument("target", type=int, help="Target node ID")
+    parser.add_argument("n", type=float, nargs="?", help="Number of vehicles")
+    parser.add_argument("source", type=int, nargs="?", help="Source node ID")
+    parser.add_argument("target", type=int, nargs="?", help="Target node ID")
+    parser.add_argument("--od", help="CSV file with origin,destination,volume rows (replaces n, source and target)")
+    parser.add_argument("--workers", type=int, help="Worker processes for the shortest-path trees (default: all cores)")
+    parser.add_argument("--sweep", nargs=3, type=float, metavar=("LOW", "HIGH", "COUNT"), help="Solve COUNT demand multipliers from LOW to HIGH and report the price of anarchy")
+    parser.add_argument("--sweep_csv", help="Write the --sweep table (costs, price of anarchy, busiest link flows) to this CSV file")
+    parser.add_argument("--braess", action="store_true", help="Solve the equilibrium with each edge removed and rank the removals that lower the total cost")
+    parser.add_argument("--braess_top", type=int, help="Only try removing the K edges with the most equilibrium flow")
+    parser.add_argument("--braess_csv", help="Write every --braess removal (cost, change, iterations) to this CSV file")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="Keep the network loaded and answer cost-change queries over HTTP/JSON on localhost:PORT")
     parser.add_argument("--plot", action="store_true", help="Plot graph and cost functions")
-    return parser.parse_args()
+    parser.add_argument("--gap", type=float, default=1e-4, help="Relative gap at which the solver stops")
+    parser.add_argument("--max_iter", type=int, default=500, help="Iteration limit of the solver")
+    parser.add_argument("--plain_fw", action="store_true", help="Plain Frank–Wolfe directions instead of conjugate ones")
+    parser.add_argument("--verbose", action="store_true", help="Print the solver's iteration count and final relative gap")
+    args = parser.parse_args()
+    if args.od is None and args.target is None: # Single-pair mode needs all three positional values.
+        parser.error("give n, source and target, or an OD table with --od")
+    if args.sweep and (args.sweep[2] < 1 or args.sweep[0] < 0 or args.sweep[1] < args.sweep[0]):
+        parser.error("--sweep needs 0 <= LOW <= HIGH and COUNT >= 1")
+    if sum(map(bool, (args.braess, args.sweep, args.serve is not None))) > 1:
+        parser.error("--braess, --sweep and --serve cannot be combined")
+    if args.braess_top is not None and args.braess_top < 1:
+        parser.error("--braess_top needs K >= 1")
+    return args
 
 def read_graph(gml_file):
     try:
-        G = nx.read_gml(gml_file) # Uses NetworkX to read the .gml file (a structured graph file format).
+        G = read_gml_cached(gml_file) # Uses NetworkX to read the .gml file (a structured graph file format), or its binary snapshot on later runs.
         # Returns a DiGraph (directed graph) object where nodes and edges have attributes.
 
         # Convert string node labels like "0", "1" to integers
@@ -48,48 +82,252 @@ def read_graph(gml_file):
         print(f"Error reading GML: {e}")
         exit(1)
 
-def compute_paths(G, source, target): # Finds all simple paths (no repeated nodes) from source to target.
-    return list(nx.all_simple_paths(G, source, target)) # Uses NetworkX’s built-in path search function.
+def load_network(gml_file): # Reads the graph once and converts integer-looking labels on the node list only (no relabeled graph copy).
+    G = read_gml_cached(gml_file)
+    net = build_network(G)
+    net.nodes = [int(u) if isinstance(u, str) and u.isdigit() else u for u in net.nodes]
+    net.index = {u: i for i, u in enumerate(net.nodes)}
+    return net
+
+def node_key(text): # Matches read_graph: integer-looking labels become ints.
+    text = text.strip()
+    return int(text) if text.isdigit() else text
+
+def read_demand(path): # Reads an OD table: one origin,destination,volume row per pair (header row required).
+    origins, destinations, volumes = [], [], []
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            origins.append(node_key(row["origin"]))
+            destinations.append(node_key(row["destination"]))
+            volumes.append(float(row["volume"]))
+    return origins, destinations, volumes
+
+def build_network(G): # Converts the graph into flat link arrays (tail, head, a, b) for the assignment solver.
+    return RoadNetwork(G)
+
+def equilibrium(net, origins, destinations, volumes, gap=1e-4, max_iterations=500, conjugate=True, workers=None):
     '''
-    Example output:
-    [[0, 1, 3], [0, 2, 3]]
-    '''    
-
-def path_cost(G, path, flow): # Returns the total cost of that path for that flow.
-    cost = 0
-    for u, v in zip(path[:-1], path[1:]):
-        a = G[u][v]['a']
-        b = G[u][v]['b']
-        cost += a * flow + b 
-        # a and b are stored as edge attributes in the .gml file.
-        # For each edge along the path, it adds the cost given the current flow x.
-    return cost
-
-def equilibrium(G, paths, n): # Defines an internal function eq_condition(f1) that returns the difference between path costs.
+    At equilibrium (Wardrop):
+        All used routes of an OD pair have equal travel times (costs), and no unused route is cheaper.
+        Solved on link flows with (conjugate) Frank–Wolfe, one shortest-path tree per origin per iteration.
     '''
-    At equilibrium:
-        Both used paths have equal travel times (costs).
-        If costs differ, drivers would switch until they equalize.
+    ids = [net.index[o] for o in origins], [net.index[d] for d in destinations]
+    return frank_wolfe(net, *ids, volumes, False, gap, max_iterations, conjugate, workers)
+
+def social_optimum(net, origins, destinations, volumes, gap=1e-4, max_iterations=500, conjugate=True, workers=None): # Minimizes the total cost sum x * c(x) with the same solver on marginal costs 2ax + b.
+    ids = [net.index[o] for o in origins], [net.index[d] for d in destinations]
+    return frank_wolfe(net, *ids, volumes, True, gap, max_iterations, conjugate, workers)
+
+def price_of_anarchy_sweep(net, origins, destinations, volumes, scales, gap=1e-4, max_iterations=500, conjugate=True, workers=None):
+    '''
+    Equilibrium and social optimum for every demand multiplier in 'scales'.
+    The network, the demand grouping and the worker pool are set up once, and every
+    solve starts from the previous demand's flows (see traffic_assignment.demand_sweep).
     '''
-    def eq_condition(f1):
-        f2 = n - f1
-        c1 = path_cost(G, paths[0], f1)
-        c2 = path_cost(G, paths[1], f2)
-        return abs(c1 - c2)
-    res = minimize(eq_condition, x0=[n/2], bounds=[(0, n)]) # Uses SciPy’s minimize to find f1 (flow on path 1) where cost difference is minimized (i.e., equilibrium).
-    f1 = res.x[0]
-    f2 = n - f1
-    return f1, f2 # the flow on each path.
-
-def social_optimum(G, paths, n): # Calculates total system cost for given f1, f2.
-    def total_cost(flows):
-        f1, f2 = flows
-        f2 = n - f1
-        return f1 * path_cost(G, paths[0], f1) + f2 * path_cost(G, paths[1], f2)
-    res = minimize(total_cost, x0=[n/2], bounds=[(0, n)]) 
-    f1 = res.x[0]
-    f2 = n - f1
-    return f1, f2 
+    ids = [net.index[o] for o in origins], [net.index[d] for d in destinations]
+    return demand_sweep(net, *ids, volumes, scales, gap, max_iterations, conjugate, workers)
+
+def print_sweep(net, sweep, csv_file=None): # Prints the sweep table and optionally writes it as CSV.
+    names = [f"{net.nodes[net.tails[j]]}->{net.nodes[net.heads[j]]}" for j in sweep["links"].tolist()]
+    print(f"{'Scale':>8} {'Vehicles':>10} {'UE cost':>12} {'SO cost':>12} {'PoA':>7} {'UE it':>6} {'SO it':>6}")
+    for i in range(len(sweep["scales"])):
+        print(f"{sweep['scales'][i]:8.3f} {sweep['vehicles'][i]:10.2f} {sweep['ue_cost'][i]:12.2f} {sweep['so_cost'][i]:12.2f} "
+              f"{sweep['price_of_anarchy'][i]:7.4f} {sweep['ue_iterations'][i]:6d} {sweep['so_iterations'][i]:6d}")
+    worst = int(np.argmax(sweep["price_of_anarchy"]))
+    print(f"Largest price of anarchy: {sweep['price_of_anarchy'][worst]:.4f} at {sweep['vehicles'][worst]:.2f} vehicles")
+    if not sweep["converged"].all():
+        print(f"[WARN] {int((~sweep['converged']).sum())} demand levels stopped at the iteration limit.")
+    if csv_file:
+        with open(csv_file, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["scale", "vehicles", "ue_total_cost", "so_total_cost", "price_of_anarchy", "ue_iterations", "so_iterations", "converged"]
+                            + [f"ue_flow {name}" for name in names] + [f"so_flow {name}" for name in names])
+            for i in range(len(sweep["scales"])):
+                writer.writerow([sweep["scales"][i], sweep["vehicles"][i], sweep["ue_cost"][i], sweep["so_cost"][i], sweep["price_of_anarchy"][i],
+                                 sweep["ue_iterations"][i], sweep["so_iterations"][i], int(sweep["converged"][i])]
+                                + sweep["ue_flows"][i].tolist() + sweep["so_flows"][i].tolist())
+        print(f"[INFO] Sweep table written to {csv_file}")
+
+def plot_sweep(net, sweep): # Total costs and price of anarchy against demand, and the flows of the busiest links.
+    fig, (ax_cost, ax_flow) = plt.subplots(1, 2, figsize=(12, 5))
+    ax_cost.plot(sweep["vehicles"], sweep["ue_cost"], label="Equilibrium")
+    ax_cost.plot(sweep["vehicles"], sweep["so_cost"], label="Social optimum")
+    ax_cost.set_xlabel("Vehicles")
+    ax_cost.set_ylabel("Total cost")
+    ax_cost.legend(loc="upper left")
+    ax_poa = ax_cost.twinx()
+    ax_poa.plot(sweep["vehicles"], sweep["price_of_anarchy"], color="tab:red", linestyle=":", label="Price of anarchy")
+    ax_poa.set_ylabel("Price of anarchy")
+    ax_poa.legend(loc="lower right")
+    for k, j in enumerate(sweep["links"].tolist()):
+        line, = ax_flow.plot(sweep["vehicles"], sweep["ue_flows"][:, k], label=f"{net.nodes[net.tails[j]]} → {net.nodes[net.heads[j]]}")
+        ax_flow.plot(sweep["vehicles"], sweep["so_flows"][:, k], color=line.get_color(), linestyle="--")
+    ax_flow.set_xlabel("Vehicles")
+    ax_flow.set_ylabel("Link flow (solid: equilibrium, dashed: optimum)")
+    ax_flow.legend(fontsize="small")
+    fig.tight_layout()
+    plt.show()
+
+def braess_paradox(net, origins, destinations, volumes, top=None, gap=1e-4, max_iterations=500, conjugate=True, workers=None):
+    '''
+    Braess's paradox: removing a road can lower the equilibrium total cost.
+    Every edge (or the 'top' busiest) is removed in turn and the equilibrium re-solved from the
+    base one, with the removals spread over worker processes (see traffic_assignment.braess_scan).
+    '''
+    ids = [net.index[o] for o in origins], [net.index[d] for d in destinations]
+    return braess_scan(net, *ids, volumes, busiest=top, gap=gap, max_iterations=max_iterations, conjugate=conjugate, workers=workers)
+
+def print_braess(net, scan, csv_file=None, max_edges=10): # Ranks the removals that lower the equilibrium cost and optionally writes all of them as CSV.
+    arrow = "->" if net.directed else "--"
+    names = [f"{net.nodes[net.tails[links[0]]]} {arrow} {net.nodes[net.heads[links[0]]]}" for links in scan["candidates"]]
+    ranked = np.argsort(scan["change"], kind="stable") # inf (cut-off OD pairs) sorts last
+    base = scan["base"]["total_cost"]
+    print(f"Base total cost: {base:.2f} ({len(names)} edges tried)")
+    better = [i for i in ranked.tolist() if scan["change"][i] < -1e-9 * max(base, 1.0)]
+    if better:
+        print(f"{'Removed edge':>16} {'Total cost':>12} {'Change':>12} {'Change %':>9} {'Iter':>5}")
+        for i in better[:max_edges]:
+            print(f"{names[i]:>16} {scan['total_cost'][i]:12.2f} {scan['change'][i]:12.2f} {100 * scan['change'][i] / base:9.2f} {scan['iterations'][i]:5d}")
+        print(f"{len(better)} edge removals lower the equilibrium cost.")
+    else:
+        print("No edge removal lowers the equilibrium cost.")
+    cut = int(np.isinf(scan["total_cost"]).sum())
+    if cut:
+        print(f"[INFO] {cut} edge removals leave some OD pair without a path.")
+    if not scan["converged"].all():
+        print(f"[WARN] {int((~scan['converged']).sum())} removals stopped at the iteration limit.")
+    if csv_file:
+        with open(csv_file, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["edge", "total_cost", "change", "iterations", "converged"])
+            for i in ranked.tolist():
+                writer.writerow([names[i], scan["total_cost"][i], scan["change"][i], scan["iterations"][i], int(scan["converged"][i])])
+        print(f"[INFO] Removal table written to {csv_file}")
+
+def summarize(net, result, origins, destinations, volumes, links=(), seconds=0.0, params=None, max_links=10): # JSON-ready summary of one solve (params: the a, b arrays it used, default the network's).
+    a, b = params or (net.a, net.b)
+    def link(j):
+        return {"source": net.nodes[net.tails[j]], "target": net.nodes[net.heads[j]], "a": float(a[j]), "b": float(b[j]),
+                "flow": float(result["flows"][j]), "cost": float(result["costs"][j])}
+    return {
+        "total_cost": result["total_cost"],
+        "gap": result["gap"],
+        "iterations": result["iterations"],
+        "converged": bool(result["converged"]),
+        "seconds": seconds,
+        "od": [{"origin": o, "destination": d, "volume": v, "cost": float(c)} for o, d, v, c in zip(origins, destinations, volumes, result["od_costs"].tolist())],
+        "edges": [link(j) for j in links],
+        "busiest": [link(j) for j in np.argsort(-result["flows"], kind="stable")[:max_links].tolist()],
+    }
+
+def edge_changes(net, body): # Link ids and a, b values of the "edges" of a request body (both directions of an undirected edge).
+    links, a, b = [], [], []
+    for edge in body.get("edges", []):
+        u, v = node_key(str(edge["source"])), node_key(str(edge["target"]))
+        if u not in net.index or v not in net.index:
+            raise ValueError(f"unknown edge {u} -> {v}")
+        pairs = [(net.index[u], net.index[v])] + ([] if net.directed else [(net.index[v], net.index[u])])
+        for t, h in pairs:
+            j = int(net.find_links([t], [h])[0])
+            if j < 0:
+                raise ValueError(f"unknown edge {u} -> {v}")
+            links.append(j)
+            a.append(float(edge.get("a", net.a[j])))
+            b.append(float(edge.get("b", net.b[j])))
+    return links, a, b
+
+class TrafficHandler(BaseHTTPRequestHandler):
+    '''
+    HTTP/JSON front end of an EquilibriumSolver (the server's 'solver'):
+        GET  /equilibrium[?optimum=1]   last solution (user equilibrium, or social optimum)
+        GET  /links                     every link with its a, b, flow and cost at equilibrium
+        POST /update                    {"edges": [{"source", "target", "a", "b"}], "optimum": false}: change and re-solve
+        POST /what_if                   same body: solve with the changes, then restore the previous network
+    Requests are served one at a time, so every query sees a consistent solver.
+    '''
+
+    def reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def answer(self, optimum, links=(), change=None, params=None):
+        server = self.server
+        start = time.perf_counter()
+        if change is not None:
+            result = change()
+        else:
+            result = server.solver.results.get(optimum) or server.solver.solve(optimum)
+        self.reply(200, summarize(server.net, result, *server.demand, links, time.perf_counter() - start, params))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        optimum = query.get("optimum", ["0"])[0] not in ("0", "false", "")
+        if url.path == "/equilibrium":
+            self.answer(optimum)
+        elif url.path == "/links":
+            self.answer(optimum, range(len(self.server.net)))
+        else:
+            self.reply(404, {"error": f"unknown path {url.path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path not in ("/update", "/what_if"):
+            self.reply(404, {"error": f"unknown path {url.path}"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            optimum = bool(body.get("optimum", False))
+            links, a, b = edge_changes(self.server.net, body)
+            solver = self.server.solver
+            if url.path == "/update":
+                solver.update(links, a, b)
+                self.answer(optimum, links, lambda: solver.solve(optimum))
+            else: # Report the changed a, b although the network is restored
+                params = self.server.net.a.copy(), self.server.net.b.copy()
+                params[0][links], params[1][links] = a, b
+                self.answer(optimum, links, lambda: solver.what_if(links, a, b, optimum), params)
+        except (ValueError, KeyError, TypeError, AttributeError) as e: # Bad JSON, unknown edges or negative parameters.
+            self.reply(400, {"error": str(e)})
+
+def serve(net, origins, destinations, volumes, port, gap=1e-4, max_iterations=500, conjugate=True, workers=None): # Solves once, then answers queries until interrupted.
+    ids = [net.index[o] for o in origins], [net.index[d] for d in destinations]
+    with EquilibriumSolver(net, *ids, volumes, gap, max_iterations, conjugate, workers) as solver:
+        result = solver.solve()
+        print(f"[INFO] Equilibrium total cost {result['total_cost']:.2f} after {result['iterations']} iterations")
+        server = HTTPServer(("127.0.0.1", port), TrafficHandler)
+        server.net, server.solver, server.demand = net, solver, (origins, destinations, volumes)
+        print(f"[INFO] Serving on http://127.0.0.1:{server.server_port} (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+def print_assignment(net, result, origins, destinations, volumes, max_links=10, verbose=False): # Prints routes (single pair), busiest links and totals of one solve (and, if verbose, the solver's iterations and gap).
+    if len(origins) == 1:
+        s, t = net.index[origins[0]], net.index[destinations[0]]
+        for i, (route, flow) in enumerate(path_flows(net, result["flows"], s, t)):
+            cost = result["costs"][net.link_ids(route[:-1], route[1:])].sum()
+            print(f"Path {i+1}: {' → '.join(str(net.nodes[u]) for u in route)}  Flow = {flow:.2f}  Cost = {cost:.2f}")
+    busiest = np.argsort(-result["flows"], kind="stable")[:max_links]
+    print("Busiest links:")
+    for j in busiest.tolist():
+        print(f"        {net.nodes[net.tails[j]]} → {net.nodes[net.heads[j]]}: Flow = {result['flows'][j]:.2f}  Cost = {result['costs'][j]:.2f}")
+    if len(origins) == 1:
+        print(f"Route cost: {result['od_costs'][0]:.2f}")
+    else:
+        print(f"OD pairs: {len(origins)}, vehicles: {sum(volumes):.2f}, average trip cost: {result['od_costs'] @ volumes / max(sum(volumes), 1e-12):.2f}")
+    print(f"Total cost: {result['total_cost']:.2f}")
+    if verbose:
+        print(f"[INFO] Iterations: {result['iterations']}, relative gap: {result['gap']:.2e}")
+    if not result["converged"]:
+        print("[WARN] Stopped at the iteration limit before reaching the relative gap target.")
 
 def plot_graph(G):
     '''
@@ -103,44 +341,106 @@ def plot_graph(G):
     nx.draw_networkx_edge_labels(G, pos, edge_labels=labels)
     plt.show()
     
+def main_serve(args): # --serve: the network is parsed and converted once, then every query reuses it.
+    try:
+        net = load_network(args.gml_file)
+        if args.od:
+            origins, destinations, volumes = read_demand(args.od)
+        else:
+            origins, destinations, volumes = [node_key(str(args.source))], [node_key(str(args.target))], [args.n]
+    except (OSError, KeyError, ValueError, nx.NetworkXError) as e: # Unreadable GML or OD table, or missing a, b attributes.
+        print(f"[ERROR] {e}")
+        exit(1)
+    missing = [u for u in origins + destinations if u not in net.index]
+    if missing:
+        print(f"[ERROR] Node {missing[0]!r} is not in the graph!")
+        exit(1)
+    try:
+        serve(net, origins, destinations, volumes, args.serve, args.gap, args.max_iter, not args.plain_fw, args.workers)
+    except (OSError, ValueError) as e: # Port in use, or an OD pair without a path.
+        print(f"[ERROR] {e}")
+        exit(1)
+
 def main():
     args = parse_args()
+    if args.serve is not None:
+        main_serve(args)
+        return
     G = read_graph(args.gml_file) # Reads arguments and loads the graph.
 
-    # Ensures compatibility if graph uses string labels (like "Start", "End") instead of integers.
-    if args.source not in G.nodes:
-        args.source = str(args.source)
-    if args.target not in G.nodes:
-        args.target = str(args.target)
+    if args.od:
+        try:
+            origins, destinations, volumes = read_demand(args.od)
+        except (OSError, KeyError, ValueError) as e: # Missing file, missing column or a bad volume.
+            print(f"[ERROR] Could not read OD table: {e}")
+            exit(1)
+        missing = [u for u in origins + destinations if u not in G.nodes]
+        if missing:
+            print(f"[ERROR] OD table node {missing[0]!r} is not in the graph!")
+            exit(1)
+        print(f"[DEBUG] OD pairs: {len(origins)} from {len(set(origins))} origins")
+    else:
+        # Ensures compatibility if graph uses string labels (like "Start", "End") instead of integers.
+        if args.source not in G.nodes:
+            args.source = str(args.source)
+        if args.target not in G.nodes:
+            args.target = str(args.target)
 
-    # Prints debug info to confirm everything loaded correctly.
-    print("[DEBUG] Nodes after relabeling:", list(G.nodes()))
-    print("[DEBUG] Using source:", args.source)
-    print("[DEBUG] Using target:", args.target)
+        # Prints debug info to confirm everything loaded correctly.
+        print("[DEBUG] Nodes after relabeling:", list(G.nodes()))
+        print("[DEBUG] Using source:", args.source)
+        print("[DEBUG] Using target:", args.target)
+        if args.source not in G.nodes or args.target not in G.nodes:
+            print("[ERROR] Source or target node is not in the graph!")
+            exit(1)
+        origins, destinations, volumes = [args.source], [args.target], [args.n]
+
+    try:
+        net = build_network(G) # Link arrays shared by both solves.
+    except ValueError as e: # Missing or negative a, b attributes.
+        print(f"[ERROR] {e}")
+        exit(1)
+    options = dict(gap=args.gap, max_iterations=args.max_iter, conjugate=not args.plain_fw, workers=args.workers)
 
-    # Compute all simple paths between source and target
-    paths = compute_paths(G, args.source, args.target)
-    print("[DEBUG] Paths found:", paths)
+    if args.sweep: # Price-of-anarchy curve instead of a single demand level
+        low, high, count = args.sweep
+        try:
+            sweep = price_of_anarchy_sweep(net, origins, destinations, volumes, np.linspace(low, high, int(count)), **options)
+        except Exception as e:
+            print(f"[ERROR] Demand sweep failed: {e}")
+            exit(1)
+        print("\n=== Demand Sweep ===")
+        print_sweep(net, sweep, args.sweep_csv)
+        if args.plot:
+            try:
+                plot_sweep(net, sweep)
+            except Exception as e:
+                print(f"[ERROR] Plotting failed: {e}")
+        return
 
-    if not paths:
-        print("[ERROR] No valid paths found between source and target!")
-        exit(1) # Exits if no path exists.
+    if args.braess: # Rank edge removals instead of printing one assignment
+        try:
+            scan = braess_paradox(net, origins, destinations, volumes, args.braess_top, **options)
+        except Exception as e:
+            print(f"[ERROR] Braess scan failed: {e}")
+            exit(1)
+        print("\n=== Braess Scan (equilibrium with one edge removed) ===")
+        print_braess(net, scan, args.braess_csv)
+        return
 
     # Compute travel equilibrium
     try:
-        f_eq = equilibrium(G, paths, args.n)
+        result = equilibrium(net, origins, destinations, volumes, **options)
         print("\n=== Travel Equilibrium (Nash Equilibrium) ===")
-        for i, f in enumerate(f_eq):
-            print(f"Path {i+1}: Flow = {f:.2f}")
-    except Exception as e: # Catches any errors (e.g., numerical issues).
+        print_assignment(net, result, origins, destinations, volumes, verbose=args.verbose)
+    except Exception as e: # Catches any errors (e.g., no path between source and target).
         print(f"[ERROR] Failed to compute equilibrium: {e}")
 
     # Compute social optimum
     try:
-        f_opt = social_optimum(G, paths, args.n)
+        result = social_optimum(net, origins, destinations, volumes, **options)
         print("\n=== Social Optimum ===")
-        for i, f in enumerate(f_opt):
-            print(f"Path {i+1}: Flow = {f:.2f}")
+        print_assignment(net, result, origins, destinations, volumes, verbose=args.verbose)
     except Exception as e:
         print(f"[ERROR] Failed to compute social optimum: {e}")
 
@@ -11,150 +11,997 @@ Citation(s):
 '''
 
 import argparse
+import gzip # compressed streaming output
+import heapq # re-leveling after edge deletions
 import math # needed for ln(n) in probability
+import os
+import statistics # normal quantiles for confidence intervals
+import sys
+import time # time budget for sampled path lengths
 import networkx as nx # main graph library
 import matplotlib.pyplot as plt # for visualization
-from collections import deque
+import numpy as np # array-backed BFS results
+from collections import deque # update queues for DynamicBFS
+from matplotlib.collections import LineCollection # one artist per highlighted BFS tree
 
-def create_random_graph(n, c): # graph generation
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Common")) # shared graph modules
+from graph_csr import graph_to_csr, csr_neighbors # CSR adjacency arrays
+from path_stats import path_statistics # parallel exact shortest-path statistics
+from graph_snapshot import read_gml_cached # binary snapshot cache for GML files
+from gml_stream import write_gml # streaming GML writer
+
+def edge_probability(n, c):
+    '''Edge probability p = c * ln(n) / n, clamped to [0, 1].'''
+    if n < 2:
+        return 0.0
+    return min(1.0, max(0.0, (c * math.log(n)) / n)) # formula for probability
+
+def pair_from_index(idx):
+    '''
+    Map linear indices over the pairs (v, w), w < v, ordered as idx = v(v-1)/2 + w,
+    back to their endpoints.
+    '''
+    v = ((1 + np.sqrt(1 + 8 * idx.astype(np.float64))) // 2).astype(np.int64)
+    # Correct float rounding at large indices so that v(v-1)/2 <= idx < v(v+1)/2
+    v -= (v * (v - 1) // 2) > idx
+    v += (v * (v + 1) // 2) <= idx
+    return v, idx - v * (v - 1) // 2
+
+def random_graph_edges(n, p, seed=None, chunk_size=1 << 20):
+    '''
+    Generate the edges of G(n, p) in O(n + m) time with geometric skipping
+    (Batagelj & Brandes): instead of flipping a coin per pair, draw the gap to the
+    next present pair. Gaps are drawn chunk_size at a time, so memory stays bounded.
+    Arguments:
+        n (int): number of nodes
+        p (float): edge probability
+        seed (int): random seed; the same seed and chunk_size give the same edges
+        chunk_size (int): number of gaps drawn per step
+    Yields:
+        (u, v) numpy int64 arrays of edge endpoints, u > v
+    '''
+    total = n * (n - 1) // 2 # number of candidate pairs
+    if p <= 0 or total == 0:
+        return
+    rng = np.random.default_rng(seed)
+    last = -1 # linear index of the previous edge
+    while last < total - 1:
+        idx = last + np.cumsum(rng.geometric(p, size=chunk_size))
+        last = int(idx[-1])
+        idx = idx[idx < total]
+        if idx.size:
+            yield pair_from_index(idx)
+
+def create_random_graph(n, c, seed=None): # graph generation
     '''
     Generates a new Erdős–Rényi random graph with n nodes and edge probability p = c * ln(n) / n.
     Arguments:
         n (int): number of nodes
         c (float): parameter for the edge probability
+        seed (int): optional random seed for reproducible graphs
     Returns:
         G (networkx.Graph): generated graph
 
     '''
-    p = (c * math.log(n)) / n # formula for probability 
-    G = nx.erdos_renyi_graph(n, p) # generates random G(n,p)
+    p = edge_probability(n, c)
+
+    # Label nodes as strings ("0", "1", ..., "n-1") while building, so the graph is only built once
+    labels = np.array([str(i) for i in range(n)], dtype=object)
+    G = nx.Graph()
+    G.add_nodes_from(labels)
+    for u, v in random_graph_edges(n, p, seed):
+        G.add_edges_from(zip(labels[u], labels[v]))
+    return G # returns graph
+
+def stream_random_graph(n, c, filename, seed=None):
+    '''
+    Write an Erdős–Rényi graph straight to disk without building a NetworkX graph.
+    A .gml name writes GML in the same layout as save_graph; anything else writes an
+    edge list with one "u v" pair per line. A trailing .gz compresses the output.
+    Returns:
+        number of edges written
+    '''
+    p = edge_probability(n, c)
+    is_gml = filename.endswith(".gml") or filename.endswith(".gml.gz")
+    opener = gzip.open if filename.endswith(".gz") else open
+    node_fmt = '  node [\n    id %d\n    label "%d"\n  ]\n'
+    edge_fmt = "  edge [\n    source %d\n    target %d\n  ]\n" if is_gml else "%d %d\n"
+    m = 0
+    with opener(filename, "wt", encoding="utf-8") as f:
+        if is_gml:
+            f.write("graph [\n")
+            for lo in range(0, n, 1 << 20): # nodes in bounded chunks too
+                ids = range(lo, min(n, lo + (1 << 20)))
+                f.write("".join(map(node_fmt.__mod__, zip(ids, ids))))
+        for u, v in random_graph_edges(n, p, seed):
+            f.write("".join(map(edge_fmt.__mod__, zip(v.tolist(), u.tolist()))))
+            m += len(u)
+        if is_gml:
+            f.write("]\n")
+    return m
+
+class BFSResult:
+    '''
+    Compact BFS tree from one source: a distance and a predecessor array indexed by
+    node id (-1 = unreached). Paths are only rebuilt when asked for, so a search keeps
+    O(n) integers instead of one list per reached node.
+    '''
+
+    def __init__(self, source, nodes, index, dist, pred, order):
+        self.source = source
+        self.nodes = nodes # shared id -> node list
+        self.index = index # shared node -> id dict
+        self.dist = dist # hop distance per node id
+        self.pred = pred # predecessor id per node id
+        self.order = order # reached node ids in BFS order
+
+    def __len__(self): # number of reached nodes (source included)
+        return len(self.order)
+
+    def __contains__(self, target):
+        i = self.index.get(target)
+        return i is not None and self.dist[i] >= 0
+
+    def distance(self, target):
+        '''Hop distance from the source to 'target', or None if unreachable.'''
+        if target not in self:
+            return None
+        return int(self.dist[self.index[target]])
+
+    def path(self, target):
+        '''Rebuild the shortest path source -> target by walking predecessors, or None if unreachable.'''
+        if target not in self:
+            return None
+        i = self.index[target]
+        path = [None] * (int(self.dist[i]) + 1)
+        for k in range(len(path) - 1, -1, -1):
+            path[k] = self.nodes[i]
+            i = self.pred[i]
+        return path
 
-    # Label nodes as strings ("0", "1", ..., "n-1")
-    mapping = {i: str(i) for i in range(n)} # relabels nodes to strings
-    return nx.relabel_nodes(G, mapping) # returns graph
+    def targets(self):
+        '''Iterate over reached nodes in BFS order.'''
+        for i in self.order:
+            yield self.nodes[i]
 
-def bfs_component(G, source):
+    def iter_paths(self):
+        '''Stream (target, path) pairs one at a time in BFS order.'''
+        for target in self.targets():
+            yield target, self.path(target)
+
+    def tree_edges(self):
+        '''
+        Edges of the BFS tree as (parent, child) node pairs. Every shortest path stored
+        by this result is made of these edges, so they cover all paths at once.
+        '''
+        for i in self.order[1:]:
+            yield self.nodes[self.pred[i]], self.nodes[i]
+
+def bfs_component(G, source, csr=None):
     '''
     Perform BFS from a single source node but restricted to its connected component.
+    Arguments:
+        G (networkx.Graph): input graph
+        source (str): source node ID
+        csr (tuple): optional output of graph_to_csr(G), reused across calls
+    Returns:
+        BFSResult with distances and predecessors for every node in the component
+    '''
+    nodes, index, indptr, indices = csr if csr is not None else graph_to_csr(G)
+    n = len(nodes)
+    dist = np.full(n, -1, dtype=indices.dtype)
+    pred = np.full(n, -1, dtype=indices.dtype)
+
+    s = index[source]
+    dist[s] = 0
+    frontier = np.array([s], dtype=indices.dtype)
+    levels = [frontier]
+    depth = 0
+
+    while frontier.size: # level-synchronous BFS, one vectorized step per level
+        parents, nbrs = csr_neighbors(indptr, indices, frontier)
+        unseen = dist[nbrs] < 0
+        parents, nbrs = parents[unseen], nbrs[unseen]
+        nbrs, first = np.unique(nbrs, return_index=True) # keep one parent per newly reached node
+        depth += 1
+        dist[nbrs] = depth
+        pred[nbrs] = parents[first]
+        frontier = nbrs
+        levels.append(frontier)
+
+    return BFSResult(source, nodes, index, dist, pred, np.concatenate(levels))
+
+class MultiBFSResult:
+    '''
+    Distances and predecessors from many sources at once, as (k, n) arrays where
+    row j belongs to sources[j] and column i to node id i (-1 = unreached).
+    '''
+
+    def __init__(self, sources, nodes, index, dist, pred):
+        self.sources = sources
+        self.nodes = nodes
+        self.index = index
+        self.dist = dist
+        self.pred = pred
+
+    def result(self, source):
+        '''View the row of 'source' as a single-source BFSResult (needs predecessors).'''
+        j = self.sources.index(source)
+        d = self.dist[j]
+        reached = np.flatnonzero(d >= 0)
+        order = reached[np.argsort(d[reached], kind="stable")]
+        return BFSResult(source, self.nodes, self.index, d, self.pred[j], order)
+
+def unpack_bits(rows, slab=1 << 16):
+    '''
+    Yield (row, source) index pairs of the set bits of a (r, words) uint64 array, a bounded
+    slab at a time. Only the nonzero words are unpacked, so sparse rows stay cheap.
+    '''
+    for lo in range(0, len(rows), slab):
+        r, w = np.nonzero(rows[lo:lo + slab])
+        words = rows[lo + r, w].astype("<u8").view(np.uint8).reshape(-1, 8)
+        i, b = np.nonzero(np.unpackbits(words, axis=1, bitorder="little"))
+        yield lo + r[i], w[i] * 64 + b
+
+def batched_bfs(G, sources, csr=None, predecessors=True, block_edges=1 << 22):
+    '''
+    Bit-parallel multi-source BFS (MS-BFS). Every node carries one bit per source in
+    a row of 64-bit words; a level expands the union of all sources' frontiers once and
+    ORs the parents' bit rows into their neighbors, so k sources share one traversal
+    of the adjacency instead of k separate ones. Predecessors are picked in the same
+    level: the frontier edges into a newly reached node are tried in turn, and each
+    hands its bit row to the sources that have no parent there yet.
+    Arguments:
+        G (networkx.Graph): input graph
+        sources (list of str): source node IDs (all must be in G)
+        csr (tuple): optional output of graph_to_csr(G)
+        predecessors (bool): also fill the predecessor array
+        block_edges (int): upper bound on adjacency entries expanded at once (memory cap)
     Returns:
-        A dictionary {target: path}
+        MultiBFSResult
     '''
-    visited = {source: [source]} # path to each node
-    queue = deque([source])
+    nodes, index, indptr, indices = csr if csr is not None else graph_to_csr(G)
+    n, k = len(nodes), len(sources)
+    words = (k + 63) // 64
+    seen = np.zeros((n, words), dtype=np.uint64) # sources that have reached each node
+    visit = np.zeros((n, words), dtype=np.uint64) # sources whose frontier contains each node
+    incoming = np.zeros((n, words), dtype=np.uint64) # bits arriving at each node this level
+    dist = np.full((k, n), -1, dtype=np.int32)
+
+    src_ids = np.array([index[s] for s in sources], dtype=np.int64)
+    for j, s in enumerate(src_ids):
+        bit = np.uint64(1) << np.uint64(j % 64)
+        seen[s, j // 64] |= bit
+        visit[s, j // 64] |= bit
+        dist[j, s] = 0
+
+    pred = np.full((k, n), -1, dtype=indices.dtype) if predecessors else None
+    frontier = np.unique(src_ids)
+    level = 0
+    while frontier.size:
+        level += 1
+        touched, edges = [], []
+        # Expand the frontier in blocks so the per-edge bit rows stay bounded in memory
+        degrees = indptr[frontier + 1] - indptr[frontier]
+        block_ids = np.cumsum(degrees) // block_edges
+        for b in np.unique(block_ids):
+            block = frontier[block_ids == b]
+            parents, nbrs = csr_neighbors(indptr, indices, block)
+            if not nbrs.size:
+                continue
+            order = np.argsort(nbrs, kind="stable")
+            nbrs = nbrs[order]
+            targets, starts = np.unique(nbrs, return_index=True)
+            incoming[targets] |= np.bitwise_or.reduceat(visit[parents[order]], starts, axis=0)
+            touched.append(targets)
+            if predecessors:
+                edges.append((parents[order], nbrs))
+
+        if not touched:
+            visit[frontier] = 0
+            break
+        touched = np.unique(np.concatenate(touched))
+        new = incoming[touched] & ~seen[touched]
+        incoming[touched] = 0
+        hit = new.any(axis=1)
+        reached, new = touched[hit], new[hit]
 
-    while queue: 
-        u = queue.popleft()
-        for v in G.neighbors(u):
-            if v not in visited:
-                visited[v] = visited[u] + [v]
-                queue.append(v)
-    return visited
+        if not predecessors:
+            for rows, cols in unpack_bits(new):
+                dist[cols, reached[rows]] = level
+        elif reached.size: # every new (node, source) pair gets its parent once, so dist is set on the same pass
+            parents = np.concatenate([p for p, _ in edges])
+            nbrs = np.concatenate([v for _, v in edges])
+            keep = np.isin(nbrs, reached) # only edges into newly reached nodes hand out parents
+            parents, nbrs = parents[keep], nbrs[keep]
+            order = np.argsort(nbrs, kind="stable") # edges grouped by node, in the (sorted) order of reached
+            parents = parents[order]
+            starts = np.searchsorted(nbrs[order], reached)
+            counts = np.diff(np.append(starts, len(parents)))
+            missing = new.copy() # sources still without a parent at each reached node
+            active, r = np.arange(reached.size), 0
+            while active.size: # r-th frontier edge into every node that still misses parents
+                active = active[counts[active] > r]
+                via = parents[starts[active] + r]
+                got = missing[active] & visit[via]
+                for rows, cols in unpack_bits(got):
+                    dist[cols, reached[active[rows]]] = level
+                    pred[cols, reached[active[rows]]] = via[rows]
+                missing[active] &= ~got
+                active = active[missing[active].any(axis=1)]
+                r += 1
 
-def multi_source_bfs(G, sources): # BFS
+        visit[frontier] = 0
+        frontier = reached
+        seen[frontier] |= new
+        visit[frontier] = new
+
+    return MultiBFSResult(list(sources), nodes, index, dist, pred)
+
+def multi_source_bfs(G, sources, batched=False): # BFS
     '''
     Perform BFS from multiple source nodes and store the shortest paths.
     Arguments:
         G (networkx.Graph): input graph
         source (list of str): source node IDs
+        batched (bool): advance all sources together with batched_bfs
     Returns
-        dict: {source: {target: path}}
+        dict: {source: BFSResult}
     '''
-    paths = {}
+    valid = []
     for s in sources:
         if s not in G: # check node exists
             print(f"Warning: source node {s} not in the graph")
             continue
-        
-        # Use shortest_path built-in from NetworkX (BFS on unweighted graph)
-        paths[s] = bfs_component(G, s) # BFS paths
+        if s not in valid:
+            valid.append(s)
+    if not valid:
+        return {}
+
+    csr = graph_to_csr(G) # one adjacency conversion shared by every source
+    if batched:
+        multi = batched_bfs(G, valid, csr)
+        return {s: multi.result(s) for s in valid}
+
+    paths = {}
+    for s in valid:
+        paths[s] = bfs_component(G, s, csr) # BFS tree
     return paths
 
-def analyze_graph(G): # graph analysis
+def print_bfs_summary(bfs_paths, max_paths=10):
+    '''
+    Print how many nodes each source reached and the first few shortest paths.
+    Paths are streamed from the BFS result so large trees are never expanded in full.
+    '''
+    print("\n--- Multi-source BFS ---")
+    for src, result in bfs_paths.items():
+        print(f"source {src}: reached {len(result)} nodes, eccentricity {int(result.dist.max())}")
+        for k, (target, path) in enumerate(result.iter_paths()):
+            if k >= max_paths:
+                print(f"  ... {len(result) - max_paths} more")
+                break
+            print(f"  {target}: {path}")
+
+class PathFinder:
+    '''
+    Point-to-point shortest paths by bidirectional BFS over one preloaded CSR adjacency.
+    Both searches advance a whole level at a time, always on the side with the cheaper
+    frontier, and stop at the first level where they touch. The distance and predecessor
+    arrays are allocated once; a query only resets the entries it visited, so its cost
+    depends on the part of the graph it explores, not on the size of the graph.
     '''
-    Perform structural analyses on the graph.
+
+    def __init__(self, G=None, csr=None):
+        self.nodes, self.index, self.indptr, self.indices = csr if csr is not None else graph_to_csr(G)
+        n = len(self.nodes)
+        self.dist = (np.full(n, -1, dtype=np.int64), np.full(n, -1, dtype=np.int64)) # forward, backward
+        self.pred = (np.full(n, -1, dtype=np.int64), np.full(n, -1, dtype=np.int64)) # parent toward s / toward t
+
+    def expand(self, side, frontier, depth):
+        '''
+        Advance one side by one level.
+        Returns:
+            (next frontier, best (length, u, w) meeting edge found or None)
+        '''
+        dist, other = self.dist[side], self.dist[1 - side]
+        parents, nbrs = csr_neighbors(self.indptr, self.indices, frontier)
+        hit = other[nbrs] >= 0
+        meeting = None
+        if hit.any(): # every meeting edge of this level is checked, so the shortest one is kept
+            lengths = depth + 1 + other[nbrs[hit]]
+            k = int(np.argmin(lengths))
+            meeting = (int(lengths[k]), int(parents[hit][k]), int(nbrs[hit][k]))
+        unseen = dist[nbrs] < 0
+        nbrs, first = np.unique(nbrs[unseen], return_index=True)
+        dist[nbrs] = depth + 1
+        self.pred[side][nbrs] = parents[unseen][first]
+        return nbrs, meeting
+
+    def query(self, s, t):
+        '''
+        Shortest path from s to t.
+        Returns:
+            list of nodes from s to t, or None if t is unreachable (or a node is missing)
+        '''
+        if s not in self.index or t not in self.index:
+            return None
+        a, b = self.index[s], self.index[t]
+        if a == b:
+            return [s]
+
+        frontiers = [np.array([a]), np.array([b])]
+        depths = [0, 0]
+        visited = [frontiers[0], frontiers[1]] # every id touched, for the reset below
+        self.dist[0][a] = self.dist[1][b] = 0
+        meeting = None
+        try:
+            while frontiers[0].size and frontiers[1].size:
+                work = [int((self.indptr[f + 1] - self.indptr[f]).sum()) for f in frontiers]
+                side = 0 if work[0] <= work[1] else 1
+                frontiers[side], found = self.expand(side, frontiers[side], depths[side])
+                depths[side] += 1
+                visited.append(frontiers[side])
+                if found:
+                    # Orient the meeting edge as (node on the s side, node on the t side)
+                    meeting = found if side == 0 else (found[0], found[2], found[1])
+                    break
+            if meeting is None:
+                return None
+            _, u, w = meeting
+            path = []
+            while u >= 0: # walk back to s
+                path.append(self.nodes[u])
+                u = self.pred[0][u]
+            path.reverse()
+            while w >= 0: # walk forward to t
+                path.append(self.nodes[w])
+                w = self.pred[1][w]
+            return path
+        finally:
+            touched = np.concatenate(visited)
+            for array in self.dist + self.pred:
+                array[touched] = -1
+
+def read_pairs(filename):
+    '''Read "s t" (or "s,t") query pairs, one per line; blank lines and # comments are skipped.'''
+    pairs = []
+    with open(filename) as f:
+        for line in f:
+            line = line.split("#", 1)[0].replace(",", " ").split()
+            if len(line) >= 2:
+                pairs.append((line[0], line[1]))
+    return pairs
+
+def run_path_queries(G, pairs):
+    '''
+    Answer every (s, t) pair with one shared PathFinder and print each path
+    followed by the query timing.
+    '''
+    t0 = time.perf_counter()
+    finder = PathFinder(G)
+    setup = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    paths = [finder.query(s, t) for s, t in pairs]
+    elapsed = time.perf_counter() - t0
+
+    print("\n--- Shortest paths ---")
+    for (s, t), path in zip(pairs, paths):
+        missing = [v for v in (s, t) if v not in finder.index]
+        if missing:
+            print(f"{s} -> {t}: node {missing[0]} not in the graph")
+        elif path is None:
+            print(f"{s} -> {t}: unreachable")
+        else:
+            print(f"{s} -> {t}: length {len(path) - 1}: {path}")
+    if pairs:
+        print(f"{len(pairs)} queries in {elapsed:.4f}s ({1e6 * elapsed / len(pairs):.1f} µs each, adjacency built in {setup:.3f}s)")
+
+class DynamicBFS:
+    '''
+    BFS trees from a fixed set of sources, kept up to date while edges are added and
+    removed. Each update only touches the nodes whose distance can change:
+      - an insertion that shortens a distance pushes the improvement outward from the
+        closer endpoint, stopping wherever a node is not improved;
+      - a deletion of a tree edge first gives the cut-off child (and its subtree) any
+        other parent one level closer; only the nodes left without one are re-leveled,
+        seeded from their unaffected neighbors.
+    The graph G is updated along with the trees.
+    '''
+
+    def __init__(self, G, bfs_paths):
+        self.G = G
+        first = next(iter(bfs_paths.values()))
+        self.nodes = list(first.nodes)
+        self.index = dict(first.index)
+        self.adj = [set() for _ in self.nodes] # neighbor id sets, edited in place by updates
+        for u, nbrs in G.adjacency():
+            self.adj[self.index[u]] = {self.index[v] for v in nbrs}
+        self.sources = list(bfs_paths)
+        self.dist = {s: r.dist.tolist() for s, r in bfs_paths.items()} # -1 = unreached
+        self.pred = {s: r.pred.tolist() for s, r in bfs_paths.items()}
+
+    def node_id(self, node):
+        '''Id of 'node', adding it (unreached from every source) if it is new.'''
+        i = self.index.get(node)
+        if i is None:
+            i = self.index[node] = len(self.nodes)
+            self.nodes.append(node)
+            self.adj.append(set())
+            for s in self.sources:
+                self.dist[s].append(-1)
+                self.pred[s].append(-1)
+        return i
+
+    def add_edge(self, u, v):
+        '''
+        Insert edge u-v.
+        Returns:
+            dict {source: list of nodes whose distance changed}
+        '''
+        self.G.add_edge(u, v)
+        a, b = self.node_id(u), self.node_id(v)
+        if b in self.adj[a] or a == b:
+            return {s: [] for s in self.sources}
+        self.adj[a].add(b)
+        self.adj[b].add(a)
+
+        changed = {}
+        for s in self.sources:
+            dist, pred, adj = self.dist[s], self.pred[s], self.adj
+            x, y = (a, b) if dist[b] < 0 or (0 <= dist[a] < dist[b]) else (b, a)
+            moved = []
+            if dist[x] >= 0 and (dist[y] < 0 or dist[x] + 1 < dist[y]):
+                dist[y], pred[y] = dist[x] + 1, x
+                queue = deque([y])
+                while queue: # relax outward; nodes that do not improve stop the wave
+                    w = queue.popleft()
+                    moved.append(w)
+                    for z in adj[w]:
+                        if dist[z] < 0 or dist[w] + 1 < dist[z]:
+                            dist[z], pred[z] = dist[w] + 1, w
+                            queue.append(z)
+            changed[s] = [self.nodes[i] for i in moved]
+        return changed
+
+    def remove_edge(self, u, v):
+        '''
+        Delete edge u-v.
+        Returns:
+            dict {source: list of nodes whose distance changed}
+        '''
+        if not self.G.has_edge(u, v):
+            return {s: [] for s in self.sources}
+        self.G.remove_edge(u, v)
+        a, b = self.index[u], self.index[v]
+        self.adj[a].discard(b)
+        self.adj[b].discard(a)
+
+        changed = {}
+        for s in self.sources:
+            dist, pred, adj = self.dist[s], self.pred[s], self.adj
+            if pred[b] == a:
+                child = b
+            elif pred[a] == b:
+                child = a
+            else: # not a tree edge: every distance and parent stays valid
+                changed[s] = []
+                continue
+
+            # Walk the cut subtree level by level; a node keeps its distance if some
+            # unaffected neighbor sits one level closer, otherwise it is affected
+            affected = set()
+            queue = deque([child])
+            while queue:
+                w = queue.popleft()
+                parent = next((z for z in adj[w] if dist[z] == dist[w] - 1 and z not in affected), None)
+                if parent is not None:
+                    pred[w] = parent
+                    continue
+                affected.add(w)
+                queue.extend(z for z in adj[w] if pred[z] == w)
+
+            # Re-level the affected nodes from their unaffected neighbors (unit-weight Dijkstra)
+            old = {w: dist[w] for w in affected}
+            heap = []
+            for w in affected:
+                dist[w], pred[w] = -1, -1
+                for z in adj[w]:
+                    if z not in affected and dist[z] >= 0 and (dist[w] < 0 or dist[z] + 1 < dist[w]):
+                        dist[w], pred[w] = dist[z] + 1, z
+                if dist[w] >= 0:
+                    heapq.heappush(heap, (dist[w], w))
+            while heap:
+                d, w = heapq.heappop(heap)
+                if d != dist[w]:
+                    continue # stale entry
+                for z in adj[w]:
+                    if z in affected and (dist[z] < 0 or d + 1 < dist[z]):
+                        dist[z], pred[z] = d + 1, w
+                        heapq.heappush(heap, (d + 1, z))
+            changed[s] = [self.nodes[w] for w in affected if dist[w] != old[w]]
+        return changed
+
+    def apply(self, updates):
+        '''
+        Apply ("add" | "remove", u, v) updates in order.
+        Returns:
+            dict {source: set of nodes whose distance changed at least once}
+        '''
+        total = {s: set() for s in self.sources}
+        for action, u, v in updates:
+            step = self.add_edge(u, v) if action == "add" else self.remove_edge(u, v)
+            for s, nodes in step.items():
+                total[s].update(nodes)
+        return total
+
+    def result(self, source):
+        '''Current tree of 'source' as a BFSResult.'''
+        dist = np.array(self.dist[source], dtype=np.int64)
+        reached = np.flatnonzero(dist >= 0)
+        order = reached[np.argsort(dist[reached], kind="stable")]
+        return BFSResult(source, self.nodes, self.index, dist, np.array(self.pred[source], dtype=np.int64), order)
+
+    def verify(self):
+        '''
+        Compare every tree with a BFS recomputed from scratch on the current graph.
+        Distances must match exactly; a predecessor must be a neighbor one level closer.
+        Returns:
+            list of (source, node, problem) strings, empty if everything is consistent
+        '''
+        problems = []
+        csr = graph_to_csr(self.G)
+        for s in self.sources:
+            fresh = bfs_component(self.G, s, csr)
+            dist, pred = self.dist[s], self.pred[s]
+            for node, j in csr[1].items():
+                i = self.index[node]
+                expected = int(fresh.dist[j])
+                if dist[i] != expected:
+                    problems.append((s, node, f"distance {dist[i]}, expected {expected}"))
+                elif expected > 0 and (pred[i] not in self.adj[i] or dist[pred[i]] != expected - 1):
+                    problems.append((s, node, f"bad predecessor {self.nodes[pred[i]] if pred[i] >= 0 else None}"))
+        return problems
+
+def read_updates(filename):
+    '''Read "add u v" / "remove u v" lines (commas allowed); blank lines and # comments are skipped.'''
+    updates = []
+    with open(filename) as f:
+        for line in f:
+            parts = line.split("#", 1)[0].replace(",", " ").split()
+            if len(parts) >= 3 and parts[0].lower() in ("add", "remove"):
+                updates.append((parts[0].lower(), parts[1], parts[2]))
+    return updates
+
+def union_find_components(n, tails, heads):
+    '''
+    Vectorized union-find: repeatedly hook the larger root of every edge onto the
+    smaller one and compress paths until no edge joins two different roots.
+    Arguments:
+        n (int): number of nodes
+        tails, heads (numpy arrays): edge endpoints as node ids
+    Returns:
+        numpy array with the root (smallest node id) of each node's component
+    '''
+    parent = np.arange(n, dtype=np.int64)
+    while True:
+        ru, rv = parent[tails], parent[heads]
+        split = ru != rv
+        if not split.any():
+            return parent
+        lo = np.minimum(ru[split], rv[split])
+        hi = np.maximum(ru[split], rv[split])
+        np.minimum.at(parent, hi, lo) # hook: roots only ever point to smaller ids, so no loops
+        while True: # compress every node straight to its root
+            grand = parent[parent]
+            if (grand == parent).all():
+                break
+            parent = grand
+
+def cycle_through_edge(result, a, b):
+    '''
+    Close the cycle formed by the non-tree edge (a, b) of a BFS tree: walk both
+    endpoints up to their lowest common ancestor. Arguments are node ids.
+    Returns:
+        list of (u, v) node pairs around the cycle, in the style of nx.find_cycle
+    '''
+    up_a, up_b = [a], [b]
+    while result.dist[up_a[-1]] > result.dist[up_b[-1]]:
+        up_a.append(result.pred[up_a[-1]])
+    while result.dist[up_b[-1]] > result.dist[up_a[-1]]:
+        up_b.append(result.pred[up_b[-1]])
+    while up_a[-1] != up_b[-1]:
+        up_a.append(result.pred[up_a[-1]])
+        up_b.append(result.pred[up_b[-1]])
+    ring = up_a[::-1] + up_b[:-1] # lca -> ... -> a -> b -> ... (back to lca)
+    names = [result.nodes[i] for i in ring]
+    return list(zip(names, names[1:] + names[:1]))
+
+def average_shortest_path(csr, members, samples=None, time_budget=None, seed=None, confidence=0.95):
+    '''
+    Average shortest path length inside one connected component. With no sample or
+    time budget every member is used as a BFS source (exact). Otherwise sources are
+    drawn without replacement until either budget runs out, and the mean is reported
+    with a normal confidence interval (with finite population correction).
+    Arguments:
+        csr (tuple): output of graph_to_csr(G)
+        members (numpy array): node ids of the component
+        samples (int): maximum number of BFS sources
+        time_budget (float): maximum seconds to spend
+        seed (int): random seed for the source sample
+        confidence (float): confidence level of the interval
+    Returns:
+        (mean, (low, high), sources_used)
+    '''
+    nodes = csr[0]
+    size = len(members)
+    if size < 2:
+        return 0.0, (0.0, 0.0), size
+
+    order = np.random.default_rng(seed).permutation(members)
+    limit = size if samples is None else min(samples, size)
+    start = time.perf_counter()
+    means = []
+    for s in order[:limit]:
+        if means and time_budget is not None and time.perf_counter() - start > time_budget:
+            break
+        d = bfs_component(None, nodes[s], csr).dist
+        means.append(d[d > 0].sum() / (size - 1)) # every source sees the same size - 1 targets
+
+    means = np.array(means)
+    mean = float(means.mean())
+    k = len(means)
+    if k == size or k < 2:
+        return mean, (mean, mean), k
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    half = z * means.std(ddof=1) / math.sqrt(k) * math.sqrt((size - k) / (size - 1))
+    return mean, (float(mean - half), float(mean + half)), k
+
+def analyze_graph(G, samples=None, time_budget=None, seed=None, workers=None): # graph analysis
+    '''
+    Perform structural analyses on the graph. Components, cycles, isolated nodes and
+    density all come from one degree pass and one union-find pass over the edges.
+    The average shortest path length is measured on the largest component, exactly
+    with one BFS per node spread over 'workers' processes (plus diameter and hop
+    histogram), or as a sampled estimate when 'samples' and/or 'time_budget' is given.
     Returns: 
         dict with results
     '''
     results = {}
+    csr = graph_to_csr(G)
+    nodes, index, indptr, indices = csr
+    n, m = len(nodes), G.number_of_edges()
+    degrees = np.diff(indptr)
+    tails = np.repeat(np.arange(n, dtype=indices.dtype), degrees)
 
     # Connected components
-    components = list(nx.connected_components(G)) # find connected components & G = input graph
-    results["num_components"] = len(components)
+    roots = union_find_components(n, tails, indices)
+    comp_roots, comp_sizes = np.unique(roots, return_counts=True)
+    results["num_components"] = len(comp_roots)
 
-    # Cycle detection (any simple cycle)
-    try: 
-        cycle = nx.find_cycle(G) # raises error if no cycle
-        results["has_cycle"] = True
-        results["cycle_example"] = cycle
-    except nx.NetworkXNoCycle:
-        results["has_cycle"] = False
+    # Cycle detection: a forest has exactly n - components edges, anything more closes a cycle
+    results["has_cycle"] = m > n - len(comp_roots)
+    if results["has_cycle"]:
+        comp_edges = np.bincount(roots[tails], minlength=n) + np.bincount(roots[tails[tails == indices]], minlength=n)
+        cyclic_root = comp_roots[np.flatnonzero(comp_edges[comp_roots] // 2 >= comp_sizes)[0]]
+        tree = bfs_component(G, nodes[cyclic_root], csr) # only the component that holds a cycle
+        inside = tree.dist[tails] >= 0
+        a, b = tails[inside], indices[inside]
+        extra = (tree.pred[b] != a) & (tree.pred[a] != b) | (a == b)
+        k = np.flatnonzero(extra)[0]
+        results["cycle_example"] = cycle_through_edge(tree, int(a[k]), int(b[k]))
 
     # Isolated nodes
-    results["isolated_nodes"] = list(nx.isolates(G)) # identifies nodes that are not connected to any other node.
+    results["isolated_nodes"] = [nodes[i] for i in np.flatnonzero(degrees == 0)] # identifies nodes that are not connected to any other node.
 
     # Graph density
-    results["density"] = nx.density(G)
+    results["density"] = 2 * m / (n * (n - 1)) if n > 1 else 0
 
-    # Average shortest path length (only if connected)
-    if nx.is_connected(G):
-        results["avg_shortest_path_len"] = nx.average_shortest_path_length(G)
-    else:
+    # Average shortest path length (on the largest component when disconnected)
+    if n == 0:
         results["avg_shortest_path_len"] = None
+        return results
+    largest = comp_roots[np.argmax(comp_sizes)]
+    members = np.flatnonzero(roots == largest)
+    sampled = samples is not None or time_budget is not None
+    if sampled:
+        mean, interval, used = average_shortest_path(csr, members, samples, time_budget, seed)
+    else:
+        stats = path_statistics(indptr, indices, members, workers=workers)
+        mean = stats["avg_shortest_path_len"]
+    results["avg_shortest_path_len"] = mean
+    if len(comp_roots) > 1:
+        results["avg_shortest_path_scope"] = f"largest component ({len(members)} of {n} nodes)"
+    if sampled:
+        results["avg_shortest_path_ci95"] = interval
+        results["avg_shortest_path_sources"] = used
+    else:
+        results["diameter"] = stats["diameter"]
+        results["hop_distance_histogram"] = stats["hop_histogram"].tolist()
     return results
 
-def bfs_layout(G, root):
+def bfs_layout(G, root, csr=None):
     '''
-    Generate a layered BFS layout rooted at 'root'.
+    Generate a layered BFS layout rooted at 'root': level d of the BFS is row -d and
+    each level is centred horizontally. Nodes the root cannot reach go on one extra row
+    below the deepest level.
     Returns: 
         Position dict usable by networkx.draw()
     '''
+    csr = csr if csr is not None else graph_to_csr(G)
+    nodes = csr[0]
+    result = bfs_component(G, root, csr)
+    levels = result.dist.astype(np.int64)
+    levels[levels < 0] = levels.max() + 1 # unreachable row
 
-    levels = {root: 0}
-    pos = {root: (0, 0)}
-    queue = deque([root])
-    max_width = 0
-
-    while queue: 
-        u = queue.popleft()
-        for v in G.neighbors(u):
-            if v not in levels:
-                levels[v] = levels[u] + 1
-                queue.append(v)
-
-    # Group nodes by level
-    level_nodes = {}
-    for node, lvl in levels.items():
-        level_nodes.setdefault(lvl, []).append(node)
-        max_width = max(max_width, len(level_nodes[lvl]))
-
-    # Assign positions: spread nodes at each level horizontally
-    pos = {}
-    for lvl, nodes in level_nodes.items():
-        width = len(nodes)
-        for i, node in enumerate(nodes):
-            x = i - (width - 1) / 2
-            pos[node] = (x, -lvl)
-    return pos
-    
-def plot_graph(G, bfs_paths=None, analysis=None):
+    # Rank nodes within their level, then centre every level around x = 0
+    order = np.argsort(levels, kind="stable")
+    counts = np.bincount(levels)
+    starts = np.cumsum(counts) - counts
+    x = np.empty(len(nodes))
+    x[order] = np.arange(len(nodes)) - starts[levels[order]] - (counts[levels[order]] - 1) / 2
+    return dict(zip(nodes, zip(x.tolist(), (-levels).tolist())))
+
+def far_field(x, y, span, depth, k2):
+    '''
+    Barnes–Hut far-field repulsion on a quadtree stored as one dense grid per level.
+    At level l a node interacts with the centre of mass of every cell that is a child
+    of its parent's neighbours but not adjacent to its own cell, so each pair of
+    nodes is counted exactly once across the levels (the rest is left to near_field).
+    Coordinates are relative to the lower-left corner of the bounding square.
+    Returns:
+        (fx, fy) force arrays
+    '''
+    fx, fy = np.zeros_like(x), np.zeros_like(y)
+    for level in range(2, depth + 1):
+        side = 1 << level
+        cx = np.minimum((x * (side / span)).astype(np.int64), side - 1)
+        cy = np.minimum((y * (side / span)).astype(np.int64), side - 1)
+        # Grid padded by two empty cells on each side, so no neighbour index leaves it
+        width = side + 4
+        flat = (cx + 2) * width + (cy + 2)
+        mass = np.bincount(flat, minlength=width * width).astype(np.float64)
+        comx = np.bincount(flat, weights=x, minlength=width * width) / np.maximum(mass, 1)
+        comy = np.bincount(flat, weights=y, minlength=width * width) / np.maximum(mass, 1)
+        px, py = cx % 2, cy % 2
+        base = flat - (px + 2) * width - (py + 2) # first child of the parent's lower-left neighbour
+        for i in range(6):
+            far_x = np.abs(i - 2 - px) > 1
+            for j in range(6):
+                q = base + i * width + j
+                m = mass[q] * (far_x | (np.abs(j - 2 - py) > 1))
+                dx, dy = x - comx[q], y - comy[q]
+                w = k2 * m / np.maximum(dx * dx + dy * dy, 1e-12)
+                fx += dx * w
+                fy += dy * w
+    return fx, fy
+
+def near_field(x, y, span, depth, k2):
+    '''
+    Exact repulsion between nodes in the same or adjacent finest-level cells. Cell
+    members are packed into a (cells, max occupancy) table so each of the 9 neighbour
+    offsets is one vectorized gather.
+    Returns:
+        (fx, fy) force arrays
+    '''
+    n = len(x)
+    side = 1 << depth
+    width = side + 2 # one empty cell of padding on each side
+    cx = np.minimum((x * (side / span)).astype(np.int64), side - 1)
+    cy = np.minimum((y * (side / span)).astype(np.int64), side - 1)
+    flat = (cx + 1) * width + (cy + 1)
+    occupied, compact, counts = np.unique(flat, return_inverse=True, return_counts=True)
+    lookup = np.full(width * width, len(occupied), dtype=np.int64) # empty cells -> the all -1 row
+    lookup[occupied] = np.arange(len(occupied))
+    order = np.argsort(compact, kind="stable")
+    rank = np.arange(n) - (np.cumsum(counts) - counts)[compact[order]]
+    table = np.full((len(occupied) + 1, counts.max()), -1, dtype=np.int64)
+    table[compact[order], rank] = order
+
+    fx, fy = np.zeros_like(x), np.zeros_like(y)
+    me = np.arange(n)[:, None]
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            members = table[lookup[flat + dx * width + dy]]
+            use = (members >= 0) & (members != me)
+            members = np.maximum(members, 0)
+            ddx, ddy = x[:, None] - x[members], y[:, None] - y[members]
+            w = np.where(use, k2 / np.maximum(ddx * ddx + ddy * ddy, 1e-12), 0)
+            fx += (ddx * w).sum(axis=1)
+            fy += (ddy * w).sum(axis=1)
+    return fx, fy
+
+def barnes_hut_layout(G, csr=None, iterations=50, seed=42, gravity=2.0, max_occupancy=16):
+    '''
+    Fruchterman–Reingold force layout with Barnes–Hut approximated repulsion, so each
+    iteration costs O(n log n + m) instead of the O(n^2) of nx.spring_layout. A weak
+    pull towards the centroid keeps isolated nodes and small components from drifting
+    off, which would otherwise stretch the quadtree over mostly empty space.
+    Arguments:
+        iterations (int): number of cooling steps
+        gravity (float): strength of the pull towards the centroid
+        max_occupancy (int): the quadtree is refined until no finest cell holds more nodes
+    Returns:
+        Position dict usable by networkx.draw()
+    '''
+    nodes, index, indptr, indices = csr if csr is not None else graph_to_csr(G)
+    n = len(nodes)
+    pos = np.random.default_rng(seed).random((n, 2))
+    if n < 2:
+        return dict(zip(nodes, pos.tolist()))
+    tails = np.repeat(np.arange(n), np.diff(indptr))
+    k = math.sqrt(1.0 / n) # ideal edge length in the unit square
+    base_depth = int(min(10, max(2, math.ceil(math.log(n, 4)))))
+    temperature = 0.1
+
+    for it in range(iterations):
+        x, y = pos[:, 0] - pos[:, 0].min(), pos[:, 1] - pos[:, 1].min()
+        span = max(float(x.max()), float(y.max()), 1e-9) * (1 + 1e-9)
+        depth = base_depth
+        while depth < 10:
+            side = 1 << depth
+            cells = (x * (side / span)).astype(np.int64) * side + (y * (side / span)).astype(np.int64)
+            if np.bincount(cells).max() <= max_occupancy:
+                break
+            depth += 1
+        fx, fy = far_field(x, y, span, depth, k * k)
+        gx, gy = near_field(x, y, span, depth, k * k)
+        disp = np.stack([fx + gx, fy + gy], axis=1)
+        # Attraction d^2 / k along every edge (the CSR lists both directions)
+        delta = pos[tails] - pos[indices]
+        pull = delta * (np.sqrt((delta ** 2).sum(axis=1)) / k)[:, None]
+        disp[:, 0] -= np.bincount(tails, weights=pull[:, 0], minlength=n)
+        disp[:, 1] -= np.bincount(tails, weights=pull[:, 1], minlength=n)
+        disp -= gravity * (pos - pos.mean(axis=0))
+        # Move at most 'temperature' per step, cooling linearly
+        length = np.maximum(np.sqrt((disp ** 2).sum(axis=1)), 1e-12)
+        pos += disp * (np.minimum(length, temperature) / length)[:, None]
+        temperature = 0.1 * (1 - (it + 1) / iterations) + 1e-4
+    return dict(zip(nodes, pos.tolist()))
+
+def plot_graph(G, bfs_paths=None, analysis=None, layout="spring", filename=None, label_limit=300):
     '''
     Visualize the graph, highlight BFS paths and isolated nodes.
 
     Arguments:
         G(networkx.Graph): input graph
-        bfs_Paths (dict): paths from BFS
+        bfs_Paths (dict): BFS results from multi_source_bfs
         analysis (dict): results from analyze 
+        layout (str): "spring" (nx.spring_layout), "bfs" (layered from the first BFS
+            source, or the highest-degree node) or "barnes_hut" (fast force layout)
+        filename (str): save the figure here instead of opening a window
+        label_limit (int): node labels and large markers are only drawn up to this many nodes
     '''
-    pos = nx.spring_layout(G, seed=42)
+    csr = graph_to_csr(G)
+    nodes = csr[0]
+    if layout == "bfs" and nodes:
+        root = next(iter(bfs_paths)) if bfs_paths else max(G.degree(), key=lambda x: x[1])[0]
+        pos = bfs_layout(G, root, csr)
+    elif layout == "barnes_hut":
+        pos = barnes_hut_layout(G, csr)
+    else:
+        pos = nx.spring_layout(G, seed=42)
 
     # Ensure every node has a position (isolates may be missing)
     for node in G.nodes():
         if node not in pos:
             pos[node] = (0, 0)
+    xy = np.array([pos[v] for v in nodes], dtype=float).reshape(-1, 2)
 
+    small = len(nodes) <= label_limit
     plt.figure(figsize=(8,8))
 
-    nx.draw_networkx(G, pos, node_color="lightblue", with_labels=True, node_size=500)
+    if small:
+        nx.draw_networkx(G, pos, node_color="lightblue", with_labels=True, node_size=500, width=1.0)
+    else: # one line collection and one scatter instead of an artist per edge
+        _, _, indptr, indices = csr
+        tails = np.repeat(np.arange(len(nodes)), np.diff(indptr))
+        keep = tails < indices # each undirected edge once
+        segments = np.stack([xy[tails[keep]], xy[indices[keep]]], axis=1)
+        ax = plt.gca()
+        ax.add_collection(LineCollection(segments, colors="black", linewidths=0.2, antialiased=False))
+        ax.scatter(xy[:, 0], xy[:, 1], s=10, c="lightblue", zorder=2)
+        ax.autoscale_view()
 
     # Highlight isolated nodes w/ red
     if analysis and analysis["isolated_nodes"]:
@@ -162,29 +1009,35 @@ def plot_graph(G, bfs_paths=None, analysis=None):
             G, pos,
             nodelist=analysis["isolated_nodes"],
             node_color="red",
-            node_size=600
+            node_size=600 if small else 20
         )
 
-    # Highlight BFS paths w/ colored edges per source
+    # Highlight BFS paths w/ colored edges per source: the BFS tree holds every path,
+    # and its segments come straight from the predecessor array as one line collection
     if bfs_paths:
         colors = ["green", "orange", "purple", "cyan"]
-        for i, (src, paths) in enumerate(bfs_paths.items()):
+        ax = plt.gca()
+        for i, (src, result) in enumerate(bfs_paths.items()):
             color = colors[i % len(colors)]
-            for path in paths.values():
-                edges = list(zip(path[:-1], path[1:]))
-                nx.draw_networkx_edges(G, pos, edgelist=edges, edge_color=color, width=2)
+            children = result.order[1:]
+            segments = np.stack([xy[result.pred[children]], xy[children]], axis=1)
+            ax.add_collection(LineCollection(segments, colors=color, linewidths=2 if small else 0.8))
     
     plt.title("Graph Visualization with BFS Layout & Analysis")
-    plt.show()
+    if filename: # headless: write the figure and free it
+        plt.savefig(filename, dpi=150)
+        plt.close()
+    else:
+        plt.show()
 
 # --output out_graph_file.gml
 def save_graph(G, filename):
-    '''Save graph to .gml file.'''
-    nx.write_gml(G, filename)
+    '''Save graph to .gml file (.gml.gz / .gml.bz2 are compressed).'''
+    write_gml(G, filename)
 
 def load_graph(filename):
-    '''Load graph from .gml files'''
-    return nx.read_gml(filename)
+    '''Load graph from .gml files (through the binary snapshot cache)'''
+    return read_gml_cached(filename)
 
 
 def main():
@@ -193,8 +1046,20 @@ def main():
     parser.add_argument("--input", type=str, help="Input .gml file") # Defines an optional argument --input that expects a string (a filename); --input my_graph.gml.
     parser.add_argument("--create_random_graph", nargs=2, metavar=("n", "c"), # Defines --create_random_graph which takes 2 arguments: n = number of nodes & c = parameter for probability formula; nargs=2 means it needs exactly 2 values; --create_random_graph 100 1.5
                         help="Generate Erdős–Rényi graph with n nodes and parameter c")
+    parser.add_argument("--seed", type=int, help="Random seed for --create_random_graph") # Makes generated graphs reproducible; --seed 42
+    parser.add_argument("--stream_output", type=str, help="Stream the random graph straight to a .gml or edge-list file") # Writes edges chunk by chunk without building the graph in memory; --stream_output big.edges
     parser.add_argument("--multi_BFS", nargs="+", help="Perform BFS from given source nodes") # Defines --multi_BFS which accepts 1 or more values and nargs="+" means "one or more arguments"; Example: --multi_BFS 0 2 7
+    parser.add_argument("--batched", action="store_true", help="Run all --multi_BFS sources in one bit-parallel pass") # Uses batched_bfs instead of one BFS per source; --batched
+    parser.add_argument("--edge_updates", type=str, help="File of 'add u v' / 'remove u v' lines applied to the --multi_BFS trees") # Repairs the BFS trees incrementally; --edge_updates changes.txt
+    parser.add_argument("--verify_updates", action="store_true", help="Check the updated BFS trees against a full recomputation") # --verify_updates
+    parser.add_argument("--path", nargs=2, metavar=("s", "t"), help="Shortest path from s to t by bidirectional BFS") # Point-to-point query; --path 0 17
+    parser.add_argument("--path_file", type=str, help="File of 's t' pairs to answer with bidirectional BFS") # Batch of queries sharing one adjacency; --path_file pairs.txt
     parser.add_argument("--analyze", action="store_true", help="Analyze graph structure") # A flag argument (boolean switch) and if present, it sets args.analyze = True; --analyze
+    parser.add_argument("--apl_samples", type=int, help="Estimate average shortest path length from this many BFS sources") # Sampled instead of exact; --apl_samples 200
+    parser.add_argument("--apl_time", type=float, help="Time budget in seconds for the sampled average shortest path length") # Stops sampling after this many seconds; --apl_time 30
+    parser.add_argument("--workers", type=int, help="Worker processes for the exact average shortest path length") # Defaults to all cores; --workers 8
+    parser.add_argument("--layout", choices=["spring", "bfs", "barnes_hut"], default="spring", help="Layout used by --plot") # bfs and barnes_hut scale to large graphs; --layout barnes_hut
+    parser.add_argument("--plot_file", type=str, help="Save the plot to this image file instead of showing it") # Headless plotting; --plot_file graph.png
     parser.add_argument("--plot", action="store_true", help="Plot graph") # Another flag. If used, program plots the graph; --plot.
     parser.add_argument("--output", type=str, help="Output .gml file") # Defines an optional argument --output that expects a string (a filename); --output final_graph.gml 
 
@@ -205,7 +1070,11 @@ def main():
     if args.create_random_graph:
         n = int(args.create_random_graph[0]) # the number of nodes (converted from string to int).
         c = float(args.create_random_graph[1]) # the probability parameter (converted to float).
-        G = create_random_graph(n, c)
+        if args.stream_output: # Huge graphs go straight to disk; nothing else can run without the graph in memory.
+            m = stream_random_graph(n, c, args.stream_output, seed=args.seed)
+            print(f"Wrote {n} nodes and {m} edges to {args.stream_output}")
+            return
+        G = create_random_graph(n, c, seed=args.seed)
     elif args.input: # If no random graph was requested, but --input was given:
         G = load_graph(args.input) # Loads an existing .gml graph file from disk using load_graph().
     else:
@@ -215,19 +1084,44 @@ def main():
     # BFS
     bfs_paths = None # Initializes as empty(None)
     if args.multi_BFS: # If user passed --multi_BFS with node IDs:
-        bfs_paths = multi_source_bfs(G, args.multi_BFS) # Calls multi_source_bfs(G, args.multi_BFS) which computes all shortest paths and stores results in bfs_paths (a dictionary of paths).
+        bfs_paths = multi_source_bfs(G, args.multi_BFS, batched=args.batched) # Calls multi_source_bfs(G, args.multi_BFS) which computes all shortest paths and stores results in bfs_paths (a dictionary of BFS results).
+        print_bfs_summary(bfs_paths) # Prints reach counts and a few sample paths per source.
+
+    # Edge updates on the BFS trees
+    if args.edge_updates and bfs_paths: # The graph changes; only the affected part of each tree is repaired
+        dynamic = DynamicBFS(G, bfs_paths)
+        updates = read_updates(args.edge_updates)
+        t0 = time.perf_counter()
+        changed = dynamic.apply(updates)
+        elapsed = time.perf_counter() - t0
+        print(f"\n--- Edge updates ({len(updates)} applied in {elapsed:.4f}s) ---")
+        for src, targets in changed.items():
+            print(f"source {src}: {len(targets)} targets changed distance {sorted(targets)[:10]}")
+        bfs_paths = {src: dynamic.result(src) for src in dynamic.sources}
+        if args.verify_updates:
+            problems = dynamic.verify()
+            print("verify: OK (matches full recomputation)" if not problems else f"verify: {len(problems)} mismatches")
+            for src, node, problem in problems[:10]:
+                print(f"  source {src}, node {node}: {problem}")
+
+    # Point-to-point shortest paths
+    if args.path or args.path_file:
+        pairs = [tuple(args.path)] if args.path else []
+        if args.path_file:
+            pairs += read_pairs(args.path_file)
+        run_path_queries(G, pairs) # one adjacency, reused by every query
 
     # Analysis
     results = None
     if args.analyze: # If --analyze flag is set:
-        results = analyze_graph(G) # Calls analyze_graph(G) which runs connected components, cycle detection, density, etc.
+        results = analyze_graph(G, samples=args.apl_samples, time_budget=args.apl_time, seed=args.seed, workers=args.workers) # Calls analyze_graph(G) which runs connected components, cycle detection, density, etc.
         print("\n--- Graph Analysis ---")
         for k, v in results.items():
             print(f"{k}: {v}")
 
     # Plotting
-    if args.plot: # If --plot is present:
-        plot_graph(G, bfs_paths=bfs_paths, analysis=results)
+    if args.plot or args.plot_file: # If --plot (or --plot_file) is present:
+        plot_graph(G, bfs_paths=bfs_paths, analysis=results, layout=args.layout, filename=args.plot_file)
         # The graph G
         # The BFS paths (if any were computed)
         # The analysis results (if computed)
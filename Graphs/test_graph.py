@@ -0,0 +1,68 @@
+import os
+import sys
+
+import networkx as nx
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import graph
+from graph_csr import graph_to_csr
+
+
+def random_components(seed):
+    # Two random components plus an isolated node, with string labels like the GML graphs
+    G = nx.disjoint_union_all([nx.gnp_random_graph(60, 0.05, seed=seed), nx.gnp_random_graph(50, 0.08, seed=seed + 1), nx.empty_graph(1)])
+    return nx.relabel_nodes(G, str)
+
+
+def check_tree(G, result, fresh):
+    assert np.array_equal(result.dist, fresh.dist)
+    for i in np.flatnonzero(result.dist > 0).tolist():   # any neighbor one level closer is a valid parent
+        p = int(result.pred[i])
+        assert G.has_edge(result.nodes[p], result.nodes[i]) and result.dist[p] == result.dist[i] - 1
+    assert np.all(result.pred[result.dist <= 0] == -1)
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_batched_bfs_matches_bfs_component(seed):
+    G = random_components(seed)
+    csr = graph_to_csr(G)
+    sources = [str(i) for i in np.random.default_rng(seed).choice(len(G), 70, replace=False)] + ["110"]   # more than one word of bits
+    multi = graph.batched_bfs(G, sources, csr)
+    for s in sources:
+        check_tree(G, multi.result(s), graph.bfs_component(G, s, csr))
+
+
+@pytest.mark.parametrize("seed", [4, 5])
+def test_multi_source_bfs_batched(seed):
+    G = random_components(seed)
+    sources = ["0", "59", "60", "109", "110"]   # nodes of both random parts and the isolated node
+    plain = graph.multi_source_bfs(G, sources)
+    batched = graph.multi_source_bfs(G, sources, batched=True)
+    assert list(batched) == sources
+    for s in sources:
+        check_tree(G, batched[s], plain[s])
+        assert [batched[s].distance(t) for t in G] == [plain[s].distance(t) for t in G]
+        assert all(len(batched[s].path(t)) == plain[s].distance(t) + 1 for t in plain[s].targets())
+
+
+@pytest.mark.parametrize("seed", [6, 7, 8])
+def test_dynamic_bfs_random_updates(seed):
+    rng = np.random.default_rng(seed)
+    G = random_components(seed)
+    sources = ["0", "60", "110"]
+    dyn = graph.DynamicBFS(G, graph.multi_source_bfs(G, sources))
+    for step in range(300):
+        edges = list(G.edges())
+        if edges and rng.random() < 0.5:
+            u, v = edges[rng.integers(len(edges))]
+            dyn.remove_edge(u, v)
+        else:   # a node past the original ones now and then, so new nodes are covered too
+            u, v = (str(x) for x in rng.integers(0, 115, size=2))
+            dyn.add_edge(u, v)
+        assert dyn.verify() == []
+        csr = graph_to_csr(G)
+        for s in sources:
+            kept, fresh = dyn.result(s), graph.bfs_component(G, s, csr)
+            assert {t: kept.distance(t) for t in G} == {t: fresh.distance(t) for t in G}
@@ -24,12 +24,16 @@ from urllib.parse import urljoin, urlparse, urldefrag
 from urllib import robotparser
 from bs4 import BeautifulSoup
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Common")) # shared graph modules
+from graph_snapshot import read_gml_cached
+from gml_stream import write_gml
+
 
 def load_gml(path: str): # Load a graph from a GML file
     if not os.path.exists(path):    # Check if the file exists before attempting to load it
         fail(f"File not found: {path}") 
     try: 
-        G = nx.read_gml(path)   # Attempt to read the GML file using NetworkX's read_gml function
+        G = read_gml_cached(path)   # Attempt to read the GML file using NetworkX's read_gml function (or its binary snapshot from an earlier run)
     except Exception as e:  # Catch any exceptions that occur during the loading process and print an error message
         fail(f"Could not load GML: {e}")    
     if isinstance(G, nx.MultiDiGraph):  # If the loaded graph is a MultiDiGraph, convert it to a DiGraph by collapsing multiple edges into single edges
@@ -41,7 +45,7 @@ def load_gml(path: str): # Load a graph from a GML file
 # Save a graph to a GML file
 def save_gml(G: nx.DiGraph, path: str): 
     try:
-        nx.write_gml(G, path)   # Attempt to write the graph to a GML file using NetworkX's write_gml function
+        write_gml(G, path)   # Attempt to write the graph to a GML file, record by record (same text as NetworkX's write_gml)
     except Exception as e:  # Catch any exceptions that occur during the saving process and print an error message
         fail(f"Failed to write GML: {e}")
 
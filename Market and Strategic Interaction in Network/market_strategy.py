@@ -11,17 +11,22 @@ Citation(s):
 """
 
 import argparse
+import os
 import sys
 import math
 import networkx as nx
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Common")) # shared graph modules
+from graph_snapshot import read_gml_cached
+
 def read_graph(filename):
     """
     Load and read a GML file using NetworkX, validates nodes 'id' (label=None) so 'label' attribute is not required, and exits cleanly if the file is missing or malformed.
+    Later runs load the binary snapshot written next to the file instead of re-parsing it.
     """
     try:
-        G = nx.read_gml(filename, label=None)
+        G = read_gml_cached(filename, label=None)
     except FileNotFoundError:
         print(f"[ERROR] File '{filename}' not found.")
         sys.exit(1)
@@ -10,180 +10,925 @@ Citation(s):
 3) Tushar Aggarwal. NetworkX: A Comprehensive Guide to Mastering Network Analysis with Python. Medium, October 4, 2023. Available at: medium.com/@tushar_aggarwal/networkx-a-comprehensive-guide-to-mastering-network-analysis-with-python-fd7e5195f6a0 
 4) pandas Development Team. pandas.read_csv — pandas 2.3.3 Documentation. Available at: pandas.pydata.org/docs/reference/api/pandas.read_csv.html 
 5) Matplotlib Animation: FuncAnimation Class in Python. GeeksforGeeks. Available at: geeksforgeeks.org/python/matplotlib-animation-funcanimation-class-in-python/ 
+6) Blondel, V. D., Guillaume, J.-L., Lambiotte, R., & Lefebvre, E. (2008). Fast unfolding of communities in large networks. Journal of Statistical Mechanics, P10008.
 '''
 
 # Import necessary libraries
 import argparse
+import os
 import random
+import sys
 import csv
+import contextlib
+import heapq
+import itertools
+from concurrent.futures import ProcessPoolExecutor
 import networkx as nx
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy import stats
+import pandas as pd
+from scipy import sparse, stats
+from scipy.sparse import csgraph
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Common")) # shared graph modules
+from graph_csr import graph_to_csr, csr_neighbors
+from path_stats import path_statistics
+from percolation import percolation_curves
+from permutation import permutation_test
+from betweenness import edge_csr, betweenness_chunks, resolve_workers
+from graph_snapshot import read_gml_cached
+from gml_stream import write_gml
+from graph_columns import GraphColumns
 
 # Utility functions
 def load_graph(file_path): # Load a graph from a .gml file.
-    G = nx.read_gml(file_path)
+    G = read_gml_cached(file_path)  # Parses the GML once, later runs map the binary snapshot
     if not nx.is_weighted(G):
         for u, v in G.edges():
             G[u][v]['weight'] = 1.0
     return G
 
 
-def save_graph(G, path): # Export graph to a .gml file.
-    nx.write_gml(G, path)
+def save_graph(G, path, store=None): # Export graph to a .gml file (the store's columns are written into the graph first).
+    if store is not None:
+        store.sync()
+    write_gml(G, path) # Streams the records; a .gz or .bz2 path is compressed
     print(f"[INFO] Graph exported to {path}")
 
 
-def compute_metrics(G): # Compute clustering coefficient for each node and store as attribute.
-    cc = nx.clustering(G)
-    nx.set_node_attributes(G, cc, 'clustering')
-    for u, v in G.edges(): 
-        neigh_u, neigh_v = set(G.neighbors(u)), set(G.neighbors(v))
-        inter = len(neigh_u & neigh_v)
-        denom = len(neigh_u | neigh_v) or 1
-        G[u][v]['overlap'] = inter / denom
-
-
-def partition_graph(G, n): # Partition graph into n communities using Girvan-Newman.
-    comp_gen = nx.community.girvan_newman(G)
-    for i, communities in enumerate(comp_gen):  # Get first n partitions
-        if i == n - 1:  
+def attribute_store(G, store=None): # The caller's column store, or a temporary one that the function syncs itself; None for multigraphs (attribute dicts only).
+    if store is not None:
+        return store, False
+    if G.is_multigraph():
+        return None, False
+    return GraphColumns(G), True
+
+
+def masked_product(A, B, indptr, indices, chunk_work=1 << 24): # Entries of A·B at the positions of the CSR pattern (indptr, indices), computed in bounded row chunks.
+    n = A.shape[0]
+    tails = np.repeat(np.arange(n), np.diff(indptr))
+    # Rows are multiplied in chunks whose product size (sum of the B-row lengths they touch) stays under chunk_work
+    touched = np.zeros(A.nnz + 1, dtype=np.int64)
+    np.cumsum(np.diff(B.indptr)[A.indices], out=touched[1:])
+    chunk_ids = touched[A.indptr[1:]] // chunk_work
+    bounds = np.flatnonzero(np.diff(chunk_ids)) + 1
+    out = np.zeros(len(indices), dtype=np.result_type(A.dtype, B.dtype))
+    for r0, r1 in zip(np.r_[0, bounds], np.r_[bounds, n]):
+        if r0 == r1:
+            continue
+        P = A[r0:r1] @ B    # only the entries that sit on the pattern are kept
+        P.sort_indices()
+        if not P.nnz:
+            continue
+        keys = np.repeat(np.arange(r1 - r0), np.diff(P.indptr)) * B.shape[1] + P.indices
+        lo, hi = indptr[r0], indptr[r1]
+        want = (tails[lo:hi] - r0) * B.shape[1] + indices[lo:hi]
+        pos = np.minimum(np.searchsorted(keys, want), len(keys) - 1)
+        out[lo:hi] = np.where(keys[pos] == want, P.data[pos], 0)
+    return out
+
+
+def triangle_counts(G, chunk_work=1 << 24, csr=None): # Common-neighbor count per CSR entry and triangle count per node from one masked sparse A·A pass.
+    nodes, _, indptr, indices = csr or graph_to_csr(G)
+    n, m = len(nodes), len(indices)
+    A = sparse.csr_matrix((np.ones(m, dtype=np.int64), indices, indptr), shape=(n, n))
+    tails = np.repeat(np.arange(n), np.diff(indptr))
+    loop = A.diagonal() > 0 # self-loops sit in the neighbor sets but never close a triangle
+    common = masked_product(A, A, indptr, indices, chunk_work)  # |N(u) & N(v)| for every CSR entry (u, v)
+
+    proper = tails != indices
+    shared = common - loop[tails] - loop[indices]   # common neighbors other than the endpoints themselves
+    triangles = np.bincount(tails[proper], weights=shared[proper], minlength=n) / 2
+    return nodes, indptr, tails, indices, loop, common, triangles
+
+
+def metric_arrays(G, chunk_work=1 << 24, csr=None): # Clustering per node and neighborhood overlap per CSR entry from triangle_counts.
+    nodes, indptr, tails, indices, loop, common, triangles = triangle_counts(G, chunk_work, csr)
+    n, m = len(nodes), len(indices)
+    deg = np.diff(indptr)
+    k = deg - loop
+    clustering = np.divide(2 * triangles, k * (k - 1), out=np.zeros(n), where=k > 1)
+    union = deg[tails] + deg[indices] - common
+    overlap = np.divide(common, union, out=np.zeros(m), where=union > 0)
+    return nodes, tails, indices, clustering, overlap   # overlap is per CSR entry, so each edge appears in both directions
+
+
+def compute_metrics(G, store=None): # Compute clustering coefficient for each node and neighborhood overlap for each edge, and store them as attributes.
+    store, own = attribute_store(G, store)
+    if store is None:   # multigraph: attribute dicts only
+        cc = nx.clustering(G)
+        nx.set_node_attributes(G, cc, 'clustering')
+        for u, v in G.edges():
+            neigh_u, neigh_v = set(G.neighbors(u)), set(G.neighbors(v))
+            G[u][v]['overlap'] = len(neigh_u & neigh_v) / (len(neigh_u | neigh_v) or 1)
+        return np.array([cc[v] for v in G]), np.array([G[u][v]['overlap'] for u, v in G.edges()])
+
+    if G.is_directed():    # Directed clustering has its own definition; keep the NetworkX version there
+        cc = nx.clustering(G)
+        clustering = np.array([cc[u] for u in store.nodes], dtype=float)
+        neigh = [set(G.neighbors(u)) for u in store.nodes]
+        overlap = np.array([len(neigh[a] & neigh[b]) / (len(neigh[a] | neigh[b]) or 1)
+                            for a, b in zip(store.tails.tolist(), store.heads.tolist())], dtype=float)
+    else:
+        _, _, _, clustering, entry_overlap = metric_arrays(G, csr=(store.nodes, store.index, store.indptr, store.indices))
+        overlap = np.empty(len(store.tails))
+        overlap[store.entry_edge] = entry_overlap   # both entries of an edge hold the same value
+    store.set_node('clustering', clustering)
+    store.set_edge('overlap', overlap)
+    if own:
+        store.sync()
+    return clustering, overlap
+
+
+class MetricTracker: # Keeps the 'clustering' and 'overlap' attributes of an undirected simple graph current while edges are added and removed, in O(deg u + deg v) per update.
+    def __init__(self, G):
+        if G.is_directed() or G.is_multigraph():
+            raise ValueError("MetricTracker needs an undirected simple graph")
+        self.G = G
+        nodes, _, tails, heads, loop, common, triangles = triangle_counts(G)
+        self.common = {u: {} for u in nodes}    # common[u][v] = |N(u) & N(v)| for every edge but self-loops, stored in both directions
+        for a, b, c in zip(tails.tolist(), heads.tolist(), common.tolist()):
+            if a != b:
+                self.common[nodes[a]][nodes[b]] = c
+        self.loops = {nodes[i] for i in np.flatnonzero(loop).tolist()}
+        self.triangles = dict(zip(nodes, triangles.tolist()))
+        self.triangle_total = int(round(triangles.sum() / 3))
+        for u in nodes:     # start from fresh values, then keep running sums for summary()
+            G.nodes[u]['clustering'] = 0.0
+        for u, v in G.edges():
+            G[u][v]['overlap'] = 0.0
+        self.clustering_sum = self.overlap_sum = 0.0
+        for u in nodes:
+            self.set_clustering(u)
+            self.set_overlaps(u)
+
+    def degree(self, u): # |N(u)|, a self-loop included; cheaper than a NetworkX view
+        return len(self.common[u]) + (u in self.loops)
+
+    def set_clustering(self, u): # Recompute one node's clustering from its triangle count.
+        k = len(self.common[u])
+        value = 2 * self.triangles[u] / (k * (k - 1)) if k > 1 else 0.0
+        attrs = self.G.nodes[u]
+        self.clustering_sum += value - attrs.get('clustering', 0.0)
+        attrs['clustering'] = value
+
+    def set_overlaps(self, u): # Recompute |N(u) & N(x)| / |N(u) | N(x)| for every edge (u, x) from the common-neighbor counts.
+        common, du = self.common[u], self.degree(u)
+        delta = 0.0     # an edge seen again from its other end adds nothing
+        for x, data in self.G.adj[u].items():
+            if x == u:  # N(u) & N(u) = N(u) | N(u)
+                value = 1.0
+            else:
+                c = common[x]
+                union = du + len(self.common[x]) + (x in self.loops) - c
+                value = c / union if union else 0.0
+            delta += value - data.get('overlap', 0.0)
+            data['overlap'] = value
+        self.overlap_sum += delta
+
+    def add_node(self, u):
+        if u not in self.common:
+            self.G.add_node(u)
+            self.common[u], self.triangles[u] = {}, 0
+            self.set_clustering(u)
+
+    def update(self, u, v, sign): # Shared bookkeeping of add_edge (sign=1, after adding) and remove_edge (sign=-1, after removing).
+        common = self.common
+        if u == v:  # a self-loop puts u in N(u): one more common neighbor with every neighbor of u
+            for x in common[u]:
+                common[u][x] += sign
+                common[x][u] += sign
+        else:
+            small, large = (common[u], common[v]) if len(common[u]) <= len(common[v]) else (common[v], common[u])
+            shared = [w for w in small if w in large and w != u and w != v]   # the triangles closed or opened by (u, v)
+            self.triangles[u] += sign * len(shared)
+            self.triangles[v] += sign * len(shared)
+            self.triangle_total += sign * len(shared)
+            for w in shared:
+                self.triangles[w] += sign
+                common[u][w] += sign
+                common[w][u] += sign
+                common[v][w] += sign
+                common[w][v] += sign
+                self.set_clustering(w)
+            if sign > 0:
+                common[u][v] = common[v][u] = len(shared) + (u in self.loops) + (v in self.loops)
+        for a in {u, v}:    # degrees changed: every edge at u or v has a new union
+            self.set_clustering(a)
+            self.set_overlaps(a)
+
+    def add_edge(self, u, v): # Add (u, v) unless present; returns whether it was new.
+        self.add_node(u)
+        self.add_node(v)
+        if v in self.common[u] or (u == v and u in self.loops):
+            return False
+        self.G.add_edge(u, v)
+        if u == v:
+            self.loops.add(u)
+        self.update(u, v, 1)
+        return True
+
+    def remove_edge(self, u, v): # Remove (u, v) if present; returns whether it was there.
+        if not self.G.has_edge(u, v):
+            return False
+        self.overlap_sum -= self.G[u][v].get('overlap', 0.0)
+        self.G.remove_edge(u, v)
+        if u == v:
+            self.loops.discard(u)
+        else:
+            del self.common[u][v], self.common[v][u]
+        self.update(u, v, -1)
+        return True
+
+    def summary(self): # Average clustering, average overlap and triangle count of the current graph.
+        n, m = self.G.number_of_nodes(), self.G.number_of_edges()
+        return {'avg_clustering': self.clustering_sum / n if n else 0.0,
+                'avg_overlap': self.overlap_sum / m if m else 0.0,
+                'triangles': self.triangle_total}
+
+
+def weighted_adjacency(G, store=None): # Symmetric sparse adjacency with edge weights; a self-loop sits twice on the diagonal so row sums are weighted degrees.
+    if store is not None:
+        nodes, indptr, indices = store.nodes, store.indptr, store.indices
+        weights = store.entries('weight', 1.0)
+    else:
+        nodes, _, indptr, indices = graph_to_csr(G)
+        weights = np.fromiter((float(d.get('weight', 1.0)) for u in nodes for d in G[u].values()), dtype=float, count=len(indices))
+    n = len(nodes)
+    A = sparse.csr_matrix((weights, indices, indptr), shape=(n, n))
+    A = (A + sparse.diags(A.diagonal())).tocsr()
+    A.sort_indices()
+    return nodes, A
+
+
+def modularity(A, labels, resolution=1.0): # Newman modularity Q of a labeling on the adjacency from weighted_adjacency.
+    m2 = A.sum()
+    if m2 == 0:
+        return 0.0
+    coo = A.tocoo()
+    internal = coo.data[labels[coo.row] == labels[coo.col]].sum()
+    tot = np.bincount(labels, weights=np.asarray(A.sum(axis=1)).ravel())
+    return float(internal / m2 - resolution * ((tot / m2) ** 2).sum())
+
+
+def community_matrix(A, labels): # Collapse every community into one node: C = P^T A P.
+    k = int(labels.max()) + 1 if len(labels) else 0
+    P = sparse.csr_matrix((np.ones(len(labels)), (np.arange(len(labels)), labels)), shape=(len(labels), k))
+    return (P.T @ A @ P).tocsr()
+
+
+def louvain(A, seed=None, resolution=1.0, min_gain=1e-6): # Louvain modularity optimization: local moving over CSR rows, then aggregation with sparse products, until a level gains less than min_gain.
+    rng = np.random.default_rng(seed)
+    membership = np.arange(A.shape[0])
+    m2 = A.sum()
+    if m2 == 0:
+        return membership
+    while True:
+        size = A.shape[0]
+        indptr, indices, data = A.indptr.tolist(), A.indices.tolist(), A.data.tolist()
+        k_list = np.asarray(A.sum(axis=1)).ravel().tolist()
+        comm = list(range(size))
+        tot = list(k_list)  # total degree per community
+        level_gain = 0.0
+        while True:     # sweeps over the nodes in random order; stop once a sweep barely helps
+            sweep_gain = 0.0
+            for i in rng.permutation(size).tolist():
+                ki, ci = k_list[i], comm[i]
+                links = {}  # weight from i to each neighboring community (self-loop excluded)
+                for p in range(indptr[i], indptr[i + 1]):
+                    j = indices[p]
+                    if j != i:
+                        links[comm[j]] = links.get(comm[j], 0.0) + data[p]
+                tot[ci] -= ki
+                stay = links.get(ci, 0.0) - resolution * tot[ci] * ki / m2
+                best, best_gain = ci, stay
+                for c, w in links.items():
+                    gain = w - resolution * tot[c] * ki / m2
+                    if gain > best_gain:
+                        best, best_gain = c, gain
+                tot[best] += ki
+                if best != ci:
+                    comm[i] = best
+                    sweep_gain += 2 * (best_gain - stay) / m2  # modularity gained by this move
+            level_gain += sweep_gain
+            if sweep_gain < min_gain:
+                break
+        if level_gain < min_gain:
+            return membership
+        labels = np.unique(np.array(comm), return_inverse=True)[1]
+        membership = labels[membership]
+        A = community_matrix(A, labels)
+
+
+def label_propagation(A, seed=None, max_iter=100): # Weighted label propagation; a random half of the nodes adopts its heaviest neighboring label each round, ties keep the current label.
+    rng = np.random.default_rng(seed)
+    n = A.shape[0]
+    labels = np.arange(n)
+    coo = A.tocoo()
+    off = coo.row != coo.col
+    tails, heads, w = coo.row[off], coo.col[off], coo.data[off]
+    if not len(tails):
+        return labels   # no edges between distinct nodes: every node is its own community
+    quiet = 0
+    for _ in range(max_iter):
+        keys, inverse = np.unique(tails.astype(np.int64) * n + labels[heads], return_inverse=True)
+        score = np.bincount(inverse, weights=w)
+        node, label = keys // n, keys % n
+        noise = rng.random(len(keys)) * 1e-9 * (score.max() if len(score) else 1)
+        order = np.lexsort((score + noise, node))
+        last = np.r_[np.flatnonzero(np.diff(node[order])), len(order) - 1]   # heaviest label per node
+        top_node, top_label, top_score = node[order][last], label[order][last], score[order][last]
+        current = np.zeros(n)
+        mine = label == labels[node]
+        current[node[mine]] = score[mine]
+        want = top_label != labels[top_node]
+        want &= top_score > current[top_node] + 1e-12  # a tie keeps the current label
+        want &= rng.random(len(top_node)) < 0.5
+        if not want.any():
+            quiet += 1
+            if quiet >= 3:
+                break
+            continue
+        quiet = 0
+        labels[top_node[want]] = top_label[want]
+    return np.unique(labels, return_inverse=True)[1]
+
+
+def merge_communities(A, labels, n): # Greedily merge the pair of communities with the best modularity gain (heap with lazy updates) until only n remain.
+    C = community_matrix(A, labels)
+    m2 = A.sum() or 1.0
+    tot = np.asarray(C.sum(axis=1)).ravel().tolist()
+    k = len(tot)
+    links = [dict() for _ in range(k)]  # weight between neighboring communities
+    coo = C.tocoo()
+    for i, j, w in zip(coo.row.tolist(), coo.col.tolist(), coo.data.tolist()):
+        if i != j:
+            links[i][j] = w
+    version = [0] * k
+    def entry(i, j):
+        return (-(links[i][j] / m2 - tot[i] * tot[j] / m2 ** 2), i, j, version[i], version[j])
+    heap = [entry(i, j) for i in range(k) for j in links[i] if i < j]
+    heapq.heapify(heap)
+    parent = list(range(k))
+    alive = k
+    while alive > n and heap:
+        _, i, j, vi, vj = heapq.heappop(heap)
+        if vi != version[i] or vj != version[j] or parent[i] != i or parent[j] != j:
+            continue    # stale: one side changed since this entry was pushed
+        parent[j] = i
+        alive -= 1
+        tot[i] += tot[j]
+        version[i] += 1
+        for x, w in links[j].items():
+            del links[x][j]
+            if x != i:
+                links[i][x] = links[i].get(x, 0.0) + w
+                links[x][i] = links[i][x]
+        links[j] = {}
+        for x in links[i]:  # every pair with i has a new gain
+            heapq.heappush(heap, entry(i, x) if i < x else entry(x, i))
+    if alive > n:   # no edges left between communities: join the lightest ones
+        light = [(tot[c], c) for c in range(k) if parent[c] == c]
+        heapq.heapify(light)
+        while alive > n:
+            ta, a = heapq.heappop(light)
+            tb, b = heapq.heappop(light)
+            parent[b] = a
+            alive -= 1
+            heapq.heappush(light, (ta + tb, a))
+    root = np.array(parent)
+    while True:    # follow merges to the surviving community
+        nxt = root[root]
+        if np.array_equal(nxt, root):
             break
-    parts = [list(c) for c in communities]  
-    for idx, part in enumerate(parts):      # Assign community ID to nodes
-        for node in part:   
-            G.nodes[node]['community'] = idx
-    print(f"[INFO] Partitioned graph into {len(parts)} communities.")
-
-
-def simulate_failures(G, k): # Randomly remove k edges and analyze connectivity, shortest path, and betweenness centrality.
+        root = nxt
+    return np.unique(root[labels], return_inverse=True)[1]
+
+
+def split_communities(A, labels, n, detect, seed=None): # Split the largest community until there are n (detection on its subgraph, else a BFS-order halving).
+    labels = labels.copy()
+    while labels.max() + 1 < n:
+        sizes = np.bincount(labels)
+        big = int(np.argmax(sizes))
+        if sizes[big] < 2:
+            break   # every community is a single node
+        members = np.flatnonzero(labels == big)
+        sub = A[members][:, members]
+        parts = detect(sub, seed)
+        if parts.max() == 0:    # detection keeps it whole: cut it in two along a BFS order
+            order = csgraph.breadth_first_order(sub, 0, directed=False, return_predecessors=False)
+            rest = np.setdiff1d(np.arange(len(members)), order)
+            order = np.r_[order, rest]
+            parts = np.zeros(len(members), dtype=np.int64)
+            parts[order[len(order) // 2:]] = 1
+        labels[members[parts > 0]] = labels.max() + parts[parts > 0]
+        labels = np.unique(labels, return_inverse=True)[1]
+    if labels.max() + 1 > n:
+        labels = merge_communities(A, labels, n)
+    return labels
+
+
+COMMUNITY_METHODS = {'louvain': louvain, 'label_propagation': label_propagation}
+
+
+def partition_graph(G, n, method='louvain', seed=None, store=None): # Partition graph into n communities (Louvain or label propagation, adjusted to n by merging/splitting; or Girvan-Newman).
+    if method == 'girvan_newman':
+        comp_gen = nx.community.girvan_newman(G)
+        communities = [set(c) for c in nx.connected_components(G)]
+        if len(communities) < n:
+            for communities in comp_gen:  # Split until n communities
+                if len(communities) >= n:
+                    break
+        parts = [list(c) for c in communities]
+        Q = nx.community.modularity(G, parts) if G.number_of_edges() else 0.0
+    else:
+        nodes, A = weighted_adjacency(G, store)
+        detect = COMMUNITY_METHODS[method]
+        labels = detect(A, seed) if len(nodes) else np.zeros(0, dtype=np.int64)
+        if n and len(nodes):
+            if labels.max() + 1 > n:
+                labels = merge_communities(A, labels, n)
+            elif labels.max() + 1 < n:
+                labels = split_communities(A, labels, min(n, len(nodes)), detect, seed)
+        Q = modularity(A, labels)
+        parts = [[] for _ in range(int(labels.max()) + 1 if len(labels) else 0)]
+        for node, c in zip(nodes, labels.tolist()):
+            parts[c].append(node)
+    store, own = attribute_store(G, store)
+    if store is None:
+        for idx, part in enumerate(parts):      # Assign community ID to nodes
+            for node in part:
+                G.nodes[node]['community'] = idx
+    else:
+        community = np.zeros(len(store.nodes), dtype=np.int64)
+        for idx, part in enumerate(parts):
+            community[[store.index[node] for node in part]] = idx
+        store.set_node('community', community)
+        if own:
+            store.sync()
+    print(f"[INFO] Partitioned graph into {len(parts)} communities ({method}, modularity {Q:.4f}).")
+    return parts, Q
+
+
+def simulate_failures(G, k, workers=None): # Randomly remove k edges and analyze connectivity, shortest path, and betweenness centrality.
     k = min(k, len(G.edges()))
     edges = random.sample(list(G.edges()), k)
     G.remove_edges_from(edges)
     comps = nx.number_connected_components(G)
-    if comps > 1:   # If disconnected, average shortest path is undefined
+    if comps > 1 or len(G) == 0:   # If disconnected, average shortest path is undefined
         avg_path = 0.0
-    else:   
-        try:    
-            avg_path = nx.average_shortest_path_length(G)
-        except nx.NetworkXError:    # Handle case of disconnected graph
-            avg_path = 0.0
+    else:   # Exact all-pairs BFS spread over worker processes
+        _, _, indptr, indices = graph_to_csr(G)
+        avg_path = path_statistics(indptr, indices, workers=workers)["avg_shortest_path_len"]
     print(f"[INFO] Failures: removed {k} edges\n       Components: {comps}\n       Avg shortest path: {avg_path:.3f}")  # Compute betweenness centrality
 
 
-def robustness_check(G, k, trials=5): # Perform repeated random edge removals (k edges per trial) and report average connectivity and component sizes.
+def robustness_check(G, k, trials=5, workers=None): # Perform repeated random edge removals (k edges per trial) and report average connectivity and component sizes.
     comp_counts, max_sizes = [], []
     for _ in range(trials):
         G_copy = G.copy()
-        simulate_failures(G_copy, k)
+        simulate_failures(G_copy, k, workers)
         comps = list(nx.connected_components(G_copy))
         comp_counts.append(len(comps))
         max_sizes.append(max(len(c) for c in comps))
     print(f"[INFO] Robustness: Avg comps={np.mean(comp_counts):.2f}, Max size={np.max(max_sizes)}") # Average number of components and max component size
 
 
-def verify_homophily(G): # Run a t-test on node attributes (color/group) to test for homophily.
-    attrs = [G.nodes[n].get('group', random.randint(0, 1)) for n in G.nodes()]
-    groups = list(set(attrs))
-    if len(groups) < 2: # Ensure there is less than 2 groups
+def robustness_curve(G, trials=5, seed=None, workers=None, path=None, confidence=0.95): # Newman-Ziff percolation: component count and giant size for every number k of removed edges, with confidence bands over the trials.
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = np.array([(index[u], index[v]) for u, v in G.edges()], dtype=np.int64).reshape(-1, 2)
+    runs = percolation_curves(len(nodes), edges[:, 0], edges[:, 1], trials, seed, workers)
+    m = len(edges)
+    curve = {'k': np.arange(m + 1)}   # k edges removed = m - k edges present, so the columns are reversed
+    t = stats.t.ppf(0.5 + confidence / 2, trials - 1) if trials > 1 else 0.0
+    for key in ('components', 'giant'):
+        values = runs[key][:, ::-1].astype(float)
+        mean = values.mean(axis=0)
+        half = t * values.std(axis=0, ddof=1) / np.sqrt(trials) if trials > 1 else np.zeros(m + 1)
+        curve[key] = mean
+        curve[key + '_low'], curve[key + '_high'] = mean - half, mean + half
+    if path:
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            columns = ['k', 'components', 'components_low', 'components_high', 'giant', 'giant_low', 'giant_high']
+            writer.writerow(columns)
+            writer.writerows(zip(*(curve[c].tolist() for c in columns)))
+    below = curve['giant'] < len(nodes) / 2    # first k where the giant component holds under half the nodes
+    if below.any():
+        print(f"[INFO] Robustness curve: {trials} trials, giant component below half the nodes after {int(np.argmax(below))} of {m} edges removed.")
+    else:
+        print(f"[INFO] Robustness curve: {trials} trials, giant component keeps half the nodes with all {m} edges removed.")
+    if path:
+        print(f"[INFO] Robustness curve written to {path}")
+    curve['seeds'] = runs['seeds']
+    return curve
+
+
+def targeted_attack(G, k, target='edge', batch=1, samples=64, recompute=1, seed=None, workers=None): # Remove the k highest-betweenness edges (or nodes) in batches, with sampled betweenness recomputed every 'recompute' batches, and report connectivity and average path length.
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    n = len(nodes)
+    edges = np.array([(index[u], index[v]) for u, v in G.edges()], dtype=np.int64).reshape(-1, 2)
+    tails, heads = edges[:, 0], edges[:, 1]
+    m = len(edges)
+    alive, present = np.ones(m, dtype=bool), np.ones(n, dtype=bool)
+    incident = sparse.csr_matrix((np.ones(2 * m), (np.r_[tails, heads], np.r_[np.arange(m), np.arange(m)])), shape=(n, m)) if target == 'node' else None
+    sources = np.random.default_rng(seed).choice(n, min(samples, n), replace=False)
+    workers = resolve_workers(workers, len(sources) * 2 * max(1, m))
+    chunks = np.array_split(sources, max(1, min(len(sources), 8 * workers)))
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    node_part = np.zeros((len(chunks), n), dtype=np.float32)    # per-chunk dependency sums, so a recomputation only redoes the chunks it affects
+    edge_part = np.zeros((len(chunks), m), dtype=np.float32)
+    dist_part, pair_part = np.zeros(len(chunks)), np.zeros(len(chunks))
+
+    def refresh(which):
+        indptr, indices, edge_ids = edge_csr(n, tails, heads, alive)
+        for c, (node_bc, edge_bc, total, pairs) in zip(which, betweenness_chunks(indptr, indices, edge_ids, m, [chunks[c] for c in which], pool)):
+            node_part[c], edge_part[c], dist_part[c], pair_part[c] = node_bc, edge_bc, total, pairs
+
+    rows = []
+    try:
+        refresh(range(len(chunks)))
+        removed, pending, batches = 0, [], 0
+        k = min(k, m if target == 'edge' else n)
+        while removed < k:
+            score = (edge_part if target == 'edge' else node_part).sum(axis=0)
+            score[~(alive if target == 'edge' else present)] = -np.inf
+            size = min(batch, k - removed)
+            top = np.argpartition(-score, size - 1)[:size] if size < len(score) else np.arange(len(score))
+            if target == 'edge':
+                gone = top
+            else:
+                present[top] = False
+                gone = incident[top].indices
+            gone = gone[alive[gone]]
+            alive[gone] = False
+            pending.append(gone)
+            removed += size
+            batches += 1
+            fresh = batches % recompute == 0 or removed == k
+            if fresh:   # a chunk changes only if one of its sources had a removed edge on a shortest path
+                pending = np.concatenate(pending)
+                refresh(np.flatnonzero(edge_part[:, pending].any(axis=1)) if len(pending) else [])
+                pending = []
+            comps, labels = csgraph.connected_components(sparse.csr_matrix((np.ones(alive.sum()), (tails[alive], heads[alive])), shape=(n, n)), directed=False)
+            sizes = np.bincount(labels[present], minlength=comps)
+            pairs = pair_part.sum()
+            row = {'removed': removed, 'components': int((sizes > 0).sum()), 'giant': int(sizes.max(initial=0)),
+                   'avg_path': dist_part.sum() / pairs if pairs else 0.0, 'fresh': fresh}
+            rows.append(row)
+            print(f"[INFO] Attack: removed {removed} {target}s, components={row['components']}, giant={row['giant']}"
+                  + (f", avg shortest path~{row['avg_path']:.3f}" if fresh else ""))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return rows
+
+
+def verify_homophily(G, store=None, permutations=10000, seed=None, workers=None): # Permutation test of edge assortativity by node group (color/group): observed r, null quantiles and p-value.
+    store, _ = attribute_store(G, store)
+    if store is None:
+        store = GraphColumns(nx.Graph(G))   # node columns only; a simple copy is enough
+    codes, categories = store.codes('group')
+    labeled = codes >= 0    # nodes without a group take no part in the test
+    keep = labeled[store.tails] & labeled[store.heads]
+    if len(categories) < 2 or not keep.any():
         print("[WARN] Homophily test skipped: not enough attribute diversity.")
-        return
-    g1 = [G.nodes[n]['clustering'] for n in G.nodes() if G.nodes[n].get('group') == groups[0]]
-    g2 = [G.nodes[n]['clustering'] for n in G.nodes() if G.nodes[n].get('group') == groups[1]]
-    if np.std(g1) == 0 or np.std(g2) == 0:  # Avoid t-test on identical values
-        print("[WARN] Homophily test unreliable: identical clustering values.")
-        return
-    t, p = stats.ttest_ind(g1, g2, equal_var=False)
-    print(f"[INFO] Homophily t-test: t={t:.3f}, p={p:.3f}") # Two-sample t-test
-
-
-def verify_balance(G): # Check if the signed graph is structurally balanced using BFS logic.
-    for u, v in G.edges():  # Ensure all edges have a 'sign' attribute
-        if 'sign' not in G[u][v]:
-            G[u][v]['sign'] = 1
-    unbalanced = 0
-    for tri in nx.enumerate_all_cliques(G): 
-        if len(tri) == 3:
-            edges = [(tri[0], tri[1]), (tri[1], tri[2]), (tri[0], tri[2])]
-            signs = [G[e[0]][e[1]].get('sign', 1) for e in edges]
-            if np.prod(signs) < 0:  # Odd number of negative edges
-                unbalanced += 1
+        return None
+    relabel = np.cumsum(labeled) - 1
+    tails, heads = relabel[store.tails[keep]], relabel[store.heads[keep]]
+    if not G.is_directed():  # an undirected edge counts in both directions
+        tails, heads = np.r_[tails, heads], np.r_[heads, tails]
+    result = permutation_test(codes[labeled], tails, heads, permutations, seed, workers)
+    lo, mid, hi = result['quantiles']
+    print(f"[INFO] Homophily: assortativity r={result['observed']:.4f} over {len(categories)} groups "
+          f"({100 * result['same_fraction']:.1f}% of edges within a group, {int((~labeled).sum())} nodes without a group skipped)")
+    print(f"[INFO] Permutation null ({permutations} shuffles): median {mid:.4f}, 95% range [{lo:.4f}, {hi:.4f}], p={result['p_value']:.4g}")
+    result['groups'] = categories
+    return result
+
+
+def signed_arrays(G, store=None): # CSR adjacency of the undirected signed graph plus a per-entry "negative edge" mask (missing sign = positive).
+    if store is not None and not G.is_directed():
+        return store.nodes, store.indptr, store.indices, store.entries('sign', 1) < 0
+    H = G.to_undirected(as_view=True) if G.is_directed() else G
+    nodes, _, indptr, indices = graph_to_csr(H)
+    neg = np.fromiter((d.get('sign', 1) < 0 for u in nodes for d in H[u].values()), dtype=bool, count=len(indices))
+    return nodes, indptr, indices, neg
+
+
+def signed_two_coloring(indptr, indices, neg): # Level-synchronous BFS from one root per component; a negative edge flips the side, a positive one keeps it.
+    n = len(indptr) - 1
+    A = sparse.csr_matrix((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(n, n))
+    _, labels = csgraph.connected_components(A, directed=False)
+    roots = np.unique(labels, return_index=True)[1]
+    side = np.full(n, -1, dtype=np.int8)
+    pred = np.full(n, -1, dtype=np.int64)
+    side[roots] = 0
+    frontier = roots
+    while frontier.size:
+        parents, nbrs, pos = csr_neighbors(indptr, indices, frontier, positions=True)
+        unseen = side[nbrs] < 0
+        parents, nbrs, pos = parents[unseen], nbrs[unseen], pos[unseen]
+        nbrs, first = np.unique(nbrs, return_index=True)
+        pred[nbrs] = parents[first]
+        side[nbrs] = side[parents[first]] ^ neg[pos[first]]
+        frontier = nbrs
+    return side, pred
+
+
+def balance_coloring(G, arrays=None): # Decide structural balance in O(n + m). Returns (True, (faction_a, faction_b)) or (False, witness cycle with an odd number of negative edges).
+    nodes, indptr, indices, neg = arrays or signed_arrays(G)
+    side, pred = signed_two_coloring(indptr, indices, neg)
+    tails = np.repeat(np.arange(len(nodes)), np.diff(indptr))
+    bad = np.flatnonzero((side[tails] ^ side[indices]).astype(bool) != neg)   # edges the coloring cannot satisfy
+    if not bad.size:
+        return True, ([nodes[i] for i in np.flatnonzero(side == 0)], [nodes[i] for i in np.flatnonzero(side == 1)])
+
+    # Close the conflicting edge with the two tree paths up to their lowest common ancestor
+    u, v = int(tails[bad[0]]), int(indices[bad[0]])
+    up = [u]
+    while pred[up[-1]] >= 0:
+        up.append(int(pred[up[-1]]))
+    depth = {x: i for i, x in enumerate(up)}
+    down = [v]
+    while down[-1] not in depth:
+        down.append(int(pred[down[-1]]))
+    cycle = up[:depth[down[-1]] + 1] + down[-2::-1]   # u ... ancestor ... v, closed by the edge v-u
+    return False, [nodes[i] for i in cycle]
+
+
+def signed_triangles(G, chunk_work=1 << 24, arrays=None): # Count all and unbalanced triangles by degree-ordered enumeration (each triangle once, at the edge joining its lowest- and highest-ranked nodes).
+    nodes, indptr, indices, neg = arrays or signed_arrays(G)
+    n = len(nodes)
+    deg = np.diff(indptr)
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.lexsort((np.arange(n), deg))] = np.arange(n)    # low degree first keeps out-degrees near sqrt(m)
+    tails = np.repeat(np.arange(n), deg)
+    up = rank[tails] < rank[indices]
+    signs = np.where(neg[up], -1, 1).astype(np.int64)
+    U = sparse.csr_matrix((signs, (tails[up], indices[up])), shape=(n, n))
+    U.sort_indices()
+    W = abs(U)
+    # For an oriented edge (u, x): T = number of paths u -> w -> x, X = sum of sign(u, w) * sign(w, x)
+    T = masked_product(W, W, U.indptr, U.indices, chunk_work)
+    X = masked_product(U, U, U.indptr, U.indices, chunk_work)
+    total = int(T.sum())
+    unbalanced = int(((T - U.data * X) // 2).sum())  # sign(u, v) * X = balanced - unbalanced on this edge
+    return total, unbalanced
+
+
+def frustration_estimate(G, restarts=2, seed=None, arrays=None): # Upper bound on the frustration index (fewest sign changes that make G balanced) by greedy node flips.
+    nodes, indptr, indices, neg = arrays or signed_arrays(G)
+    n = len(nodes)
+    tails = np.repeat(np.arange(n), np.diff(indptr))
+    loops = tails == indices
+    fixed = int((neg & loops).sum())    # a negative self-loop is frustrated under every coloring
+    rng = np.random.default_rng(seed)
+    starts = [signed_two_coloring(indptr, indices, neg)[0]]    # the spanning-tree coloring, then random ones
+    tails, heads, neg = tails[~loops], indices[~loops], neg[~loops]
+    starts += [rng.integers(0, 2, size=n).astype(np.int8) for _ in range(restarts)]
+
+    best, best_side = None, None
+    key = np.empty(n, dtype=np.int64)
+    for side in starts:
+        side = side.copy()
+        while True:
+            bad = (side[tails] ^ side[heads]).astype(bool) != neg
+            gain = np.bincount(tails, weights=np.where(bad, 1, -1), minlength=n)  # flipping a node toggles all its edges
+            cand = gain > 0
+            if not cand.any():
+                break
+            # Flip an independent set: candidates whose (gain, id) beats every candidate neighbor, so gains add up exactly
+            key[:] = -1
+            key[cand] = gain[cand].astype(np.int64) * n + np.flatnonzero(cand)
+            rival = np.full(n, -1, dtype=np.int64)
+            np.maximum.at(rival, tails, key[heads])
+            side[cand & (key > rival)] ^= 1
+        frustrated = int(bad.sum()) // 2 + fixed
+        if best is None or frustrated < best:
+            best, best_side = frustrated, side
+    return best, (len(tails) // 2 + int(loops.sum())), best_side
+
+
+def verify_balance(G, seed=None, store=None): # Check if the signed graph is structurally balanced (signed BFS two-coloring), count unbalanced triangles and estimate the frustration.
+    store, own = attribute_store(G, store)
+    if store is None:
+        for u, v in G.edges():  # Ensure all edges have a 'sign' attribute
+            if 'sign' not in G[u][v]:
+                G[u][v]['sign'] = 1
+    elif not store.present('edge', 'sign').all():
+        store.set_edge('sign', store.edge('sign', 1, dtype=np.int64))
+    if own:
+        store.sync()
+    arrays = signed_arrays(G, store)    # one conversion shared by the three passes
+    total, unbalanced = signed_triangles(G, arrays=arrays)
     print(f"[INFO] Balanced graph check: {unbalanced} unbalanced triangles.")
+    balanced, detail = balance_coloring(G, arrays)
+    if balanced:
+        print(f"[INFO] Structurally balanced: factions of {len(detail[0])} and {len(detail[1])} nodes.")
+        return {"balanced": True, "factions": detail, "triangles": total, "unbalanced_triangles": unbalanced, "frustration": 0}
+    frustrated, m, _ = frustration_estimate(G, seed=seed, arrays=arrays)
+    shown = detail if len(detail) <= 20 else detail[:10] + ["..."] + detail[-9:]
+    print(f"[INFO] Not balanced: cycle with an odd number of negative edges ({len(detail)} nodes): {shown}")
+    print(f"[INFO] Frustration estimate: {frustrated} of {m} edges ({100 * frustrated / max(m, 1):.2f}%) must change sign for balance (upper bound).")
+    return {"balanced": False, "witness_cycle": detail, "triangles": total, "unbalanced_triangles": unbalanced, "frustration": frustrated}
 
 
 # Visualization
-def plot_graph(G, mode):
+def plot_graph(G, mode, store=None):
+    store, _ = attribute_store(G, store)
+    if store is None:
+        store = GraphColumns(nx.Graph(G))
     pos = nx.spring_layout(G, seed=42)
     plt.figure(figsize=(6, 6))
+    nodes = store.nodes
     if mode == 'C':  # clustering visualization
-        sizes = [300 * G.nodes[n].get('clustering', 0.5) for n in G.nodes()]
-        colors = [G.degree(n) for n in G.nodes()]
-        nx.draw(G, pos, with_labels=True, node_size=sizes, node_color=colors, cmap='coolwarm')
+        sizes = 300 * store.node('clustering', 0.5)
+        colors = [d for _, d in G.degree(nodes)]   # NetworkX degree: a self-loop counts twice
+        nx.draw(G, pos, nodelist=nodes, with_labels=True, node_size=sizes, node_color=colors, cmap='coolwarm')
     elif mode == 'N':  # neighborhood overlap visualization
-        widths = [5 * G[u][v].get('overlap', 0.1) for u, v in G.edges()]
-        nx.draw(G, pos, with_labels=True, width=widths, edge_color='gray')
+        widths = 5 * store.edge('overlap', 0.1)
+        edges = [(nodes[a], nodes[b]) for a, b in zip(store.tails.tolist(), store.heads.tolist())]
+        nx.draw(G, pos, nodelist=nodes, edgelist=edges, with_labels=True, width=widths, edge_color='gray')
     elif mode == 'P':   # partition visualization
-        colors = [G.nodes[n].get('group', 0) for n in G.nodes()]
-        nx.draw(G, pos, with_labels=True, node_color=colors, cmap='Set2')
+        colors = store.node('group', 0, dtype=object)
+        nx.draw(G, pos, nodelist=nodes, with_labels=True, node_color=pd.factorize(pd.Series(colors, dtype=object))[0], cmap='Set2')
     plt.title(f"Plot Mode: {mode}")
     plt.show()
 
 
 #Temporal Simulation
-def temporal_simulation(G, csv_file): # Simulate edge additions/removals over time from a CSV.
-    with open(csv_file, 'r') as f:  # Open CSV file
-        reader = csv.DictReader(f)
-        for row in reader:  # Read each row
-            src, tgt, action = row['source'], row['target'], row['action']
-            if action.lower() == 'add': # Add edge if not present
-                G.add_edge(src, tgt)
-                print(f"[TIME] Added edge {src}-{tgt}")
-            elif action.lower() == 'remove' and G.has_edge(src, tgt):   # Remove edge if present
-                G.remove_edge(src, tgt)
-                print(f"[TIME] Removed edge {src}-{tgt}")
+def event_timestamps(column): # Numeric timestamps of one chunk; date strings become seconds since the epoch.
+    try:
+        return pd.to_numeric(column).to_numpy(dtype=float)
+    except (ValueError, TypeError):
+        return pd.to_datetime(column).to_numpy(dtype='datetime64[ns]').astype(np.int64) / 1e9
+
+
+def stream_events(csv_file, window=1.0, chunksize=1 << 20, lateness=0.0): # Read an edge log in chunks and yield its events window by window, in timestamp order.
+    """
+    Events are held back until the largest timestamp seen, minus 'lateness', has passed the
+    end of their window, so only that span of the log is in memory. An event older than a
+    window already yielded is applied in the next window and counted as late. A log without
+    a timestamp column is replayed in row order.
+    Yields:
+        (window start, sources, targets, timestamps, is_add mask, number of late events)
+    """
+    pending = pd.DataFrame(columns=['source', 'target', 'timestamp', 'action'])
+    released, row, watermark = -np.inf, 0, -np.inf
+    reader = pd.read_csv(csv_file, chunksize=chunksize, dtype={'source': str, 'target': str, 'action': str}, skipinitialspace=True)
+    for chunk in itertools.chain(reader, [None]):    # chunks are pulled one at a time; None marks the end of the log
+        if chunk is not None:
+            ts = event_timestamps(chunk['timestamp']) if 'timestamp' in chunk else np.arange(row, row + len(chunk), dtype=float)
+            row += len(chunk)
+            late = ts < released
+            chunk = pd.DataFrame({'source': chunk['source'], 'target': chunk['target'], 'action': chunk['action'].str.lower(),
+                                  'timestamp': np.maximum(ts, released), 'late': late})
+            pending = pd.concat([pending, chunk], ignore_index=True) if len(pending) else chunk
+            watermark = max(watermark, ts.max(initial=-np.inf) - lateness)
+            cut = np.floor(watermark / window) * window    # windows ending by the watermark are complete
+        else:
+            cut = np.inf    # end of the log: release everything
+        ready = (pending['timestamp'] < cut).to_numpy()
+        if not ready.any():
+            continue
+        out, pending = pending[ready], pending[~ready]
+        out = out.iloc[np.argsort(out['timestamp'].to_numpy(), kind='stable')]
+        ts = out['timestamp'].to_numpy()
+        wid = np.floor(ts / window)
+        bounds = np.r_[0, np.flatnonzero(np.diff(wid)) + 1, len(out)]
+        src, tgt, add, late = out['source'].tolist(), out['target'].tolist(), (out['action'] == 'add').to_numpy(), out['late'].to_numpy()
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            yield float(wid[a] * window), src[a:b], tgt[a:b], ts[a:b], add[a:b], int(late[a:b].sum())
+        released = max(released, cut if np.isfinite(cut) else ts[-1])
+
+
+def temporal_simulation(G, csv_file, window=1.0, chunksize=1 << 20, lateness=0.0, snapshot_every=0, snapshot_path=None, log_events=False, metrics=False, metrics_path=None): # Simulate edge additions/removals over time from a CSV, streamed in chunks and summarized per time window.
+    totals = {'events': 0, 'added': 0, 'removed': 0, 'ignored': 0, 'late': 0, 'windows': 0}
+    components = nx.number_weakly_connected_components if G.is_directed() else nx.number_connected_components
+    tracker = MetricTracker(G) if metrics and not (G.is_directed() or G.is_multigraph()) else None    # clustering/overlap stay current per event
+    add_edge = tracker.add_edge if tracker else lambda u, v: not G.has_edge(u, v) and G.add_edge(u, v) is None
+    remove_edge = tracker.remove_edge if tracker else lambda u, v: G.has_edge(u, v) and G.remove_edge(u, v) is None
+    with contextlib.ExitStack() as files:
+        writers = {}
+        for key, path, header in (('snapshot', snapshot_path, ['window_start', 'window_end', 'events', 'nodes', 'edges', 'components']),
+                                  ('metrics', metrics_path, ['window_start', 'window_end', 'nodes', 'edges', 'avg_clustering', 'avg_overlap', 'triangles'])):
+            if path:
+                writers[key] = csv.writer(files.enter_context(open(path, 'w', newline='')))
+                writers[key].writerow(header)
+        for start, sources, targets, _, adds, late in stream_events(csv_file, window, chunksize, lateness):
+            added = removed = 0
+            for src, tgt, add in zip(sources, targets, adds.tolist()):
+                if add and add_edge(src, tgt):  # Add edge if not present
+                    added += 1
+                elif not add and remove_edge(src, tgt):     # Remove edge if present
+                    removed += 1
+                else:
+                    continue
+                if log_events:
+                    print(f"[TIME] {'Added' if add else 'Removed'} edge {src}-{tgt}")
+            ignored = len(sources) - added - removed
+            for key, value in (('events', len(sources)), ('added', added), ('removed', removed), ('ignored', ignored), ('late', late), ('windows', 1)):
+                totals[key] += value
+            print(f"[TIME] [{start:g}, {start + window:g}): {added} added, {removed} removed, {ignored} ignored"
+                  + (f", {late} late" if late else "") + f" -> {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
+            if metrics_path:    # Metric time series, one row per window
+                if tracker:
+                    summary = tracker.summary()
+                else:   # directed graphs and multigraphs have no incremental bookkeeping
+                    cc, ov = compute_metrics(G)
+                    summary = {'avg_clustering': cc.mean() if len(cc) else 0.0, 'avg_overlap': ov.mean() if len(ov) else 0.0, 'triangles': ''}
+                writers['metrics'].writerow([start, start + window, G.number_of_nodes(), G.number_of_edges(),
+                                             summary['avg_clustering'], summary['avg_overlap'], summary['triangles']])
+            if snapshot_every and totals['windows'] % snapshot_every == 0:  # Periodic snapshot of the evolving graph
+                snap = [start, start + window, totals['events'], G.number_of_nodes(), G.number_of_edges(), components(G)]
+                if 'snapshot' in writers:
+                    writers['snapshot'].writerow(snap)
+                else:
+                    print(f"[SNAPSHOT] t<{snap[1]:g}: {snap[3]} nodes, {snap[4]} edges, {snap[5]} components")
+    if metrics and not tracker and not metrics_path:   # refresh the stale attributes once at the end
+        compute_metrics(G)
+    print(f"[INFO] Temporal simulation: {totals['events']} events in {totals['windows']} windows "
+          f"({totals['added']} added, {totals['removed']} removed, {totals['ignored']} ignored, {totals['late']} late).")
+    if metrics_path:
+        print(f"[INFO] Metric time series written to {metrics_path}")
+    return totals
 
 
 def main(): # Main function to parse arguments and execute functionalities
     parser = argparse.ArgumentParser(description="Graph Analysis Tool")
     parser.add_argument('graph_file', help='Input .gml file')
     parser.add_argument('--components', type=int)
+    parser.add_argument('--community_method', choices=['louvain', 'label_propagation', 'girvan_newman'], default='louvain')   # Engine behind --components
+    parser.add_argument('--seed', type=int)   # Seed for the randomized algorithms
     parser.add_argument('--plot', choices=['C', 'N', 'P', 'T'])
+    parser.add_argument('--metrics', action='store_true')   # Store clustering and overlap in the exported graph
     parser.add_argument('--verify_homophily', action='store_true')
+    parser.add_argument('--permutations', type=int, default=10000)   # Label shuffles in the homophily test
     parser.add_argument('--verify_balanced_graph', action='store_true')
     parser.add_argument('--simulate_failures', type=int)
     parser.add_argument('--robustness_check', type=int)
+    parser.add_argument('--robustness_curve')   # CSV file for the percolation curve over all k
+    parser.add_argument('--targeted_attack', type=int)   # Remove this many highest-betweenness edges/nodes
+    parser.add_argument('--attack_target', choices=['edge', 'node'], default='edge')
+    parser.add_argument('--attack_batch', type=int, default=1)   # Removals between reports
+    parser.add_argument('--betweenness_samples', type=int, default=64)   # BFS sources for the approximate betweenness
+    parser.add_argument('--recompute_every', type=int, default=1)   # Batches between betweenness recomputations
+    parser.add_argument('--trials', type=int, default=5)   # Trials for --robustness_check / --robustness_curve
     parser.add_argument('--temporal_simulation')
+    parser.add_argument('--window', type=float, default=1.0)   # Time window (timestamp units) of the temporal summaries
+    parser.add_argument('--chunksize', type=int, default=1 << 20)   # Edge-log rows read per chunk
+    parser.add_argument('--lateness', type=float, default=0.0)   # How far timestamps may run out of order
+    parser.add_argument('--snapshot_every', type=int, default=0)   # Windows between graph snapshots (0: none)
+    parser.add_argument('--snapshot_file')   # CSV for the snapshots (default: print them)
+    parser.add_argument('--log_events', action='store_true')   # Also print every applied event
+    parser.add_argument('--metrics_file')   # CSV for the per-window clustering/overlap time series
+    parser.add_argument('--workers', type=int)  # Worker processes for shortest-path statistics (default: all cores)
     parser.add_argument('--output', default='output.gml')
     args = parser.parse_args()
 
     G = load_graph(args.graph_file) # Load graph
     print(f"[INFO] Loaded graph with {G.number_of_nodes()} nodes and {G.number_of_edges()} edges.")
 
-    compute_metrics(G)  # Compute clustering and overlap
+    store, _ = attribute_store(G)   # Attribute columns shared by the analyses, written into G only on export
+    if args.metrics or args.plot in ('C', 'N'):    # Only these read clustering and overlap
+        compute_metrics(G, store)  # Compute clustering and overlap
     
-    if args.components: # Partition graph if requested
-        partition_graph(G, args.components)
+    if args.components is not None: # Partition graph if requested
+        partition_graph(G, args.components, args.community_method, args.seed, store)
 
     if args.simulate_failures:  # Simulate failures if requested
-        simulate_failures(G.copy(), args.simulate_failures)
+        simulate_failures(G.copy(), args.simulate_failures, args.workers)
 
     if args.robustness_check:   # Perform robustness check if requested
-        robustness_check(G.copy(), args.robustness_check)
+        robustness_check(G.copy(), args.robustness_check, trials=args.trials, workers=args.workers)
+
+    if args.robustness_curve:   # Percolation curve over every number of removed edges
+        robustness_curve(G, args.trials, args.seed, args.workers, args.robustness_curve)
+
+    if args.targeted_attack:    # Targeted attack on high-betweenness edges/nodes
+        targeted_attack(G, args.targeted_attack, args.attack_target, args.attack_batch, args.betweenness_samples, args.recompute_every, args.seed, args.workers)
 
     if args.verify_homophily:   # Verify homophily if requested
-        verify_homophily(G)
+        verify_homophily(G, store, args.permutations, args.seed, args.workers)
 
     if args.verify_balanced_graph:  # Verify balance if requested
-        verify_balance(G)
+        verify_balance(G, args.seed, store)
 
     if args.temporal_simulation:    # Perform temporal simulation if CSV provided
-        temporal_simulation(G, args.temporal_simulation)
+        if store is not None:   # the simulation edits G itself: hand over the columns, then rebuild them
+            store.sync()
+        temporal_simulation(G, args.temporal_simulation, args.window, args.chunksize, args.lateness,
+                            args.snapshot_every, args.snapshot_file, args.log_events,
+                            metrics=args.metrics or bool(args.metrics_file) or args.plot in ('C', 'N'), metrics_path=args.metrics_file)  # keep clustering/overlap current only if something reads them
+        store, _ = attribute_store(G)
 
     if args.plot and args.plot != 'T':  # Plot graph if requested and not temporal
-        plot_graph(G, args.plot)
+        plot_graph(G, args.plot, store)
 
-    save_graph(G, args.output)  # Save modified graph
+    save_graph(G, args.output, store)  # Save modified graph
 
 if __name__ == '__main__':  
     main()  
\ No newline at end of file
@@ -0,0 +1,53 @@
+import os
+import sys
+
+import networkx as nx
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import graph_analysis
+from graph_columns import GraphColumns
+
+
+def weighted_graph(seed):
+    G = nx.relabel_nodes(nx.connected_watts_strogatz_graph(40, 4, 0.3, seed=seed), str)
+    rng = np.random.default_rng(seed)
+    for u, v in G.edges():
+        G[u][v]['weight'] = float(rng.integers(1, 5))
+    G.add_edge('0', '0', weight=2.0)   # a self-loop counts twice in a node's degree
+    return G
+
+
+@pytest.mark.parametrize("method", ['louvain', 'label_propagation', 'girvan_newman'])
+@pytest.mark.parametrize("n", [1, 2, 5, 12])
+def test_partition_has_n_communities(method, n):
+    G = nx.relabel_nodes(nx.karate_club_graph(), str)
+    parts, Q = graph_analysis.partition_graph(G, n, method, seed=1)
+    assert len(parts) == n and all(parts)
+    assert sorted(node for part in parts for node in part) == sorted(G)
+    assert {G.nodes[node]['community'] for node in G} == set(range(n))
+    assert Q == pytest.approx(nx.community.modularity(G, parts))
+
+
+@pytest.mark.parametrize("method", ['louvain', 'label_propagation'])
+def test_partition_with_store(method):
+    G = weighted_graph(3)
+    store = GraphColumns(G)
+    parts, Q = graph_analysis.partition_graph(G, 4, method, seed=2, store=store)
+    assert len(parts) == 4 and all(parts)
+    store.sync()
+    assert {G.nodes[node]['community'] for node in G} == set(range(4))
+    assert Q == pytest.approx(nx.community.modularity(G, parts))
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize("resolution", [0.5, 1.0, 2.0])
+def test_modularity_matches_networkx(seed, resolution):
+    G = weighted_graph(seed)
+    nodes, A = graph_analysis.weighted_adjacency(G)
+    labels = np.random.default_rng(seed).integers(0, 5, size=len(nodes))
+    labels = np.unique(labels, return_inverse=True)[1]
+    parts = [[node for node, c in zip(nodes, labels.tolist()) if c == k] for k in range(labels.max() + 1)]
+    expected = nx.community.modularity(G, parts, weight='weight', resolution=resolution)
+    assert graph_analysis.modularity(A, labels, resolution) == pytest.approx(expected)
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import graph_analysis
+
+
+def test_first_window_after_one_chunk(tmp_path, monkeypatch):
+    log = tmp_path / "events.csv"
+    log.write_text("source,target,timestamp,action\n" + "".join(f"{i},{i + 1},{i},add\n" for i in range(100)))
+    pulled = []
+    read_csv = pd.read_csv
+
+    def spy(*args, **kwargs):
+        for chunk in read_csv(*args, **kwargs):
+            pulled.append(len(chunk))
+            yield chunk
+
+    monkeypatch.setattr(graph_analysis.pd, "read_csv", spy)
+    events = graph_analysis.stream_events(str(log), window=5.0, chunksize=10)
+    start, sources, _, _, _, _ = next(events)
+    assert start == 0.0 and sources == ["0", "1", "2", "3", "4"]
+    assert pulled == [10]
+    assert sum(len(w[1]) for w in events) == 95
+    assert len(pulled) == 10